@@ -0,0 +1,63 @@
+"""
+Pindahkan booking lama ke tabel bookings_archive
+
+    python archive.py                  Arsipkan booking finished/cancelled/no_show yang selesai > ARCHIVE_AFTER_DAYS hari lalu
+    python archive.py --days 90        Pakai horizon lain
+    python archive.py --dry-run        Hanya hitung berapa booking yang akan dipindah
+
+Dipindah per batch (ARCHIVE_BATCH_SIZE baris per transaksi) supaya lock di
+tabel bookings tetap singkat; aman dijalankan dari cron saat server jalan.
+"""
+
+import argparse
+import sys
+import time
+from src.app import create_app
+from src.usecases.booking_usecase import BookingUseCase
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Move old bookings to bookings_archive')
+    parser.add_argument('--days', type=int, help='Archive horizon in days (default: ARCHIVE_AFTER_DAYS)')
+    parser.add_argument('--batch-size', type=int, help='Rows per transaction (default: ARCHIVE_BATCH_SIZE)')
+    parser.add_argument('--max-batches', type=int, help='Stop after this many batches')
+    parser.add_argument('--pause', type=float, default=0.1, help='Seconds to sleep between batches')
+    parser.add_argument('--dry-run', action='store_true', help='Only count the bookings that would be moved')
+    args = parser.parse_args()
+
+    app, socketio = create_app()
+
+    with app.app_context():
+        usecase = BookingUseCase()
+        days = args.days or app.config['ARCHIVE_AFTER_DAYS']
+        batch_size = args.batch_size or app.config['ARCHIVE_BATCH_SIZE']
+
+        if args.dry_run:
+            count = usecase.count_archivable_bookings(days)
+            print(f"📋 {count} booking(s) ended more than {days} day(s) ago and would be archived")
+            sys.exit(0)
+
+        print(f"📦 Archiving bookings that ended more than {days} day(s) ago (batches of {batch_size})...")
+
+        def on_batch(moved):
+            print(f"   ✓ moved {moved} booking(s)")
+            if args.pause:
+                time.sleep(args.pause)
+
+        try:
+            result = usecase.archive_old_bookings(
+                days,
+                batch_size=batch_size,
+                max_batches=args.max_batches,
+                on_batch=on_batch
+            )
+        except Exception as e:
+            print(f"❌ Archiving failed: {e}")
+            sys.exit(1)
+
+    print(f"✅ Archived {result['archived']} booking(s) in {result['batches']} batch(es), cutoff {result['cutoff']:%Y-%m-%d %H:%M}")
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
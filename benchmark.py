@@ -0,0 +1,443 @@
+"""
+Benchmark script untuk mengukur API di bawah beban paralel
+
+Jalankan terhadap server yang sedang running (bisa multi-worker), mis.:
+    python benchmark.py booking-burst --space-id 1 --date 2025-12-29
+
+Skenario:
+  booking-burst  Banyak client mem-booking slot yang sama secara bersamaan.
+                 Mengukur throughput/latency dan memastikan tidak ada double
+                 booking (maksimal satu booking berhasil per slot).
+  checkin-burst  Membuat beberapa booking yang check-in window-nya sedang
+                 terbuka, lalu setiap kode di-scan berkali-kali secara
+                 paralel. Mengukur p50/p95/p99 dan memastikan setiap kode
+                 hanya berhasil check-in sekali.
+  user-listing   Membuat user sintetis (default 10k) langsung di database dari
+                 config aplikasi, lalu membandingkan listing user cara lama
+                 (hitung booking + cari department per user) dengan query
+                 agregat. Tidak lewat HTTP; data sintetis dihapus lagi.
+                 Booking sintetis di-insert langsung (tanpa update user stats);
+                 data --keep ikut masuk ringkasan bila rebuild_stats.py atau
+                 migrasi v0006 dijalankan, dan dibersihkan bersama user-nya.
+"""
+
+import argparse
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+
+def api_request(base_url, method, path, token=None, body=None):
+    """Send a JSON request, return (status_code, response_json, elapsed_seconds)"""
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(base_url + path, data=data, method=method)
+    request.add_header('Content-Type', 'application/json')
+    if token:
+        request.add_header('Authorization', f'Bearer {token}')
+
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            status, payload = response.status, response.read()
+    except urllib.error.HTTPError as e:
+        status, payload = e.code, e.read()
+    elapsed = time.perf_counter() - started
+
+    try:
+        return status, json.loads(payload or b'{}'), elapsed
+    except ValueError:
+        return status, {}, elapsed
+
+
+def login(base_url, username, password):
+    """Login and return (token, user_id)"""
+    status, payload, _ = api_request(base_url, 'POST', '/api/auth/login', body={
+        'username': username,
+        'password': password
+    })
+    if status != 200:
+        raise SystemExit(f"❌ Login failed ({status}): {payload.get('message')}")
+    return payload['data']['access_token'], payload['data']['user']['id']
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def print_latency(label, latencies, wall_seconds):
+    """Print throughput and latency percentiles"""
+    print(f"\n📊 {label}")
+    print(f"   Requests   : {len(latencies)}")
+    print(f"   Wall time  : {wall_seconds:.2f}s")
+    print(f"   Throughput : {len(latencies) / wall_seconds:.1f} req/s")
+    print(f"   Latency    : p50 {percentile(latencies, 50) * 1000:.1f}ms | "
+          f"p95 {percentile(latencies, 95) * 1000:.1f}ms | "
+          f"p99 {percentile(latencies, 99) * 1000:.1f}ms")
+
+
+def booking_burst(args):
+    """Fire parallel booking requests where every slot is contended by several clients"""
+    token, user_id = login(args.base_url, args.username, args.password)
+    day = datetime.strptime(args.date, '%Y-%m-%d')
+    first_start = datetime.combine(day.date(), datetime.strptime(args.start, '%H:%M').time())
+
+    slots = [
+        (first_start + timedelta(minutes=args.slot_minutes * i),
+         first_start + timedelta(minutes=args.slot_minutes * (i + 1)))
+        for i in range(args.slots)
+    ]
+    attempts = [slot for slot in slots for _ in range(args.contention)]
+    random.shuffle(attempts)
+
+    def book(slot):
+        status, payload, elapsed = api_request(args.base_url, 'POST', '/api/bookings', token, {
+            'user_id': user_id,
+            'space_id': args.space_id,
+            'start_at': slot[0].strftime('%Y-%m-%dT%H:%M:%S'),
+            'end_at': slot[1].strftime('%Y-%m-%dT%H:%M:%S')
+        })
+        return slot, status, payload, elapsed
+
+    print(f"🚀 {len(attempts)} booking requests ({args.slots} slots x {args.contention} clients) "
+          f"with {args.workers} workers...")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        results = list(executor.map(book, attempts))
+    wall_seconds = time.perf_counter() - started
+
+    created = {}
+    conflicts = 0
+    errors = 0
+    for slot, status, payload, _ in results:
+        if status == 201:
+            created.setdefault(slot, []).append(payload['data']['id'])
+        elif status == 400:
+            conflicts += 1
+        else:
+            errors += 1
+
+    print_latency('Booking burst', [elapsed for _, _, _, elapsed in results], wall_seconds)
+    print(f"   Created    : {sum(len(ids) for ids in created.values())}")
+    print(f"   Rejected   : {conflicts}")
+    print(f"   Errors     : {errors}")
+
+    double_booked = {slot: ids for slot, ids in created.items() if len(ids) > 1}
+    if double_booked:
+        print(f"❌ Double booking detected on {len(double_booked)} slot(s):")
+        for slot, ids in double_booked.items():
+            print(f"   {slot[0].strftime('%H:%M')} - {slot[1].strftime('%H:%M')}: bookings {ids}")
+    else:
+        print("✅ No double booking")
+
+    if not args.keep:
+        # Cancel created bookings so the benchmark can be re-run on the same slots
+        for ids in created.values():
+            for booking_id in ids:
+                api_request(args.base_url, 'PATCH', f'/api/bookings/{booking_id}', token, {'status': 'cancel'})
+        print("🧹 Created bookings cancelled")
+
+
+def checkin_burst(args):
+    """Scan check-in codes in parallel, each code by several clients at once"""
+    token, user_id = login(args.base_url, args.username, args.password)
+
+    status, payload, _ = api_request(args.base_url, 'GET', '/api/spaces', token)
+    if status != 200:
+        raise SystemExit(f"❌ Could not list spaces ({status}): {payload.get('message')}")
+    spaces = [space for space in payload['data'] if space.get('status') == 'available'][:args.bookings]
+
+    # Start soon so the check-in window (15 minutes before start) is already open
+    start = (datetime.now() + timedelta(minutes=2)).replace(second=0, microsecond=0)
+    end = start + timedelta(minutes=args.duration)
+
+    codes = {}
+    for space in spaces:
+        status, payload, _ = api_request(args.base_url, 'POST', '/api/bookings', token, {
+            'user_id': user_id,
+            'space_id': space['id'],
+            'start_at': start.strftime('%Y-%m-%dT%H:%M:%S'),
+            'end_at': end.strftime('%Y-%m-%dT%H:%M:%S')
+        })
+        if status == 201:
+            codes[payload['data']['checkin_code']] = payload['data']['id']
+        else:
+            print(f"   ⚠️  Space {space['id']}: {payload.get('message')}")
+
+    if not codes:
+        raise SystemExit("❌ No booking could be created (are spaces open right now?)")
+
+    attempts = [code for code in codes for _ in range(args.contention)]
+    random.shuffle(attempts)
+
+    def scan(code):
+        status, _, elapsed = api_request(args.base_url, 'POST', '/api/bookings/checkin', token, {
+            'checkin_code': code
+        })
+        return code, status, elapsed
+
+    print(f"🚀 {len(attempts)} check-in requests ({len(codes)} codes x {args.contention} scans) "
+          f"with {args.workers} workers...")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        results = list(executor.map(scan, attempts))
+    wall_seconds = time.perf_counter() - started
+
+    successes = {}
+    rejected = 0
+    errors = 0
+    for code, status, _ in results:
+        if status == 200:
+            successes[code] = successes.get(code, 0) + 1
+        elif status == 400:
+            rejected += 1
+        else:
+            errors += 1
+
+    print_latency('Check-in burst', [elapsed for _, _, elapsed in results], wall_seconds)
+    print(f"   Checked in : {len(successes)} / {len(codes)}")
+    print(f"   Rejected   : {rejected}")
+    print(f"   Errors     : {errors}")
+
+    repeated = {code: count for code, count in successes.items() if count > 1}
+    if repeated:
+        print(f"❌ {len(repeated)} code(s) checked in more than once")
+    else:
+        print("✅ Every code checked in at most once")
+
+    if not args.keep:
+        # Check out so the spaces are free again
+        for booking_id in codes.values():
+            api_request(args.base_url, 'PATCH', f'/api/bookings/{booking_id}', token, {'status': 'checkout'})
+        print("🧹 Bookings checked out")
+
+
+BENCH_USER_PREFIX = 'bench_user_'
+BENCH_CODE_PREFIX = 'BENCH-'
+
+
+def count_statements(db, call):
+    """Run call(), return (result, elapsed_seconds, number of SQL statements)"""
+    from sqlalchemy import event
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        started = time.perf_counter()
+        result = call()
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        db.session.rollback()
+
+    return result, elapsed, len(statements)
+
+
+def remove_bench_users(db):
+    """Delete synthetic users, their bookings (also archived ones) and their user stats rows"""
+    from sqlalchemy import select
+    from src.models.booking import Booking
+    from src.models.booking_archive import BookingArchive
+    from src.models.user import User
+    from src.models.user_stats import UserSpaceStats, UserDayStats, UserWeekStats
+
+    # A stats rebuild (v0006, rebuild_stats.py) or archive.py may have run while --keep data existed
+    bench_user_ids = select(User.id).where(User.username.like(f'{BENCH_USER_PREFIX}%'))
+    for model in (UserSpaceStats, UserDayStats, UserWeekStats):
+        model.query.filter(model.user_id.in_(bench_user_ids)).delete(synchronize_session=False)
+
+    for model in (Booking, BookingArchive):
+        model.query.filter(model.checkin_code.like(f'{BENCH_CODE_PREFIX}%')).delete(synchronize_session=False)
+    User.query.filter(User.username.like(f'{BENCH_USER_PREFIX}%')).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def seed_bench_users(db, users, bookings_per_user):
+    """Bulk insert synthetic users (spread over departments) with some past bookings each"""
+    from sqlalchemy import insert
+    from src.models.booking import Booking
+    from src.models.department import Department
+    from src.models.space import Space
+    from src.models.user import User
+
+    # bcrypt is slow on purpose, hash once and share it
+    template = User()
+    template.set_password('password')
+    department_ids = [department.id for department in Department.query.all()] or [None]
+    chunk = 1000
+
+    for offset in range(0, users, chunk):
+        db.session.execute(insert(User), [
+            {
+                'username': f'{BENCH_USER_PREFIX}{i:06d}',
+                'email': f'{BENCH_USER_PREFIX}{i:06d}@bench.local',
+                'password_hash': template.password_hash,
+                'role': 'employee',
+                'department_id': department_ids[i % len(department_ids)],
+                'is_active': True
+            }
+            for i in range(offset, min(offset + chunk, users))
+        ])
+        db.session.commit()
+
+    space = Space.query.first()
+    if not space or not bookings_per_user:
+        return 0
+
+    user_ids = [row[0] for row in db.session.query(User.id).filter(User.username.like(f'{BENCH_USER_PREFIX}%'))]
+    first_day = datetime.combine(datetime.now().date(), datetime.min.time()) - timedelta(days=365)
+    rows = [
+        {
+            'user_id': user_id,
+            'space_id': space.id,
+            'status': 'finished',
+            'start_at': first_day + timedelta(days=n, hours=9),
+            'end_at': first_day + timedelta(days=n, hours=10),
+            'checkin_code': f'{BENCH_CODE_PREFIX}{user_id}-{n}'
+        }
+        for user_id in user_ids
+        for n in range(bookings_per_user)
+    ]
+    for offset in range(0, len(rows), chunk):
+        db.session.execute(insert(Booking), rows[offset:offset + chunk])
+        db.session.commit()
+
+    return len(rows)
+
+
+def user_listing(args):
+    """Compare the per-user (2N+1 queries) user listing with the aggregated query"""
+    # Imported here so the HTTP scenarios do not need the app dependencies
+    from src.app import create_app
+    from src.config.database import db
+    from src.repositories.booking_repository import BookingRepository
+    from src.repositories.department_repository import DepartmentRepository
+    from src.repositories.user_repository import UserRepository
+    from src.utils.pagination import MAX_LIMIT
+
+    app, _ = create_app()
+    with app.app_context():
+        user_repository = UserRepository()
+        department_repository = DepartmentRepository()
+
+        def legacy_rows(users):
+            # What UserUseCase.get_all_users did before: two lookups per user
+            return [
+                (
+                    user.id,
+                    BookingRepository.count_by_user_id(user.id),
+                    department_repository.get_by_id(user.department_id).name if user.department_id else None
+                )
+                for user in users
+            ]
+
+        def legacy_full():
+            return legacy_rows(user_repository.get_all())
+
+        def legacy_page():
+            return legacy_rows(user_repository.get_page(limit=args.page_size)[0])
+
+        def aggregated_full():
+            rows, cursor = user_repository.get_page_with_booking_counts(limit=MAX_LIMIT)
+            while cursor:
+                page, cursor = user_repository.get_page_with_booking_counts(cursor=cursor, limit=MAX_LIMIT)
+                rows.extend(page)
+            return [(user.id, total, name) for user, total, name in rows]
+
+        def aggregated_page():
+            rows = user_repository.get_page_with_booking_counts(limit=args.page_size)[0]
+            return [(user.id, total, name) for user, total, name in rows]
+
+        remove_bench_users(db)
+        print(f"🌱 Seeding {args.users} users with {args.bookings_per_user} booking(s) each...")
+        bookings = seed_bench_users(db, args.users, args.bookings_per_user)
+        print(f"   {bookings} bookings created")
+
+        try:
+            scenarios = [
+                ('Full listing, per-user lookups', legacy_full),
+                (f'Full listing, aggregated (pages of {MAX_LIMIT})', aggregated_full),
+                (f'First page of {args.page_size}, per-user lookups', legacy_page),
+                (f'First page of {args.page_size}, aggregated', aggregated_page),
+            ]
+            results = {}
+            for label, call in scenarios:
+                timings = []
+                for _ in range(args.repeat):
+                    rows, elapsed, statements = count_statements(db, call)
+                    timings.append(elapsed)
+                results[label] = rows
+                print(f"\n📊 {label}")
+                print(f"   Rows       : {len(rows)}")
+                print(f"   Queries    : {statements}")
+                print(f"   Time       : best {min(timings) * 1000:.1f}ms | "
+                      f"median {percentile(timings, 50) * 1000:.1f}ms ({args.repeat} runs)")
+
+            # Rows are (user_id, total_bookings, department_name) so they survive the rollback
+            legacy = {user_id: (total, name) for user_id, total, name in results[scenarios[0][0]]}
+            aggregated = {user_id: (total, name) for user_id, total, name in results[scenarios[1][0]]}
+            if legacy == aggregated:
+                print("\n✅ Both listings return the same counts and department names")
+            else:
+                mismatched = [user_id for user_id in legacy if legacy[user_id] != aggregated.get(user_id)]
+                print(f"\n❌ {len(mismatched)} user(s) differ, e.g. {mismatched[:5]}")
+        finally:
+            if not args.keep:
+                remove_bench_users(db)
+                print("🧹 Synthetic users removed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API benchmark scenarios')
+    parser.add_argument('--base-url', default='http://localhost:5000')
+    parser.add_argument('--username', default='budi')
+    parser.add_argument('--password', default='password')
+    subparsers = parser.add_subparsers(dest='scenario', required=True)
+
+    burst = subparsers.add_parser('booking-burst', help='Parallel bookings contending for the same slots')
+    burst.add_argument('--space-id', type=int, required=True)
+    burst.add_argument('--date', required=True, help='YYYY-MM-DD, must be an open day for the space')
+    burst.add_argument('--start', default='09:00', help='Start of the first slot (HH:MM)')
+    burst.add_argument('--slots', type=int, default=8)
+    burst.add_argument('--slot-minutes', type=int, default=30)
+    burst.add_argument('--contention', type=int, default=10, help='Clients per slot')
+    burst.add_argument('--workers', type=int, default=32)
+    burst.add_argument('--keep', action='store_true', help='Do not cancel created bookings afterwards')
+    burst.set_defaults(handler=booking_burst)
+
+    checkin = subparsers.add_parser('checkin-burst', help='Parallel check-in scans, several per code')
+    checkin.add_argument('--bookings', type=int, default=10, help='Bookings to create (one per available space)')
+    checkin.add_argument('--duration', type=int, default=30, help='Booking length in minutes')
+    checkin.add_argument('--contention', type=int, default=30, help='Scans per code')
+    checkin.add_argument('--workers', type=int, default=64)
+    checkin.add_argument('--keep', action='store_true', help='Do not check out the bookings afterwards')
+    checkin.set_defaults(handler=checkin_burst)
+
+    listing = subparsers.add_parser('user-listing', help='Per-user vs aggregated user listing on synthetic users (in-process)')
+    listing.add_argument('--users', type=int, default=10000)
+    listing.add_argument('--bookings-per-user', type=int, default=3)
+    listing.add_argument('--page-size', type=int, default=50)
+    listing.add_argument('--repeat', type=int, default=3)
+    listing.add_argument('--keep', action='store_true', help='Do not remove synthetic users afterwards')
+    listing.set_defaults(handler=user_listing)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
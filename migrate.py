@@ -1,63 +1,121 @@
 """
-Migration script untuk update struktur database
-Drop old users table dan create new structure
+Migration script untuk struktur database
+
+    python migrate.py            Jalankan migration yang belum diterapkan (default, tidak menghapus data)
+    python migrate.py status     Tampilkan versi yang sudah / belum diterapkan
+    python migrate.py check      EXPLAIN query repository utama dan laporkan full table scan
+    python migrate.py reset --yes
+                                 Drop semua tabel lalu jalankan semua migration (HANYA untuk development)
 """
 
+import argparse
+import sys
 from src.app import create_app
 from src.config.database import db
+from src.migrations.runner import migrate, get_status
+from src.migrations.explain import explain_hot_queries
+
+
+def run_upgrade():
+    """Apply pending migrations"""
+    print("🔄 Starting database migration...")
+
+    try:
+        applied = migrate(
+            on_step=lambda migration: print(f"   → v{migration.VERSION:04d} {migration.DESCRIPTION}")
+        )
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Migration failed: {e}")
+        return False
+
+    if applied:
+        print(f"✅ Applied {len(applied)} migration(s)")
+    else:
+        print("✅ Database is up to date")
+    return True
+
+
+def run_status():
+    """Print applied and pending migrations"""
+    print("📋 Migration status:")
+    for migration, applied_at in get_status():
+        state = f"applied {applied_at}" if applied_at else "pending"
+        print(f"   v{migration.VERSION:04d} {migration.DESCRIPTION} — {state}")
+    return True
+
+
+def run_check():
+    """EXPLAIN the hot repository queries and report full table scans"""
+    print("🔍 Running EXPLAIN on repository queries...")
+    report = explain_hot_queries()
+    flagged = [entry for entry in report if entry['full_scans']]
+
+    for entry in report:
+        status = f"⚠️  full scan on {', '.join(entry['full_scans'])}" if entry['full_scans'] else "✓"
+        print(f"\n   {entry['query']}: {status}")
+        for row in entry['plan']:
+            print(f"      {row.get('table')}: type={row.get('type')} key={row.get('key')} rows={row.get('rows')}")
+
+    if flagged:
+        print(f"\n❌ {len(flagged)} statement(s) with full table scans")
+        return False
+
+    print("\n✅ No full table scans")
+    return True
+
+
+def run_reset():
+    """Drop every table, then apply all migrations from scratch"""
+    print("🗑️  Dropping all tables...")
+    try:
+        db.session.execute(db.text('SET FOREIGN_KEY_CHECKS = 0'))
 
-def migrate():
-    app, socketio = create_app()
-    
-    with app.app_context():
-        print("🔄 Starting database migration...")
-        
-        # Drop all tables manually using raw SQL
-        print("\n🗑️  Dropping old tables...")
-        try:
-            # Disable foreign key checks
-            db.session.execute(db.text('SET FOREIGN_KEY_CHECKS = 0'))
-            
-            # Get all tables
-            result = db.session.execute(db.text(
-                "SELECT table_name FROM information_schema.tables "
-                "WHERE table_schema = 'openbo_db'"
-            ))
-            tables = [row[0] for row in result]
-            
-            # Drop each table
-            for table in tables:
-                db.session.execute(db.text(f'DROP TABLE IF EXISTS {table}'))
-                print(f"   ✓ Dropped table: {table}")
-            
-            # Re-enable foreign key checks
-            db.session.execute(db.text('SET FOREIGN_KEY_CHECKS = 1'))
-            db.session.commit()
-            print("✅ Old tables dropped")
-        except Exception as e:
-            print(f"❌ Error dropping tables: {e}")
-            db.session.rollback()
-            return
-        
-        # Create new tables with updated structure
-        print("\n📦 Creating new tables...")
-        try:
-            db.create_all()
-            print("✅ New tables created")
-        except Exception as e:
-            print(f"❌ Error creating tables: {e}")
-            return
-        
-        print("\n✨ Migration completed successfully!")
-        print("\nNew tables:")
         result = db.session.execute(db.text(
             "SELECT table_name FROM information_schema.tables "
-            "WHERE table_schema = 'openbo_db'"
+            "WHERE table_schema = DATABASE()"
         ))
-        for row in result:
-            print(f"   - {row[0]}")
-        
-        print("\n⚠️  Please run 'python seed.py' to create initial data")
+        for table in [row[0] for row in result]:
+            db.session.execute(db.text(f'DROP TABLE IF EXISTS {table}'))
+            print(f"   ✓ Dropped table: {table}")
+
+        db.session.execute(db.text('SET FOREIGN_KEY_CHECKS = 1'))
+        db.session.commit()
+    except Exception as e:
+        print(f"❌ Error dropping tables: {e}")
+        db.session.rollback()
+        return False
+
+    if not run_upgrade():
+        return False
+
+    print("\n⚠️  Please run 'python seed.py' to create initial data")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Versioned database migrations')
+    parser.add_argument('command', nargs='?', default='upgrade', choices=['upgrade', 'status', 'check', 'reset'])
+    parser.add_argument('--yes', action='store_true', help='Confirm destructive reset')
+    args = parser.parse_args()
+
+    if args.command == 'reset' and not args.yes:
+        print("❌ reset drops ALL tables and data, re-run with --yes to confirm")
+        sys.exit(1)
+
+    app, socketio = create_app()
+
+    with app.app_context():
+        handlers = {
+            'upgrade': run_upgrade,
+            'status': run_status,
+            'check': run_check,
+            'reset': run_reset
+        }
+        ok = handlers[args.command]()
+
+    sys.exit(0 if ok else 1)
+
 
 if __name__ == '__main__':
-    migrate()
+    main()
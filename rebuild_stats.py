@@ -0,0 +1,43 @@
+"""
+Hitung ulang tabel ringkasan statistik user (user_space_stats, user_day_stats, user_week_stats)
+
+    python rebuild_stats.py                  Rebuild semua user (per chunk, satu transaksi per chunk)
+    python rebuild_stats.py --user-id 5      Rebuild satu user saja
+
+Migrasi v0006 dan seed.py sudah mengisi tabel ini; script ini dipakai untuk
+memperbaiki ringkasan yang melenceng. Selama rebuild berjalan, event booking dari server
+tetap menambah counter, jadi sebaiknya dijalankan saat traffic rendah.
+"""
+
+import argparse
+import sys
+from src.app import create_app
+from src.usecases.stats_usecase import StatsUseCase
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild the per-user dashboard summary tables')
+    parser.add_argument('--user-id', type=int, action='append', help='Only rebuild this user (repeatable)')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Users per transaction')
+    args = parser.parse_args()
+
+    app, socketio = create_app()
+
+    with app.app_context():
+        print("🔄 Rebuilding user stats...")
+        try:
+            rebuilt = StatsUseCase().rebuild_user_stats(
+                user_ids=args.user_id,
+                chunk_size=args.chunk_size,
+                on_chunk=lambda user_ids: print(f"   ✓ users {user_ids[0]}..{user_ids[-1]}")
+            )
+        except Exception as e:
+            print(f"❌ Rebuild failed: {e}")
+            sys.exit(1)
+
+    print(f"✅ Rebuilt stats for {rebuilt} user(s)")
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 from src.app import create_app
+from src.jobs.booking_sweeper import booking_sweeper
 import os
 
 app, socketio = create_app()
@@ -10,6 +11,15 @@ if __name__ == '__main__':
     # Get debug mode from environment
     debug = os.environ.get('DEBUG', 'False').lower() == 'true'
     
+    # Expire no-show / finished bookings in the background (one worker at a time via DB lock)
+    if app.config['SWEEPER_ENABLED']:
+        booking_sweeper.start(
+            app,
+            socketio,
+            interval_seconds=app.config['SWEEPER_INTERVAL_SECONDS'],
+            batch_size=app.config['SWEEPER_BATCH_SIZE']
+        )
+    
     # IMPORTANT: host='0.0.0.0' untuk allow external connections (Network, Docker, Cloudflare Tunnel)
     # Use socketio.run instead of app.run for WebSocket support
     socketio.run(app, 
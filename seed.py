@@ -16,6 +16,8 @@ from src.models.booking import Booking
 from src.models.announcement import Announcement
 from src.models.assignment import Assignment
 from src.models.task import Task
+from src.repositories.assignment_repository import AssignmentRepository
+from src.repositories.user_stats_repository import UserStatsRepository
 
 def seed_data():
     app, socketio = create_app()
@@ -409,6 +411,10 @@ def seed_data():
         
         db.session.commit()
         
+        # Bookings were inserted directly, rebuild the dashboard summary tables
+        for user_ids in UserStatsRepository.get_user_id_chunks(500):
+            UserStatsRepository.rebuild(user_ids)
+        
         # Create Announcements
         print("\n📢 Creating announcements...")
         announcements_data = [
@@ -601,6 +607,9 @@ def seed_data():
         
         db.session.commit()
         
+        # Tasks were inserted directly, recount the cached progress on assignments
+        AssignmentRepository().sync_task_progress()
+        
         print("\n✨ Database seeding completed!")
         print("\n📝 Summary:")
         print(f"   - Departments: {Department.query.count()}")
@@ -29,9 +29,11 @@ from src.models.space import Space
 from src.models.amenity import Amenity
 from src.models.blackout import Blackout
 from src.models.booking import Booking
+from src.models.booking_archive import BookingArchive
 from src.models.announcement import Announcement
 from src.models.assignment import Assignment
 from src.models.task import Task
+from src.models.user_stats import UserSpaceStats, UserDayStats, UserWeekStats
 
 def create_app():
     """Application factory untuk membuat Flask app"""
@@ -68,8 +70,6 @@ def create_app():
     app.register_blueprint(booking_bp, url_prefix='/api/bookings')
     app.register_blueprint(stats_bp, url_prefix='/api/stats')
     
-    # Create tables
-    with app.app_context():
-        db.create_all()
+    # Tables are created by the versioned migrations (python migrate.py), not here
     
     return app, socketio
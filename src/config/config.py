@@ -20,3 +20,16 @@ class Config:
     SQLALCHEMY_DATABASE_URI = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = True  # Set to False in production
+    
+    # Background sweeper: active bookings past code_valid_to -> no_show, checkin past end_at -> finished
+    SWEEPER_ENABLED = os.environ.get('SWEEPER_ENABLED', 'True').lower() == 'true'
+    SWEEPER_INTERVAL_SECONDS = int(os.environ.get('SWEEPER_INTERVAL_SECONDS', '60'))
+    SWEEPER_BATCH_SIZE = int(os.environ.get('SWEEPER_BATCH_SIZE', '500'))
+    
+    # Archive: finished/cancelled/no_show bookings that ended more than ARCHIVE_AFTER_DAYS ago
+    ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', '180'))
+    ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', '1000'))
+    
+    # Composite dashboard endpoints (/api/stats, /api/stats/home): parts run in a shared thread pool
+    COMPOSITE_MAX_WORKERS = int(os.environ.get('COMPOSITE_MAX_WORKERS', '8'))
+    COMPOSITE_PART_TIMEOUT_SECONDS = float(os.environ.get('COMPOSITE_PART_TIMEOUT_SECONDS', '5'))
@@ -12,15 +12,23 @@ class AmenityController:
     def get_amenities(self):
         """Handler to get all amenities"""
         try:
-            result = self.amenity_usecase.get_all_amenities()
+            result = self.amenity_usecase.get_all_amenities(
+                cursor=request.args.get('cursor'),
+                limit=request.args.get('limit')
+            )
             if result['success']:
-                return self.response.success(
+                return self.response.paginated(
                     data=result['data'],
+                    next_cursor=result['next_cursor'],
                     message="Amenities retrieved successfully"
                 )
             return self.response.internal_error(
                 message=result.get('error', 'Failed to retrieve amenities')
             )
+        except ValueError as e:
+            return self.response.bad_request(
+                message=str(e)
+            )
         except Exception as e:
             return self.response.internal_error(
                 message=f"Failed to retrieve amenities: {str(e)}"
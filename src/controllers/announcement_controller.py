@@ -16,15 +16,24 @@ class AnnouncementController:
             current_user = request.current_user
             manager_department_id = current_user.get('department_id')
             
-            result = self.announcement_usecase.get_announcements_for_manager(manager_department_id)
+            result = self.announcement_usecase.get_announcements_for_manager(
+                manager_department_id,
+                cursor=request.args.get('cursor'),
+                limit=request.args.get('limit')
+            )
             if result['success']:
-                return self.response.success(
+                return self.response.paginated(
                     data=result['data'],
+                    next_cursor=result['next_cursor'],
                     message="Announcements retrieved successfully"
                 )
             return self.response.bad_request(
                 message=result.get('error', 'Failed to retrieve announcements')
             )
+        except ValueError as e:
+            return self.response.bad_request(
+                message=str(e)
+            )
         except Exception as e:
             return self.response.internal_error(
                 message=f"Failed to retrieve announcements: {str(e)}"
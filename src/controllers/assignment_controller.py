@@ -16,15 +16,24 @@ class AssignmentController:
             current_user = request.current_user
             manager_department_id = current_user.get('department_id')
             
-            result = self.assignment_usecase.get_assignments_for_department(manager_department_id)
+            result = self.assignment_usecase.get_assignments_for_department(
+                manager_department_id,
+                cursor=request.args.get('cursor'),
+                limit=request.args.get('limit')
+            )
             if result['success']:
-                return self.response.success(
+                return self.response.paginated(
                     data=result['data'],
+                    next_cursor=result['next_cursor'],
                     message="Assignments retrieved successfully"
                 )
             return self.response.bad_request(
                 message=result.get('error', 'Failed to retrieve assignments')
             )
+        except ValueError as e:
+            return self.response.bad_request(
+                message=str(e)
+            )
         except Exception as e:
             return self.response.internal_error(
                 message=f"Failed to retrieve assignments: {str(e)}"
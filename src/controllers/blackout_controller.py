@@ -12,15 +12,23 @@ class BlackoutController:
     def get_blackouts(self):
         """Handler to get all blackouts"""
         try:
-            result = self.blackout_usecase.get_all_blackouts()
+            result = self.blackout_usecase.get_all_blackouts(
+                cursor=request.args.get('cursor'),
+                limit=request.args.get('limit')
+            )
             if result['success']:
-                return self.response.success(
+                return self.response.paginated(
                     data=result['data'],
+                    next_cursor=result['next_cursor'],
                     message="Blackouts berhasil diambil"
                 )
             return self.response.internal_error(
                 message=result.get('error', 'Failed to retrieve blackouts')
             )
+        except ValueError as e:
+            return self.response.bad_request(
+                message=str(e)
+            )
         except Exception as e:
             return self.response.internal_error(
                 message=f"Failed to retrieve blackouts: {str(e)}"
@@ -2,8 +2,8 @@ from flask import request
 from src.usecases.booking_usecase import BookingUseCase
 from src.utils.response_template import ResponseTemplate
 from src.config.socketio import socketio
-from src.websocket.booking_socket import broadcast_booking_created, broadcast_booking_updated, broadcast_booking_deleted
-from src.websocket.space_socket import broadcast_space_availability_changed
+from src.websocket.booking_socket import broadcast_booking_created, broadcast_booking_updated, broadcast_booking_deleted, broadcast_bookings_created_bulk
+from src.websocket.space_socket import broadcast_space_availability_changed, broadcast_space_availability_changed_bulk
 from datetime import datetime
 
 class BookingController:
@@ -13,6 +13,11 @@ class BookingController:
         self.usecase = BookingUseCase()
         self.response = ResponseTemplate()
     
+    @staticmethod
+    def _include_archived():
+        """?include_archived=1|true also reads bookings_archive (history listings only)"""
+        return request.args.get('include_archived', '').lower() in ['1', 'true']
+    
     def create_booking(self):
         """Handler to create a new booking"""
         try:
@@ -63,6 +68,94 @@ class BookingController:
                 message=f"Failed to create booking: {str(e)}"
             )
     
+    def create_bulk_bookings(self):
+        """Handler to create recurring/bulk bookings in one request"""
+        try:
+            data = request.get_json()
+            
+            # Validasi required fields
+            required_fields = ['user_id', 'space_id']
+            for field in required_fields:
+                if not data or field not in data:
+                    return self.response.bad_request(
+                        message=f"Field '{field}' required"
+                    )
+            
+            result = self.usecase.create_bulk_bookings(
+                user_id=data['user_id'],
+                space_id=data['space_id'],
+                occurrences=data.get('occurrences'),
+                rrule=data.get('rrule'),
+                start_date=data.get('start_date'),
+                start_time=data.get('start_time'),
+                end_time=data.get('end_time'),
+                all_or_nothing=bool(data.get('all_or_nothing', False))
+            )
+            
+            created = [item['booking'] for item in result['occurrences'] if item['booking']]
+            if created:
+                # One coalesced event per namespace instead of one per booking
+                broadcast_bookings_created_bulk(socketio, data['user_id'], created)
+                broadcast_space_availability_changed_bulk(
+                    socketio,
+                    space_id=result['space_id'],
+                    changes=[
+                        {'date': booking['date'], 'start': booking['start_time'], 'end': booking['end_time']}
+                        for booking in created
+                    ]
+                )
+            
+            message = f"{result['created']} of {result['requested']} bookings created"
+            if result['created'] == 0:
+                return self.response.bad_request(
+                    message=message,
+                    details=result
+                )
+            return self.response.created(
+                data=result,
+                message=message
+            )
+            
+        except ValueError as e:
+            return self.response.bad_request(
+                message=str(e)
+            )
+        except Exception as e:
+            return self.response.internal_error(
+                message=f"Failed to create bookings: {str(e)}"
+            )
+    
+    def get_department_bookings(self, department_id):
+        """Handler to get bookings of a department (managers), paged with a cursor"""
+        try:
+            if not department_id:
+                return self.response.bad_request(
+                    message="Query param 'department_id' required"
+                )
+            
+            page = self.usecase.get_department_bookings(
+                department_id,
+                date_from=request.args.get('from'),
+                date_to=request.args.get('to'),
+                status=request.args.get('status'),
+                cursor=request.args.get('cursor'),
+                limit=request.args.get('limit'),
+                include_archived=self._include_archived()
+            )
+            return self.response.paginated(
+                data=page['bookings'],
+                next_cursor=page['next_cursor'],
+                message="Department bookings retrieved successfully"
+            )
+        except ValueError as e:
+            return self.response.bad_request(
+                message=str(e)
+            )
+        except Exception as e:
+            return self.response.internal_error(
+                message=f"Failed to retrieve department bookings: {str(e)}"
+            )
+    
     def get_booking_by_id(self, booking_id):
         """Handler to get booking by ID"""
         try:
@@ -94,14 +187,24 @@ class BookingController:
             )
     
     def get_user_bookings(self, user_id):
-        """Handler to get all bookings by user"""
+        """Handler to get bookings by user, paged with a cursor"""
         try:
-            bookings = self.usecase.get_user_bookings(user_id)
-            return self.response.success(
-                data=bookings,
+            page = self.usecase.get_user_bookings(
+                user_id,
+                cursor=request.args.get('cursor'),
+                limit=request.args.get('limit'),
+                include_archived=self._include_archived()
+            )
+            return self.response.paginated(
+                data=page['bookings'],
+                next_cursor=page['next_cursor'],
                 message="User bookings retrieved successfully"
             )
             
+        except ValueError as e:
+            return self.response.bad_request(
+                message=str(e)
+            )
         except Exception as e:
             return self.response.internal_error(
                 message=f"Failed to retrieve user bookings: {str(e)}"
@@ -165,19 +268,60 @@ class BookingController:
                 message=f"Failed to update booking status: {str(e)}"
             )
     
+    def checkin(self):
+        """Handler to check in by code only (fast path for scanners)"""
+        try:
+            data = request.get_json() or {}
+            
+            booking = self.usecase.checkin_by_code(data.get('checkin_code'))
+            
+            # Broadcast WebSocket event to bookings namespace
+            broadcast_booking_updated(socketio, booking)
+            
+            return self.response.success(
+                data=booking,
+                message="Check-in successful"
+            )
+            
+        except ValueError as e:
+            return self.response.bad_request(
+                message=str(e)
+            )
+        except Exception as e:
+            return self.response.internal_error(
+                message=f"Failed to check in: {str(e)}"
+            )
+    
     # Management endpoints (superadmin only)
     def get_bookings_for_management(self):
         """Handler to get all bookings for management"""
         try:
-            result = self.usecase.get_all_bookings_for_management()
+            result = self.usecase.get_all_bookings_for_management(
+                date_from=request.args.get('from'),
+                date_to=request.args.get('to'),
+                space_id=request.args.get('space_id', type=int),
+                user_id=request.args.get('user_id', type=int),
+                status=request.args.get('status'),
+                sort=request.args.get('sort', 'start_at'),
+                order=request.args.get('order', 'desc'),
+                cursor=request.args.get('cursor'),
+                limit=request.args.get('limit'),
+                include_archived=self._include_archived()
+            )
             if result['success']:
-                return self.response.success(
+                return self.response.paginated(
                     data=result['data'],
+                    next_cursor=result['next_cursor'],
+                    total=result['total'],
                     message="Bookings retrieved successfully"
                 )
             return self.response.internal_error(
                 message=result.get('error', 'Failed to retrieve bookings')
             )
+        except ValueError as e:
+            return self.response.bad_request(
+                message=str(e)
+            )
         except Exception as e:
             return self.response.internal_error(
                 message=f"Failed to retrieve bookings: {str(e)}"
@@ -242,6 +386,7 @@ class BookingController:
             start_at = data.get('start_at') if data else None
             end_at = data.get('end_at') if data else None
             status = data.get('status') if data else None
+            version = data.get('version') if data else None
             
             result = self.usecase.update_booking_management(
                 booking_id=booking_id,
@@ -249,7 +394,8 @@ class BookingController:
                 space_id=space_id,
                 start_at=start_at,
                 end_at=end_at,
-                status=status
+                status=status,
+                version=version
             )
             
             if result['success']:
@@ -257,6 +403,11 @@ class BookingController:
                     data=result['data'],
                     message="Booking updated successfully"
                 )
+            if result.get('conflict'):
+                return self.response.conflict(
+                    message=result['error'],
+                    details={'current_version': result['current_version']}
+                )
             return self.response.bad_request(
                 message=result.get('error', 'Failed to update booking')
             )
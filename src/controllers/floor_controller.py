@@ -12,7 +12,8 @@ class FloorController:
     def get_floors(self):
         """Handler to get all floors"""
         try:
-            result = self.floor_usecase.get_all_floors()
+            include = [value.strip() for value in request.args.get('include', '').split(',')]
+            result = self.floor_usecase.get_all_floors(include_spaces='spaces' in include)
             if result['success']:
                 return self.response.success(
                     data=result['data'],
@@ -1,4 +1,8 @@
 from flask import jsonify
+from src.utils.availability_cache import availability_cache
+from src.utils.batch_loader import username_cache
+from src.jobs.booking_sweeper import booking_sweeper
+from src.utils.composite import composite_executor
 
 class HealthController:
     """Controller to handle health check"""
@@ -8,5 +12,13 @@ class HealthController:
         return jsonify({
             'success': True,
             'message': 'Server is running',
-            'database': 'connected'
+            'database': 'connected',
+            'cache': {
+                'availability': availability_cache.stats(),
+                'usernames': username_cache.stats()
+            },
+            'jobs': {
+                'booking_sweeper': booking_sweeper.stats()
+            },
+            'composite': composite_executor.stats()
         }), 200
@@ -28,6 +28,64 @@ class SpaceController:
                 message=f"Failed to retrieve spaces: {str(e)}"
             )
     
+    def get_availability_range(self, from_date=None, to_date=None):
+        """Handler to get free intervals per space per day for a date range"""
+        try:
+            availability = self.space_usecase.get_availability_range(from_date, to_date)
+            return self.response.success(
+                data=availability,
+                message="Space availability retrieved successfully"
+            )
+        except ValueError as e:
+            return self.response.bad_request(
+                message=str(e)
+            )
+        except Exception as e:
+            return self.response.internal_error(
+                message=f"Failed to retrieve space availability: {str(e)}"
+            )
+    
+    def search_available_slots(self):
+        """Handler to find the earliest free slots matching capacity, type, amenities and duration"""
+        try:
+            if not request.args.get('duration'):
+                return self.response.bad_request(
+                    message="Query param 'duration' required (minutes)"
+                )
+            
+            try:
+                duration = int(request.args.get('duration'))
+                min_capacity = request.args.get('capacity', type=int)
+                limit = int(request.args.get('limit', 10))
+            except ValueError:
+                return self.response.bad_request(
+                    message="duration, capacity and limit must be integers"
+                )
+            
+            amenities = request.args.get('amenities')
+            
+            slots = self.space_usecase.find_available_slots(
+                duration=duration,
+                from_at=request.args.get('from'),
+                to_at=request.args.get('to'),
+                min_capacity=min_capacity,
+                space_type=request.args.get('type'),
+                amenities=amenities.split(',') if amenities else None,
+                limit=limit
+            )
+            return self.response.success(
+                data=slots,
+                message="Available slots retrieved successfully"
+            )
+        except ValueError as e:
+            return self.response.bad_request(
+                message=str(e)
+            )
+        except Exception as e:
+            return self.response.internal_error(
+                message=f"Failed to search available slots: {str(e)}"
+            )
+    
     def get_space_by_id(self, space_id):
         """Handler to get space by ID"""
         try:
@@ -1,6 +1,7 @@
 
 from flask import request
 from src.usecases.stats_usecase import StatsUseCase
+from src.usecases.analytics_usecase import AnalyticsUseCase
 from src.utils.response_template import ResponseTemplate
 
 class StatsController:
@@ -8,6 +9,7 @@ class StatsController:
     
     def __init__(self):
         self.usecase = StatsUseCase()
+        self.analytics_usecase = AnalyticsUseCase()
         self.response = ResponseTemplate()
     
     def get_user_stats(self):
@@ -34,3 +36,53 @@ class StatsController:
             return self.response.internal_error(
                 message=f"Failed to retrieve statistics: {str(e)}"
             )
+    
+    def get_home_screen(self):
+        """Handler to get the home screen (stats + upcoming bookings) of the current user"""
+        try:
+            current_user = request.current_user
+            result = self.usecase.get_home_screen(
+                current_user.get('user_id'),
+                current_user.get('department_id'),
+                current_user.get('role', 'employee')
+            )
+            
+            if result['success']:
+                return self.response.success(
+                    data=result['data'],
+                    message="Home screen retrieved successfully"
+                )
+            return self.response.internal_error(
+                message=result.get('error', 'Failed to retrieve home screen')
+            )
+            
+        except Exception as e:
+            return self.response.internal_error(
+                message=f"Failed to retrieve home screen: {str(e)}"
+            )
+    
+    def get_utilization(self):
+        """Handler to get utilization heatmaps (superadmin)"""
+        try:
+            result = self.analytics_usecase.get_utilization(
+                date_from=request.args.get('from'),
+                date_to=request.args.get('to'),
+                group_by=request.args.get('group_by', 'space'),
+                include_archived=request.args.get('include_archived', '').lower() in ['1', 'true']
+            )
+            if result['success']:
+                return self.response.success(
+                    data=result['data'],
+                    message="Utilization retrieved successfully"
+                )
+            return self.response.internal_error(
+                message=result.get('error', 'Failed to retrieve utilization')
+            )
+        except ValueError as e:
+            return self.response.bad_request(
+                message=str(e)
+            )
+        except Exception as e:
+            return self.response.internal_error(
+                message=f"Failed to retrieve utilization: {str(e)}"
+            )
@@ -12,15 +12,23 @@ class UserController:
     def get_users(self):
         """Handler to get all users"""
         try:
-            result = self.user_usecase.get_all_users()
+            result = self.user_usecase.get_all_users(
+                cursor=request.args.get('cursor'),
+                limit=request.args.get('limit')
+            )
             if result['success']:
-                return self.response.success(
+                return self.response.paginated(
                     data=result['data'],
+                    next_cursor=result['next_cursor'],
                     message="Users retrieved successfully"
                 )
             return self.response.internal_error(
                 message=result.get('error', 'Failed to retrieve users')
             )
+        except ValueError as e:
+            return self.response.bad_request(
+                message=str(e)
+            )
         except Exception as e:
             return self.response.internal_error(
                 message=f"Failed to retrieve users: {str(e)}"
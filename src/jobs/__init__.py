@@ -0,0 +1 @@
+# background jobs package
@@ -0,0 +1,150 @@
+"""
+Background sweeper untuk booking yang sudah kedaluwarsa
+
+Booking 'active' yang tidak pernah check-in sampai code_valid_to lewat
+diubah menjadi 'no_show', dan booking 'checkin' yang sudah lewat end_at
+diubah menjadi 'finished' (checkout_at = end_at). Update dilakukan per
+batch oleh BookingUseCase.sweep_expired_bookings.
+
+Job berjalan di thread terpisah di setiap worker, tetapi dijaga advisory
+lock (GET_LOCK) sehingga hanya satu worker yang menyapu pada satu waktu;
+worker lain melewati run tersebut. Setelah sweep, satu event
+availability_changed dikirim per space-day yang terdampak.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from src.config.database import db
+from src.usecases.booking_usecase import BookingUseCase
+from src.websocket.space_socket import broadcast_space_availability_changed
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = 'openbo_booking_sweeper'
+
+
+class BookingSweeper:
+    """Periodic expiry job with run metrics"""
+
+    def __init__(self, interval_seconds=60, batch_size=500, max_batches=20):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._started = False
+        self._runs = 0
+        self._skipped = 0
+        self._failures = 0
+        self._expired = {'no_show': 0, 'finished': 0}
+        self._last_run = None
+
+    def start(self, app, socketio, interval_seconds=None, batch_size=None):
+        """Start the background loop once per process"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            self.interval_seconds = interval_seconds or self.interval_seconds
+            self.batch_size = batch_size or self.batch_size
+
+        self._stop.clear()
+        socketio.start_background_task(self._run_forever, app, socketio)
+        logger.info(f"Booking sweeper started (every {self.interval_seconds}s, batches of {self.batch_size})")
+
+    def stop(self):
+        """Stop the loop after the current run"""
+        self._stop.set()
+        with self._lock:
+            self._started = False
+
+    def _run_forever(self, app, socketio):
+        while not self._stop.wait(self.interval_seconds):
+            self.run_once(app, socketio)
+
+    def run_once(self, app, socketio=None):
+        """Sweep once if no other worker holds the lock, returns the sweep result or None"""
+        started = time.perf_counter()
+        started_at = datetime.now()
+
+        try:
+            with app.app_context():
+                with db.engine.connect() as lock_connection:
+                    acquired = lock_connection.execute(
+                        db.text("SELECT GET_LOCK(:name, 0)"), {'name': LOCK_NAME}
+                    ).scalar()
+                    if acquired != 1:
+                        with self._lock:
+                            self._skipped += 1
+                        return None
+
+                    try:
+                        result = BookingUseCase().sweep_expired_bookings(
+                            now=started_at,
+                            batch_size=self.batch_size,
+                            max_batches=self.max_batches
+                        )
+                    finally:
+                        lock_connection.execute(db.text("SELECT RELEASE_LOCK(:name)"), {'name': LOCK_NAME})
+
+            if socketio:
+                self._broadcast(socketio, result['space_days'])
+        except Exception as e:
+            logger.error(f"Booking sweeper failed: {str(e)}")
+            with self._lock:
+                self._failures += 1
+                self._last_run = {
+                    'started_at': started_at.isoformat(),
+                    'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+                    'error': str(e)
+                }
+            return None
+
+        with self._lock:
+            self._runs += 1
+            self._expired['no_show'] += result['no_show']
+            self._expired['finished'] += result['finished']
+            self._last_run = {
+                'started_at': started_at.isoformat(),
+                'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+                'no_show': result['no_show'],
+                'finished': result['finished'],
+                'batches': result['batches'],
+                'space_days': len(result['space_days'])
+            }
+
+        return result
+
+    @staticmethod
+    def _broadcast(socketio, space_days):
+        """One availability_changed per affected space-day"""
+        for (space_id, target_date), (first_start, last_end) in sorted(space_days.items()):
+            broadcast_space_availability_changed(
+                socketio,
+                space_id=space_id,
+                date=target_date.strftime('%Y-%m-%d'),
+                affected_time_range={
+                    'start': first_start.strftime('%H:%M'),
+                    'end': last_end.strftime('%H:%M')
+                }
+            )
+
+    def stats(self):
+        """Run counters for monitoring"""
+        with self._lock:
+            return {
+                'running': self._started,
+                'interval_seconds': self.interval_seconds,
+                'batch_size': self.batch_size,
+                'runs': self._runs,
+                'skipped_locked': self._skipped,
+                'failures': self._failures,
+                'expired': dict(self._expired),
+                'last_run': self._last_run
+            }
+
+
+# Shared instance for the whole process
+booking_sweeper = BookingSweeper()
@@ -0,0 +1 @@
+# migrations package
@@ -0,0 +1,89 @@
+"""
+EXPLAIN check for the hot repository queries
+
+Menjalankan method repository yang sering dipanggil dengan argumen contoh,
+menangkap SQL yang benar-benar dikirim ke database, lalu menjalankan
+EXPLAIN untuk setiap SELECT. Tabel yang dibaca dengan full table scan
+(type = ALL) dilaporkan supaya index yang kurang cepat ketahuan.
+"""
+
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from src.config.database import db
+from src.repositories.booking_repository import BookingRepository
+from src.repositories.task_repository import TaskRepository
+from src.repositories.announcement_repository import AnnouncementRepository
+from src.repositories.user_repository import UserRepository
+
+
+def hot_queries():
+    """(label, callable) pairs of repository calls worth checking"""
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+
+    return [
+        ('BookingRepository.get_active_bookings_between',
+         lambda: BookingRepository.get_active_bookings_between(today, today + timedelta(days=1))),
+        ('BookingRepository.find_overlapping_booking',
+         lambda: BookingRepository.find_overlapping_booking(1, today + timedelta(hours=9), today + timedelta(hours=10))),
+        ('BookingRepository.get_bookings_by_user_page',
+         lambda: BookingRepository.get_bookings_by_user_page(1)),
+        ('BookingRepository.find_by_checkin_code',
+         lambda: BookingRepository.find_by_checkin_code('CHK-EXPLAIN')),
+        ('TaskRepository.get_todo_for_user',
+         lambda: TaskRepository().get_todo_for_user(1, 20)),
+        ('TaskRepository.count_todo_for_user',
+         lambda: TaskRepository().count_todo_for_user(1)),
+        ('TaskRepository.get_by_assignment_with_usernames',
+         lambda: TaskRepository().get_by_assignment_with_usernames(1)),
+        ('AnnouncementRepository.get_by_department',
+         lambda: AnnouncementRepository().get_by_department(1)),
+        ('AnnouncementRepository.get_recent',
+         lambda: AnnouncementRepository().get_recent(5, department_id=1)),
+        ('AnnouncementRepository.get_for_department_page',
+         lambda: AnnouncementRepository().get_for_department_page(1)),
+        ('UserRepository.get_by_department_id',
+         lambda: UserRepository().get_by_department_id(1)),
+    ]
+
+
+def capture_statements(call):
+    """Run a repository call and return the (statement, parameters) of its SELECTs"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        call()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        db.session.rollback()
+
+    return statements
+
+
+def explain_hot_queries():
+    """
+    EXPLAIN every captured statement
+
+    Returns [{'query': label, 'statement': sql, 'plan': [row, ...], 'full_scans': [table, ...]}]
+    """
+    report = []
+
+    for label, call in hot_queries():
+        for statement, parameters in capture_statements(call):
+            plan = [
+                dict(row)
+                for row in db.session.connection().exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings()
+            ]
+            report.append({
+                'query': label,
+                'statement': statement,
+                'plan': plan,
+                'full_scans': [row['table'] for row in plan if row.get('type') == 'ALL']
+            })
+
+    db.session.rollback()
+    return report
@@ -0,0 +1,154 @@
+"""
+Versioned, forward-only migration runner
+
+Setiap step adalah module `vNNNN_<nama>.py` di package ini dengan VERSION,
+DESCRIPTION dan fungsi upgrade(). Versi yang sudah dijalankan dicatat di
+tabel schema_migrations, jadi menjalankan migrate berulang kali aman dan
+tidak menghapus data.
+
+DDL di MariaDB melakukan implicit commit, sehingga satu step tidak bisa
+di-rollback. Karena itu setiap step harus idempotent (cek dulu sebelum
+create) supaya step yang gagal di tengah jalan bisa dijalankan ulang.
+"""
+
+import importlib
+import pkgutil
+from datetime import datetime
+from src.config.database import db
+
+VERSIONS_TABLE = 'schema_migrations'
+
+# Advisory lock so several workers starting at once do not migrate concurrently
+LOCK_NAME = 'openbo_schema_migrations'
+LOCK_TIMEOUT_SECONDS = 60
+
+
+def load_migrations():
+    """Discover migration modules ordered by VERSION"""
+    package = importlib.import_module('src.migrations')
+    migrations = [
+        importlib.import_module(f'src.migrations.{module.name}')
+        for module in pkgutil.iter_modules(package.__path__)
+        if module.name.startswith('v') and module.name[1:5].isdigit()
+    ]
+    migrations.sort(key=lambda migration: migration.VERSION)
+
+    versions = [migration.VERSION for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions: {versions}")
+
+    return migrations
+
+
+def ensure_versions_table():
+    """Create the versions table if it does not exist yet"""
+    db.session.execute(db.text(
+        f"CREATE TABLE IF NOT EXISTS {VERSIONS_TABLE} ("
+        "version INT NOT NULL PRIMARY KEY, "
+        "description VARCHAR(200) NOT NULL, "
+        "applied_at DATETIME NOT NULL"
+        ")"
+    ))
+    db.session.commit()
+
+
+def get_applied_versions():
+    """Get {version: applied_at} of applied migrations"""
+    ensure_versions_table()
+    rows = db.session.execute(db.text(f"SELECT version, applied_at FROM {VERSIONS_TABLE}"))
+    return {row[0]: row[1] for row in rows}
+
+
+def get_status():
+    """Get [(migration, applied_at or None), ...] for every known migration"""
+    applied = get_applied_versions()
+    return [(migration, applied.get(migration.VERSION)) for migration in load_migrations()]
+
+
+def migrate(on_step=None):
+    """
+    Apply pending migrations in order, return the applied modules
+
+    on_step(migration) is called before each step (for progress output).
+    """
+    with db.engine.connect() as lock_connection:
+        acquired = lock_connection.execute(
+            db.text("SELECT GET_LOCK(:name, :timeout)"),
+            {'name': LOCK_NAME, 'timeout': LOCK_TIMEOUT_SECONDS}
+        ).scalar()
+        if acquired != 1:
+            raise RuntimeError("Another process is running migrations")
+
+        try:
+            applied = get_applied_versions()
+            done = []
+
+            for migration in load_migrations():
+                if migration.VERSION in applied:
+                    continue
+
+                if on_step:
+                    on_step(migration)
+
+                migration.upgrade()
+                db.session.execute(
+                    db.text(
+                        f"INSERT INTO {VERSIONS_TABLE} (version, description, applied_at) "
+                        "VALUES (:version, :description, :applied_at)"
+                    ),
+                    {
+                        'version': migration.VERSION,
+                        'description': migration.DESCRIPTION,
+                        'applied_at': datetime.utcnow()
+                    }
+                )
+                db.session.commit()
+                done.append(migration)
+
+            return done
+        finally:
+            lock_connection.execute(db.text("SELECT RELEASE_LOCK(:name)"), {'name': LOCK_NAME})
+
+
+def index_exists(table, name):
+    """Check whether an index exists on a table of the current database"""
+    return db.session.execute(
+        db.text(
+            "SELECT COUNT(*) FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = :table AND index_name = :name"
+        ),
+        {'table': table, 'name': name}
+    ).scalar() > 0
+
+
+def column_exists(table, column):
+    """Check whether a column exists on a table of the current database"""
+    return db.session.execute(
+        db.text(
+            "SELECT COUNT(*) FROM information_schema.columns "
+            "WHERE table_schema = DATABASE() AND table_name = :table AND column_name = :column"
+        ),
+        {'table': table, 'column': column}
+    ).scalar() > 0
+
+
+def add_column(table, column, definition):
+    """Add a column unless it already exists (idempotent step helper)"""
+    if column_exists(table, column):
+        return False
+
+    db.session.execute(db.text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
+    db.session.commit()
+    return True
+
+
+def create_index(table, name, columns, unique=False):
+    """Create an index unless it already exists (idempotent step helper)"""
+    if index_exists(table, name):
+        return False
+
+    db.session.execute(db.text(
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table} ({', '.join(columns)})"
+    ))
+    db.session.commit()
+    return True
@@ -0,0 +1,14 @@
+"""
+Baseline schema: create every table defined by the models that does not exist yet
+
+Non-destructive, existing tables (and their data) are left untouched.
+"""
+
+from src.config.database import db
+
+VERSION = 1
+DESCRIPTION = 'Baseline schema from models'
+
+
+def upgrade():
+    db.create_all()
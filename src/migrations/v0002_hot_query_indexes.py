@@ -0,0 +1,24 @@
+"""
+Indexes for the hot queries
+
+- bookings(space_id, start_at, status): conflict checks and availability
+- bookings(user_id, start_at): user booking lists and stats
+- tasks(user_id): todo list per user
+- announcements(department_id, created_at): department feed, newest first
+
+bookings(checkin_code) is already covered by the unique index on that column.
+The same indexes are declared on the models so fresh databases get them from
+the baseline step; this step adds them to databases created before that.
+"""
+
+from src.migrations.runner import create_index
+
+VERSION = 2
+DESCRIPTION = 'Indexes for bookings, tasks and announcements hot queries'
+
+
+def upgrade():
+    create_index('bookings', 'ix_bookings_space_start_status', ['space_id', 'start_at', 'status'])
+    create_index('bookings', 'ix_bookings_user_start', ['user_id', 'start_at'])
+    create_index('tasks', 'ix_tasks_user_id', ['user_id'])
+    create_index('announcements', 'ix_announcements_department_created', ['department_id', 'created_at'])
@@ -0,0 +1,16 @@
+"""
+Optimistic lock column on bookings
+
+bookings.version starts at 1 and is incremented by every status transition
+and management edit, so concurrent superadmin edits can detect that the row
+changed since it was read. Existing rows get 1 through the column default.
+"""
+
+from src.migrations.runner import add_column
+
+VERSION = 3
+DESCRIPTION = 'Add bookings.version for optimistic locking'
+
+
+def upgrade():
+    add_column('bookings', 'version', 'INT NOT NULL DEFAULT 1')
@@ -0,0 +1,16 @@
+"""
+Indexes for the booking expiry sweeper
+
+- bookings(status, code_valid_to): active bookings whose check-in window closed
+- bookings(status, end_at): checked-in bookings past their end
+"""
+
+from src.migrations.runner import create_index
+
+VERSION = 4
+DESCRIPTION = 'Indexes for the booking expiry sweeper'
+
+
+def upgrade():
+    create_index('bookings', 'ix_bookings_status_valid_to', ['status', 'code_valid_to'])
+    create_index('bookings', 'ix_bookings_status_end', ['status', 'end_at'])
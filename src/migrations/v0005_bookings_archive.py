@@ -0,0 +1,18 @@
+"""
+Archive table for old bookings
+
+bookings_archive has the same columns as bookings plus archived_at.
+Finished, cancelled and no_show bookings older than the archive horizon are
+moved there in batches (python archive.py), keeping the hot table small.
+"""
+
+from src.config.database import db
+from src.models.booking_archive import BookingArchive
+
+VERSION = 5
+DESCRIPTION = 'Create bookings_archive'
+
+
+def upgrade():
+    # checkfirst keeps the step idempotent; the table indexes are created with it
+    BookingArchive.__table__.create(db.engine, checkfirst=True)
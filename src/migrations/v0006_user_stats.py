@@ -0,0 +1,26 @@
+"""
+Per-user dashboard summary tables
+
+- user_space_stats: bookings per user and space (favorite space)
+- user_day_stats: open / active bookings per user and start date (today, upcoming)
+- user_week_stats: checked-in seconds per user and ISO week (weekly hours)
+
+Existing bookings are backfilled per chunk of users; `python rebuild_stats.py`
+repairs the tables later if they ever drift.
+"""
+
+from src.config.database import db
+from src.models.user_stats import UserSpaceStats, UserDayStats, UserWeekStats
+from src.repositories.user_stats_repository import UserStatsRepository
+
+VERSION = 6
+DESCRIPTION = 'Create user stats summary tables'
+
+
+def upgrade():
+    for model in (UserSpaceStats, UserDayStats, UserWeekStats):
+        model.__table__.create(db.engine, checkfirst=True)
+
+    # rebuild() deletes before inserting, so re-running this step is safe
+    for user_ids in UserStatsRepository.get_user_id_chunks(500):
+        UserStatsRepository.rebuild(user_ids)
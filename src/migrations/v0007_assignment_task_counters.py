@@ -0,0 +1,26 @@
+"""
+Cached task progress on assignments
+
+assignments.total_tasks / done_tasks are kept in sync by every task create,
+update and delete (TaskRepository), so single-assignment reads need no task
+rows. Existing rows are backfilled from one grouped pass over tasks.
+"""
+
+from src.config.database import db
+from src.migrations.runner import add_column
+
+VERSION = 7
+DESCRIPTION = 'Add cached task counters to assignments'
+
+
+def upgrade():
+    add_column('assignments', 'total_tasks', 'INT NOT NULL DEFAULT 0')
+    add_column('assignments', 'done_tasks', 'INT NOT NULL DEFAULT 0')
+
+    db.session.execute(db.text(
+        "UPDATE assignments a "
+        "LEFT JOIN (SELECT assignment_id, COUNT(*) AS total_tasks, SUM(is_done = 1) AS done_tasks "
+        "FROM tasks GROUP BY assignment_id) t ON t.assignment_id = a.id "
+        "SET a.total_tasks = COALESCE(t.total_tasks, 0), a.done_tasks = COALESCE(t.done_tasks, 0)"
+    ))
+    db.session.commit()
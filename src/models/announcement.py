@@ -5,6 +5,9 @@ class Announcement(db.Model):
     """Announcement model"""
     
     __tablename__ = 'announcements'
+    __table_args__ = (
+        db.Index('ix_announcements_department_created', 'department_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     title = db.Column(db.String(200), nullable=False)
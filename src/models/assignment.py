@@ -15,6 +15,10 @@ class Assignment(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Cached task progress, kept in sync by TaskRepository create/update/delete
+    total_tasks = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    done_tasks = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
     # Relationships
     creator = db.relationship('User', foreign_keys=[created_by], backref='created_assignments')
     department = db.relationship('Department', foreign_keys=[department_id], backref='assignments')
@@ -32,6 +36,8 @@ class Assignment(db.Model):
             'created_by': self.created_by,
             'department_id': self.department_id,
             'due_date': self.due_date.isoformat() if self.due_date else None,
+            'total_tasks': self.total_tasks,
+            'done_tasks': self.done_tasks,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
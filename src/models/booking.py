@@ -5,11 +5,20 @@ class Booking(db.Model):
     """Booking model - user reservations for spaces"""
     
     __tablename__ = 'bookings'
+    __table_args__ = (
+        # Conflict checks and availability (per space, by time, active/checkin only)
+        db.Index('ix_bookings_space_start_status', 'space_id', 'start_at', 'status'),
+        # "My bookings" and per-user stats
+        db.Index('ix_bookings_user_start', 'user_id', 'start_at'),
+        # Expiry sweeper: active past code_valid_to, checkin past end_at
+        db.Index('ix_bookings_status_valid_to', 'status', 'code_valid_to'),
+        db.Index('ix_bookings_status_end', 'status', 'end_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     space_id = db.Column(db.Integer, db.ForeignKey('spaces.id'), nullable=False)
-    status = db.Column(db.String(20), default='active')  # active, cancelled, no_show
+    status = db.Column(db.String(20), default='active')  # active, checkin, finished, cancelled, no_show
     start_at = db.Column(db.DateTime, nullable=False)
     end_at = db.Column(db.DateTime, nullable=False)
     max_duration_snapshot = db.Column(db.Integer)
@@ -20,6 +29,8 @@ class Booking(db.Model):
     checkout_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Optimistic lock, bumped by every write (status transitions and management edits)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     def __repr__(self):
         return f'<Booking {self.id} - User:{self.user_id} Space:{self.space_id}>'
@@ -47,5 +58,6 @@ class Booking(db.Model):
             'checkin_at': self.checkin_at.isoformat() if self.checkin_at else None,
             'checkout_at': self.checkout_at.isoformat() if self.checkout_at else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'version': self.version
         }
@@ -0,0 +1,64 @@
+from datetime import datetime
+from src.config.database import db
+
+class BookingArchive(db.Model):
+    """Archived booking - finished/cancelled/no_show bookings moved out of the hot table"""
+    
+    __tablename__ = 'bookings_archive'
+    __table_args__ = (
+        # History reads ("my bookings" and management listing with include_archived)
+        db.Index('ix_bookings_archive_user_start', 'user_id', 'start_at'),
+        db.Index('ix_bookings_archive_space_start', 'space_id', 'start_at'),
+    )
+    
+    # Same id as the original row in bookings, so cursors stay valid across both tables
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    space_id = db.Column(db.Integer, db.ForeignKey('spaces.id'), nullable=False)
+    status = db.Column(db.String(20))  # finished, cancelled, no_show
+    start_at = db.Column(db.DateTime, nullable=False)
+    end_at = db.Column(db.DateTime, nullable=False)
+    max_duration_snapshot = db.Column(db.Integer)
+    checkin_code = db.Column(db.String(50))
+    code_valid_from = db.Column(db.DateTime)
+    code_valid_to = db.Column(db.DateTime)
+    checkin_at = db.Column(db.DateTime, nullable=True)
+    checkout_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    user = db.relationship('User', foreign_keys=[user_id])
+    space = db.relationship('Space', foreign_keys=[space_id])
+    
+    def __repr__(self):
+        return f'<BookingArchive {self.id} - User:{self.user_id} Space:{self.space_id}>'
+    
+    def to_dict(self):
+        """Convert archived booking to dictionary (same shape as Booking.to_dict)"""
+        date = self.start_at.strftime('%Y-%m-%d') if self.start_at else None
+        start_time = self.start_at.strftime('%H:%M') if self.start_at else None
+        end_time = self.end_at.strftime('%H:%M') if self.end_at else None
+        
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'space_id': self.space_id,
+            'space_name': self.space.name if self.space else 'Unknown',
+            'space_type': self.space.type if self.space else 'Unknown',
+            'date': date,
+            'start_time': start_time,
+            'end_time': end_time,
+            'status': self.status,
+            'checkin_code': self.checkin_code,
+            'code_valid_from': self.code_valid_from.isoformat() if self.code_valid_from else None,
+            'code_valid_to': self.code_valid_to.isoformat() if self.code_valid_to else None,
+            'checkin_at': self.checkin_at.isoformat() if self.checkin_at else None,
+            'checkout_at': self.checkout_at.isoformat() if self.checkout_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'version': self.version,
+            'archived': True,
+            'archived_at': self.archived_at.isoformat() if self.archived_at else None
+        }
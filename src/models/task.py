@@ -5,6 +5,9 @@ class Task(db.Model):
     """Task model"""
     
     __tablename__ = 'tasks'
+    __table_args__ = (
+        db.Index('ix_tasks_user_id', 'user_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     title = db.Column(db.String(200), nullable=False)
@@ -0,0 +1,47 @@
+from src.config.database import db
+
+# Dashboard summary tables, derived from bookings and updated on every booking
+# event (see UserStatsRepository); rebuild with `python rebuild_stats.py`
+
+class UserSpaceStats(db.Model):
+    """Bookings made per user and space (favorite space)"""
+    
+    __tablename__ = 'user_space_stats'
+    __table_args__ = (
+        # Favorite space: highest count of one user
+        db.Index('ix_user_space_stats_user_count', 'user_id', 'booking_count'),
+    )
+    
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    space_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    booking_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<UserSpaceStats User:{self.user_id} Space:{self.space_id} {self.booking_count}>'
+
+
+class UserDayStats(db.Model):
+    """Open (active/checkin) and active bookings per user and start date"""
+    
+    __tablename__ = 'user_day_stats'
+    
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    day = db.Column(db.Date, primary_key=True)
+    open_bookings = db.Column(db.Integer, nullable=False, default=0)
+    active_bookings = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<UserDayStats User:{self.user_id} {self.day}>'
+
+
+class UserWeekStats(db.Model):
+    """Checked-in time per user and ISO week of checkin_at"""
+    
+    __tablename__ = 'user_week_stats'
+    
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    iso_week = db.Column(db.Integer, primary_key=True, autoincrement=False)  # YYYYWW, e.g. 202642
+    booked_seconds = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<UserWeekStats User:{self.user_id} {self.iso_week}>'
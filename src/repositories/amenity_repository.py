@@ -1,5 +1,7 @@
+from sqlalchemy.orm import joinedload
 from src.models.amenity import Amenity
 from src.config.database import db
+from src.utils.pagination import keyset_page, DEFAULT_LIMIT
 
 class AmenityRepository:
     """Repository for Amenity operations"""
@@ -9,6 +11,12 @@ class AmenityRepository:
         """Get all amenities"""
         return Amenity.query.all()
     
+    @staticmethod
+    def get_page(cursor=None, limit=DEFAULT_LIMIT):
+        """Get one page of amenities ordered by id (space loaded), returns (amenities, next_cursor)"""
+        query = Amenity.query.options(joinedload(Amenity.space))
+        return keyset_page(query, Amenity.id, Amenity.id, cursor=cursor, limit=limit, descending=False)
+    
     @staticmethod
     def get_by_id(amenity_id):
         """Get amenity by ID"""
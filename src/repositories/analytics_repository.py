@@ -0,0 +1,60 @@
+from src.models.space import Space
+from src.models.floor import Floor
+from src.config.database import db
+
+# Hour-of-day rows 0..23 joined to each booking interval
+HOURS_TABLE = ' UNION ALL '.join(f'SELECT {hour} AS hour' for hour in range(24))
+
+# (metric, status filter, interval start, interval end) per booking row;
+# a check-in still in progress counts until now (or end_at if earlier)
+USAGE_METRICS = (
+    ('booked', "status <> 'cancelled'", 'start_at', 'end_at'),
+    ('checked_in', 'checkin_at IS NOT NULL', 'checkin_at', 'COALESCE(checkout_at, LEAST(end_at, :now))'),
+    ('no_show', "status = 'no_show'", 'start_at', 'end_at'),
+)
+
+class AnalyticsRepository:
+    """Repository for organization-wide utilization analytics"""
+    
+    @staticmethod
+    def get_hourly_usage(range_start, range_end, now, include_archived=False):
+        """
+        Sum booked / checked-in / no-show seconds per space, weekday and hour in SQL
+        
+        Every interval (clipped to the day it starts on) is joined to the hours
+        it touches and its overlap with each hour is summed by MariaDB, so no
+        booking rows are loaded. Bookings are selected by start_at in
+        [range_start, range_end). Returns rows (metric, space_id, weekday, hour,
+        seconds) with weekday 0 = Monday.
+        """
+        tables = ['bookings', 'bookings_archive'] if include_archived else ['bookings']
+        intervals = ' UNION ALL '.join(
+            f"SELECT '{metric}' AS metric, space_id, {start} AS s, "
+            f"LEAST({end}, DATE({start}) + INTERVAL 1 DAY) AS e "
+            f"FROM {table} "
+            f"WHERE {condition} AND start_at >= :range_start AND start_at < :range_end"
+            for table in tables
+            for metric, condition, start, end in USAGE_METRICS
+        )
+        
+        return db.session.execute(
+            db.text(
+                "SELECT i.metric, i.space_id, WEEKDAY(i.s) AS weekday, h.hour, "
+                "SUM(TIMESTAMPDIFF(SECOND, "
+                "GREATEST(i.s, DATE(i.s) + INTERVAL h.hour HOUR), "
+                "LEAST(i.e, DATE(i.s) + INTERVAL (h.hour + 1) HOUR))) AS seconds "
+                f"FROM ({intervals}) i "
+                f"JOIN ({HOURS_TABLE}) h "
+                "ON h.hour BETWEEN HOUR(i.s) AND HOUR(i.e - INTERVAL 1 SECOND) "
+                "WHERE i.e > i.s "
+                "GROUP BY i.metric, i.space_id, WEEKDAY(i.s), h.hour"
+            ),
+            {'range_start': range_start, 'range_end': range_end, 'now': now}
+        ).all()
+    
+    @staticmethod
+    def get_spaces_with_floors():
+        """Get (space, floor_name) for every space in one joined query"""
+        return db.session.query(Space, Floor.name).outerjoin(
+            Floor, Floor.id == Space.location
+        ).order_by(Space.id).all()
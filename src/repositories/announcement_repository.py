@@ -1,6 +1,9 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
 from src.models.announcement import Announcement
 from src.config.database import db
+from src.utils.pagination import keyset_page, DEFAULT_LIMIT
 
 class AnnouncementRepository:
     """Repository for Announcement operations"""
@@ -21,6 +24,32 @@ class AnnouncementRepository:
         """Get announcements for specific department"""
         return Announcement.query.filter_by(department_id=department_id).all()
     
+    def get_for_department_page(self, department_id: int, cursor: str = None, limit: int = DEFAULT_LIMIT) -> Tuple[List[Announcement], Optional[str]]:
+        """Get one page of company-wide + department announcements, newest first (creator and department loaded)"""
+        query = Announcement.query.options(
+            joinedload(Announcement.creator),
+            joinedload(Announcement.department)
+        ).filter(or_(
+            Announcement.department_id.is_(None),
+            Announcement.department_id == department_id
+        ))
+        return keyset_page(query, Announcement.created_at, Announcement.id, cursor=cursor, limit=limit)
+    
+    def get_recent(self, limit: int, department_id: Optional[int] = None, all_departments: bool = False) -> List[Announcement]:
+        """
+        Get the newest announcements, ORDER BY created_at DESC LIMIT limit in SQL
+        
+        all_departments returns every announcement (superadmin); otherwise
+        company-wide ones plus those of department_id (if given).
+        """
+        query = Announcement.query
+        if not all_departments:
+            condition = Announcement.department_id.is_(None)
+            if department_id:
+                condition = or_(condition, Announcement.department_id == department_id)
+            query = query.filter(condition)
+        return query.order_by(Announcement.created_at.desc(), Announcement.id.desc()).limit(limit).all()
+    
     def create(self, announcement_data: dict) -> Announcement:
         """Create new announcement"""
         announcement = Announcement(
@@ -1,6 +1,10 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy import case, func
+from sqlalchemy.orm import joinedload
 from src.models.assignment import Assignment
+from src.models.task import Task
 from src.config.database import db
+from src.utils.pagination import keyset_page, DEFAULT_LIMIT
 
 class AssignmentRepository:
     """Repository for Assignment operations"""
@@ -17,6 +21,63 @@ class AssignmentRepository:
         """Get all assignments for specific department"""
         return Assignment.query.filter_by(department_id=department_id).all()
     
+    @staticmethod
+    def _task_progress_subquery():
+        """Grouped (assignment_id, total_tasks, done_tasks) over tasks"""
+        return db.session.query(
+            Task.assignment_id.label('assignment_id'),
+            func.count(Task.id).label('total_tasks'),
+            func.sum(case((Task.is_done.is_(True), 1), else_=0)).label('done_tasks')
+        ).group_by(Task.assignment_id).subquery()
+    
+    def get_by_department_page_with_progress(self, department_id: int, cursor: str = None, limit: int = DEFAULT_LIMIT) -> Tuple[list, Optional[str]]:
+        """
+        Get one page of a department's assignments by due date with task progress
+        
+        Task counts come from one grouped subquery joined to the page, so no
+        task rows are loaded. Rows are (Assignment, total_tasks, done_tasks);
+        creator and department are loaded with the page.
+        """
+        progress = self._task_progress_subquery()
+        query = db.session.query(
+            Assignment,
+            func.coalesce(progress.c.total_tasks, 0).label('total_tasks'),
+            func.coalesce(progress.c.done_tasks, 0).label('done_tasks')
+        ).outerjoin(
+            progress, progress.c.assignment_id == Assignment.id
+        ).options(
+            joinedload(Assignment.creator),
+            joinedload(Assignment.department)
+        ).filter(Assignment.department_id == department_id)
+        return keyset_page(query, Assignment.due_date, Assignment.id, cursor=cursor, limit=limit, descending=False)
+    
+    def sync_task_progress(self, assignment_ids: Optional[List[int]] = None) -> int:
+        """
+        Recount cached task counters from the tasks table (all assignments by default)
+        
+        One UPDATE with correlated counts per assignment (tasks.assignment_id
+        is indexed by its foreign key). Returns the number of rows changed.
+        """
+        query = Assignment.query
+        if assignment_ids is not None:
+            query = query.filter(Assignment.id.in_(assignment_ids))
+        try:
+            updated = query.update({
+                Assignment.total_tasks: db.session.query(func.count(Task.id)).filter(
+                    Task.assignment_id == Assignment.id
+                ).scalar_subquery(),
+                Assignment.done_tasks: db.session.query(func.count(Task.id)).filter(
+                    Task.assignment_id == Assignment.id,
+                    Task.is_done.is_(True)
+                ).scalar_subquery(),
+                Assignment.updated_at: Assignment.updated_at
+            }, synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return updated
+    
     def create(self, assignment_data: dict) -> Assignment:
         """Create new assignment"""
         assignment = Assignment(
@@ -1,5 +1,7 @@
+from sqlalchemy.orm import joinedload
 from src.models.blackout import Blackout
 from src.config.database import db
+from src.utils.pagination import keyset_page, DEFAULT_LIMIT
 from datetime import datetime
 
 class BlackoutRepository:
@@ -10,6 +12,12 @@ class BlackoutRepository:
         """Get all blackouts"""
         return Blackout.query.order_by(Blackout.start_at.desc()).all()
     
+    @staticmethod
+    def get_page(cursor=None, limit=DEFAULT_LIMIT):
+        """Get one page of blackouts, latest start first (creator loaded), returns (blackouts, next_cursor)"""
+        query = Blackout.query.options(joinedload(Blackout.creator))
+        return keyset_page(query, Blackout.start_at, Blackout.id, cursor=cursor, limit=limit)
+    
     @staticmethod
     def get_by_id(blackout_id):
         """Get blackout by ID"""
@@ -1,9 +1,12 @@
 from datetime import datetime
-from sqlalchemy.orm import joinedload
+from sqlalchemy import insert, delete, select, literal, func
+from sqlalchemy.orm import joinedload, contains_eager
 from src.models.booking import Booking
+from src.models.booking_archive import BookingArchive
 from src.models.space import Space
-from src.models.blackout import Blackout
+from src.models.user import User
 from src.config.database import db
+from src.utils.pagination import keyset_page, keyset_page_union, DEFAULT_LIMIT
 
 class BookingRepository:
     """Repository for Booking operations"""
@@ -18,6 +21,106 @@ class BookingRepository:
         db.session.refresh(booking)
         return booking
     
+    @staticmethod
+    def create_booking_if_free(booking_data):
+        """
+        Create booking only if its time range is still free, atomically
+        
+        The space row is locked with SELECT ... FOR UPDATE so concurrent
+        requests for the same space are serialized across all workers, and the
+        overlap check runs in SQL inside the same transaction as the INSERT.
+        Returns (booking, None) on success or (None, conflicting_booking).
+        """
+        try:
+            Space.query.filter_by(id=booking_data['space_id']).with_for_update().first()
+            
+            # Locking read: a plain SELECT under REPEATABLE READ could use a snapshot
+            # taken before the space lock was granted and miss a just-committed booking
+            conflict = BookingRepository.find_overlapping_booking(
+                booking_data['space_id'], booking_data['start_at'], booking_data['end_at'], lock=True
+            )
+            
+            if conflict:
+                db.session.rollback()  # Release the lock
+                return None, conflict
+            
+            booking = Booking(**booking_data)
+            db.session.add(booking)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        # Refresh to load relationships
+        db.session.refresh(booking)
+        return booking, None
+    
+    @staticmethod
+    def find_overlapping_booking(space_id, start_at, end_at, lock=False):
+        """Get the first active/checkin booking of a space overlapping [start_at, end_at)"""
+        query = Booking.query.filter(
+            Booking.space_id == space_id,
+            Booking.status.in_(['active', 'checkin']),
+            Booking.start_at < end_at,
+            Booking.end_at > start_at
+        ).order_by(Booking.start_at)
+        
+        if lock:
+            query = query.with_for_update()
+        
+        return query.first()
+    
+    @staticmethod
+    def create_bookings_if_free(space_id, bookings_data, all_or_nothing=False):
+        """
+        Create several bookings of one space in a single transaction
+        
+        Same locking as create_booking_if_free, but existing bookings are loaded
+        with one range query and all free rows are written with one batched INSERT.
+        Returns (created, conflicts): created bookings in input order, and a dict
+        of input index -> conflicting booking. With all_or_nothing, nothing is
+        inserted when any row conflicts.
+        """
+        if not bookings_data:
+            return [], {}
+        
+        try:
+            Space.query.filter_by(id=space_id).with_for_update().first()
+            
+            existing = Booking.query.filter(
+                Booking.space_id == space_id,
+                Booking.status.in_(['active', 'checkin']),
+                Booking.start_at < max(data['end_at'] for data in bookings_data),
+                Booking.end_at > min(data['start_at'] for data in bookings_data)
+            ).order_by(Booking.start_at).with_for_update().all()
+            
+            conflicts = {}
+            for index, data in enumerate(bookings_data):
+                for booking in existing:
+                    if data['start_at'] < booking.end_at and data['end_at'] > booking.start_at:
+                        conflicts[index] = booking
+                        break
+            
+            free_rows = [data for index, data in enumerate(bookings_data) if index not in conflicts]
+            if not free_rows or (conflicts and all_or_nothing):
+                db.session.rollback()  # Release the lock
+                return [], conflicts
+            
+            db.session.execute(insert(Booking), free_rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        # checkin_code is unique, use it to load the inserted rows back with their ids
+        codes = [data['checkin_code'] for data in free_rows]
+        created_by_code = {
+            booking.checkin_code: booking
+            for booking in Booking.query.options(joinedload(Booking.space))
+                .filter(Booking.checkin_code.in_(codes)).all()
+        }
+        return [created_by_code[code] for code in codes], conflicts
+    
     @staticmethod
     def find_by_id(booking_id):
         """Get booking by ID"""
@@ -34,27 +137,123 @@ class BookingRepository:
         return Booking.query.options(joinedload(Booking.space)).filter_by(user_id=user_id).all()
     
     @staticmethod
-    def get_bookings_by_space_and_date(space_id, target_date):
-        """Get bookings for a specific space on a specific date"""
-        start_of_day = datetime.combine(target_date, datetime.min.time())
-        end_of_day = datetime.combine(target_date, datetime.max.time())
+    def _history_models(include_archived):
+        """Booking models a history read covers: the hot table, plus the archive when asked"""
+        return [Booking, BookingArchive] if include_archived else [Booking]
+    
+    @staticmethod
+    def _page_history(queries, sort, cursor, limit, descending=True):
+        """Page {model: query} on (sort, id), merging hot and archive rows when both are given"""
+        if len(queries) == 1:
+            [(model, query)] = queries.items()
+            return keyset_page(query, getattr(model, sort), model.id, cursor=cursor, limit=limit, descending=descending)
         
-        return Booking.query.filter(
-            Booking.space_id == space_id,
-            Booking.status != 'cancelled',
-            Booking.start_at >= start_of_day,
-            Booking.start_at <= end_of_day
-        ).all()
+        return keyset_page_union(
+            [(query, getattr(model, sort), model.id) for model, query in queries.items()],
+            cursor=cursor,
+            limit=limit,
+            descending=descending
+        )
     
     @staticmethod
-    def check_blackout_date(target_date):
-        """Check if the date falls within a blackout period"""
-        target_datetime = datetime.combine(target_date, datetime.min.time())
+    def get_bookings_by_user_page(user_id, cursor=None, limit=DEFAULT_LIMIT, include_archived=False):
+        """
+        Get one page of a user's bookings, latest start first, returns (bookings, next_cursor)
         
-        return Blackout.query.filter(
-            Blackout.start_at <= target_datetime,
-            Blackout.end_at >= target_datetime
-        ).first()
+        With include_archived the archive table is paged alongside (rows are
+        BookingArchive instances there).
+        """
+        queries = {
+            model: model.query.options(joinedload(model.space)).filter(model.user_id == user_id)
+            for model in BookingRepository._history_models(include_archived)
+        }
+        return BookingRepository._page_history(queries, 'start_at', cursor, limit)
+    
+    @staticmethod
+    def get_upcoming_by_user(user_id, now, limit):
+        """
+        Get a user's next active/checkin bookings that have not ended, soonest first
+        
+        start_at is bounded to today so the (user_id, start_at) index skips past days.
+        """
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return Booking.query.options(joinedload(Booking.space)).filter(
+            Booking.user_id == user_id,
+            Booking.start_at >= today_start,
+            Booking.end_at > now,
+            Booking.status.in_(['active', 'checkin'])
+        ).order_by(Booking.start_at, Booking.id).limit(limit).all()
+    
+    @staticmethod
+    def get_department_bookings_page(department_id, range_start=None, range_end=None, statuses=None, cursor=None, limit=DEFAULT_LIMIT, include_archived=False):
+        """
+        Get bookings of all users in a department in one query, newest first
+        
+        Joins bookings to users on department_id; start_at range and status are
+        filtered in SQL. Returns (bookings, next_cursor) with user and space loaded.
+        """
+        queries = {}
+        for model in BookingRepository._history_models(include_archived):
+            query = model.query.join(model.user).options(
+                contains_eager(model.user),
+                joinedload(model.space)
+            ).filter(User.department_id == department_id)
+            
+            if range_start:
+                query = query.filter(model.start_at >= range_start)
+            if range_end:
+                query = query.filter(model.start_at < range_end)
+            if statuses:
+                query = query.filter(model.status.in_(statuses))
+            
+            queries[model] = query
+        
+        return BookingRepository._page_history(queries, 'created_at', cursor, limit)
+    
+    @staticmethod
+    def get_management_page(range_start=None, range_end=None, space_id=None, user_id=None, statuses=None, sort='start_at', descending=True, cursor=None, limit=DEFAULT_LIMIT, include_archived=False):
+        """
+        Get a page of bookings with user, space and floor in one joined query
+        
+        Filters run in SQL; the total is a separate COUNT over bookings only
+        (plus one over the archive with include_archived).
+        Returns (bookings, next_cursor, total).
+        """
+        total = 0
+        queries = {}
+        for model in BookingRepository._history_models(include_archived):
+            filters = []
+            if range_start:
+                filters.append(model.start_at >= range_start)
+            if range_end:
+                filters.append(model.start_at < range_end)
+            if space_id:
+                filters.append(model.space_id == space_id)
+            if user_id:
+                filters.append(model.user_id == user_id)
+            if statuses:
+                filters.append(model.status.in_(statuses))
+            
+            total += db.session.query(func.count(model.id)).filter(*filters).scalar()
+            
+            queries[model] = model.query.join(model.user).join(model.space).outerjoin(Space.floor).options(
+                contains_eager(model.user),
+                contains_eager(model.space).contains_eager(Space.floor)
+            ).filter(*filters)
+        
+        bookings, next_cursor = BookingRepository._page_history(
+            queries, sort, cursor, limit, descending=descending
+        )
+        return bookings, next_cursor, total
+    
+    @staticmethod
+    def get_active_bookings_between(range_start, range_end):
+        """Get active/checkin bookings of all spaces starting in [range_start, range_end) (with user loaded)"""
+        return Booking.query.options(joinedload(Booking.user)).filter(
+            Booking.status.in_(['active', 'checkin']),
+            Booking.start_at >= range_start,
+            Booking.start_at < range_end
+        ).order_by(Booking.space_id, Booking.start_at).all()
     
     @staticmethod
     def get_space_by_id(space_id):
@@ -77,6 +276,164 @@ class BookingRepository:
         """Get booking by checkin code"""
         return Booking.query.options(joinedload(Booking.space)).filter_by(checkin_code=checkin_code).first()
     
+    @staticmethod
+    def _conditional_update(query, values):
+        """Run an UPDATE over query's WHERE clause and commit, returns the number of rows changed"""
+        values[Booking.version] = Booking.version + 1
+        try:
+            updated = query.update(values, synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return updated
+    
+    @staticmethod
+    def transition_status(booking_id, from_statuses, to_status, now, timestamp_field=None):
+        """
+        Move a booking to to_status only if it is currently in from_statuses
+        
+        One conditional UPDATE ... WHERE id = ? AND status IN (...); returns the
+        number of rows changed (0 or 1). timestamp_field (e.g. checkout_at) is set to now.
+        """
+        values = {Booking.status: to_status, Booking.updated_at: now}
+        if timestamp_field:
+            values[getattr(Booking, timestamp_field)] = now
+        
+        query = Booking.query.filter(
+            Booking.id == booking_id,
+            Booking.status.in_(from_statuses)
+        )
+        return BookingRepository._conditional_update(query, values)
+    
+    @staticmethod
+    def checkin_by_code(checkin_code, now, booking_id=None, from_statuses=('active',)):
+        """
+        Check in with one conditional UPDATE, returns the number of rows changed (0 or 1)
+        
+        Status, code and time window are all checked in the WHERE clause, which
+        is resolved through the unique checkin_code index. Nothing is loaded.
+        """
+        query = Booking.query.filter(
+            Booking.checkin_code == checkin_code,
+            Booking.status.in_(from_statuses),
+            Booking.code_valid_from <= now,
+            Booking.code_valid_to >= now
+        )
+        if booking_id is not None:
+            query = query.filter(Booking.id == booking_id)
+        
+        return BookingRepository._conditional_update(query, {
+            Booking.status: 'checkin',
+            Booking.checkin_at: now,
+            Booking.updated_at: now
+        })
+    
+    @staticmethod
+    def lock_expired_batch(status, deadline_column, now, limit):
+        """
+        Lock up to limit bookings in status whose deadline_column is before now
+        
+        Returns narrow rows (id, user_id, space_id, start_at, end_at, checkin_at,
+        checkout_at), locked with SELECT ... FOR UPDATE until the caller's
+        transaction ends.
+        """
+        deadline = getattr(Booking, deadline_column)
+        return db.session.query(
+            Booking.id, Booking.user_id, Booking.space_id, Booking.start_at, Booking.end_at,
+            Booking.checkin_at, Booking.checkout_at
+        ).filter(
+            Booking.status == status,
+            deadline < now
+        ).order_by(Booking.id).limit(limit).with_for_update().all()
+    
+    @staticmethod
+    def set_status_batch(booking_ids, from_status, to_status, now, copy_columns=None):
+        """
+        Move many bookings from from_status to to_status with one UPDATE ... WHERE id IN (...)
+        
+        copy_columns maps target -> source column names copied within each row
+        (e.g. {'checkout_at': 'end_at'}). Returns the number of rows changed.
+        """
+        values = {Booking.status: to_status, Booking.updated_at: now}
+        for target, source in (copy_columns or {}).items():
+            values[getattr(Booking, target)] = getattr(Booking, source)
+        
+        query = Booking.query.filter(
+            Booking.id.in_(booking_ids),
+            Booking.status == from_status
+        )
+        return BookingRepository._conditional_update(query, values)
+    
+    @staticmethod
+    def archive_batch(statuses, cutoff, now, limit):
+        """
+        Move up to limit bookings in statuses that ended before cutoff into bookings_archive
+        
+        Locks the ids (SELECT ... FOR UPDATE on the (status, end_at) index), then
+        INSERT ... SELECT into the archive and DELETE from bookings in the same
+        transaction. Returns the number of rows moved.
+        """
+        try:
+            booking_ids = [
+                row.id for row in db.session.query(Booking.id).filter(
+                    Booking.status.in_(statuses),
+                    Booking.end_at < cutoff
+                ).order_by(Booking.id).limit(limit).with_for_update().all()
+            ]
+            if not booking_ids:
+                db.session.rollback()
+                return 0
+            
+            columns = [column.name for column in Booking.__table__.columns]
+            db.session.execute(
+                insert(BookingArchive).from_select(
+                    columns + ['archived_at'],
+                    select(*[Booking.__table__.c[name] for name in columns], literal(now))
+                    .where(Booking.id.in_(booking_ids))
+                )
+            )
+            moved = db.session.execute(
+                delete(Booking).where(Booking.id.in_(booking_ids))
+            ).rowcount
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return moved
+    
+    @staticmethod
+    def count_archivable(statuses, cutoff):
+        """Count bookings in statuses that ended before cutoff"""
+        return db.session.query(func.count(Booking.id)).filter(
+            Booking.status.in_(statuses),
+            Booking.end_at < cutoff
+        ).scalar()
+    
+    @staticmethod
+    def get_booking_summary(checkin_code=None, booking_id=None):
+        """
+        Narrow read of one booking by id or code: booking columns plus space name/type
+        
+        Used after a conditional update to build the response or the error reason
+        without loading the ORM object and its relationships.
+        """
+        query = db.session.query(
+            Booking.id, Booking.user_id, Booking.space_id, Booking.status,
+            Booking.start_at, Booking.end_at, Booking.checkin_code,
+            Booking.code_valid_from, Booking.code_valid_to,
+            Booking.checkin_at, Booking.checkout_at,
+            Booking.created_at, Booking.updated_at, Booking.version,
+            Space.name.label('space_name'), Space.type.label('space_type')
+        ).outerjoin(Space, Space.id == Booking.space_id)
+        
+        if booking_id is not None:
+            query = query.filter(Booking.id == booking_id)
+        else:
+            query = query.filter(Booking.checkin_code == checkin_code)
+        
+        return query.first()
+    
     @staticmethod
     def count_by_user_id(user_id):
         """Count total bookings for a specific user"""
@@ -88,31 +445,34 @@ class BookingRepository:
         return Booking.query.filter_by(space_id=space_id).all()
     
     @staticmethod
-    def update_booking_management(booking_id, user_id=None, space_id=None, start_at=None, end_at=None, status=None, code_valid_from=None, code_valid_to=None):
-        """Update booking (superadmin management)"""
-        booking = Booking.query.filter_by(id=booking_id).first()
+    def update_booking_management(booking_id, expected_version, user_id=None, space_id=None, start_at=None, end_at=None, status=None, code_valid_from=None, code_valid_to=None):
+        """
+        Update booking (superadmin management) only if it is still at expected_version
         
-        if not booking:
-            return None
+        One conditional UPDATE ... WHERE id = ? AND version = ?, bumping version.
+        Returns the updated booking, or None if the row changed (or is gone) since it was read.
+        """
+        values = {Booking.updated_at: datetime.utcnow()}
+        fields = {
+            Booking.user_id: user_id,
+            Booking.space_id: space_id,
+            Booking.start_at: start_at,
+            Booking.end_at: end_at,
+            Booking.status: status,
+            Booking.code_valid_from: code_valid_from,
+            Booking.code_valid_to: code_valid_to
+        }
+        values.update({column: value for column, value in fields.items() if value is not None})
         
-        if user_id is not None:
-            booking.user_id = user_id
-        if space_id is not None:
-            booking.space_id = space_id
-        if start_at is not None:
-            booking.start_at = start_at
-        if end_at is not None:
-            booking.end_at = end_at
-        if status is not None:
-            booking.status = status
-        if code_valid_from is not None:
-            booking.code_valid_from = code_valid_from
-        if code_valid_to is not None:
-            booking.code_valid_to = code_valid_to
+        query = Booking.query.filter(
+            Booking.id == booking_id,
+            Booking.version == expected_version
+        )
+        if not BookingRepository._conditional_update(query, values):
+            return None
         
-        db.session.commit()
-        db.session.refresh(booking)
-        return booking
+        # The commit expired any instance loaded before, so this reads the new row
+        return BookingRepository.find_by_id(booking_id)
     
     @staticmethod
     def delete_booking(booking_id):
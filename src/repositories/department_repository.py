@@ -1,4 +1,7 @@
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
 from src.models.department import Department
+from src.models.user import User
 from src.config.database import db
 
 class DepartmentRepository:
@@ -9,11 +12,42 @@ class DepartmentRepository:
         """Get all departments"""
         return Department.query.all()
     
+    @staticmethod
+    def get_all_with_stats():
+        """
+        Get all departments with user count and manager in one query
+        
+        Users are counted in a grouped subquery (users GROUP BY department_id)
+        that is LEFT JOINed to departments, and the manager user is LEFT JOINed.
+        Returns [(department, total_users, manager_name, manager_email), ...].
+        """
+        user_counts = db.session.query(
+            User.department_id.label('department_id'),
+            func.count(User.id).label('total_users')
+        ).group_by(User.department_id).subquery()
+        manager = aliased(User)
+        
+        return db.session.query(
+            Department,
+            func.coalesce(user_counts.c.total_users, 0).label('total_users'),
+            manager.username.label('manager_name'),
+            manager.email.label('manager_email')
+        ).outerjoin(
+            user_counts, user_counts.c.department_id == Department.id
+        ).outerjoin(
+            manager, manager.id == Department.manager_id
+        ).order_by(Department.id).all()
+    
     @staticmethod
     def get_by_id(department_id):
         """Get department by ID"""
         return Department.query.filter_by(id=department_id).first()
     
+    @staticmethod
+    def get_by_ids(department_ids):
+        """Get departments by a list of IDs (one IN query)"""
+        return Department.query.filter(Department.id.in_(department_ids)).all()
+    
     @staticmethod
     def get_by_name(name):
         """Get department by name"""
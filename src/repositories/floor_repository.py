@@ -1,4 +1,7 @@
+from sqlalchemy import func
+from sqlalchemy.orm import contains_eager
 from src.models.floor import Floor
+from src.models.space import Space
 from src.config.database import db
 
 class FloorRepository:
@@ -9,6 +12,28 @@ class FloorRepository:
         """Get all floors"""
         return Floor.query.all()
     
+    @staticmethod
+    def get_all_with_space_counts():
+        """Get all floors with space count from one grouped query, returns [(floor, total_spaces), ...]"""
+        space_counts = db.session.query(
+            Space.location.label('floor_id'),
+            func.count(Space.id).label('total_spaces')
+        ).group_by(Space.location).subquery()
+        
+        return db.session.query(
+            Floor,
+            func.coalesce(space_counts.c.total_spaces, 0).label('total_spaces')
+        ).outerjoin(
+            space_counts, space_counts.c.floor_id == Floor.id
+        ).order_by(Floor.id).all()
+    
+    @staticmethod
+    def get_all_with_spaces():
+        """Get all floors with their spaces loaded by one joined query"""
+        return Floor.query.outerjoin(Floor.spaces).options(
+            contains_eager(Floor.spaces)
+        ).order_by(Floor.id, Space.id).all()
+    
     @staticmethod
     def get_by_id(floor_id):
         """Get floor by ID"""
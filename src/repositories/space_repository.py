@@ -2,6 +2,7 @@ from src.models.space import Space
 from src.models.floor import Floor
 from src.models.amenity import Amenity
 from src.config.database import db
+from src.utils.opening_hours import opening_hours_cache
 
 class SpaceRepository:
     """Repository for Space operations"""
@@ -46,6 +47,7 @@ class SpaceRepository:
         db.session.add(space)
         db.session.commit()
         db.session.refresh(space)
+        opening_hours_cache.invalidate(space.id)
         return space
     
     @staticmethod
@@ -87,6 +89,7 @@ class SpaceRepository:
         
         db.session.commit()
         db.session.refresh(space)
+        opening_hours_cache.invalidate(space.id)
         return space
     
     @staticmethod
@@ -99,6 +102,7 @@ class SpaceRepository:
         
         db.session.delete(space)
         db.session.commit()
+        opening_hours_cache.invalidate(space_id)
         return True
     
     @staticmethod
@@ -1,7 +1,13 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy import case, func
 from src.models.task import Task
+from src.models.assignment import Assignment
+from src.models.user import User
 from src.config.database import db
 
+# high -> medium -> low, unknown priorities last
+PRIORITY_ORDER = case({'high': 1, 'medium': 2, 'low': 3}, value=Task.priority, else_=4)
+
 class TaskRepository:
     """Repository for Task operations"""
     
@@ -17,12 +23,68 @@ class TaskRepository:
         """Get all tasks for specific assignment"""
         return Task.query.filter_by(assignment_id=assignment_id).all()
     
+    def get_by_assignment_with_usernames(self, assignment_id: int) -> List[Tuple[Task, Optional[str]]]:
+        """Get tasks of an assignment with the assigned username, by priority then created_at (one query)"""
+        return db.session.query(Task, User.username).outerjoin(
+            User, User.id == Task.user_id
+        ).filter(
+            Task.assignment_id == assignment_id
+        ).order_by(PRIORITY_ORDER, Task.created_at, Task.id).all()
+    
     def get_by_user(self, user_id: int) -> List[Task]:
         """Get all tasks for specific user"""
         return Task.query.filter_by(user_id=user_id).all()
     
+    def get_todo_for_user(self, user_id: int, limit: int) -> list:
+        """
+        Get a user's todo page joined with the assignment title and due date
+        
+        Incomplete first, then by assignment due date and priority, limited in
+        SQL. Rows are (Task, assignment_title, assignment_due_date).
+        """
+        return db.session.query(
+            Task,
+            Assignment.title.label('assignment_title'),
+            Assignment.due_date.label('assignment_due_date')
+        ).join(
+            Assignment, Assignment.id == Task.assignment_id
+        ).filter(
+            Task.user_id == user_id
+        ).order_by(
+            Task.is_done, Assignment.due_date, PRIORITY_ORDER, Task.id
+        ).limit(limit).all()
+    
+    def count_todo_for_user(self, user_id: int) -> Tuple[int, int]:
+        """Count a user's tasks (with an assignment) as (total, completed) in one aggregate"""
+        total, completed = db.session.query(
+            func.count(Task.id),
+            func.sum(case((Task.is_done.is_(True), 1), else_=0))
+        ).join(
+            Assignment, Assignment.id == Task.assignment_id
+        ).filter(
+            Task.user_id == user_id
+        ).one()
+        return total, int(completed or 0)
+    
+    @staticmethod
+    def _adjust_progress(assignment_id: int, total_delta: int = 0, done_delta: int = 0) -> None:
+        """
+        Add deltas to the assignment's cached task counters in one UPDATE
+        
+        Does not commit, so the counters commit (or roll back) together with
+        the task change that caused them.
+        """
+        if not total_delta and not done_delta:
+            return
+        Assignment.query.filter(Assignment.id == assignment_id).update({
+            Assignment.total_tasks: Assignment.total_tasks + total_delta,
+            Assignment.done_tasks: Assignment.done_tasks + done_delta,
+            # Counter changes are not edits of the assignment itself
+            Assignment.updated_at: Assignment.updated_at
+        }, synchronize_session=False)
+    
     def create(self, task_data: dict) -> Task:
-        """Create new task"""
+        """Create new task (and count it on its assignment)"""
         task = Task(
             title=task_data.get('title'),
             priority=task_data.get('priority', 'medium'),
@@ -30,15 +92,22 @@ class TaskRepository:
             user_id=task_data.get('user_id'),
             is_done=task_data.get('is_done', False)
         )
-        db.session.add(task)
-        db.session.commit()
+        try:
+            db.session.add(task)
+            self._adjust_progress(task.assignment_id, 1, 1 if task.is_done else 0)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
         db.session.refresh(task)
         return task
     
     def update(self, task_id: int, update_data: dict) -> Optional[Task]:
-        """Update task"""
-        task = self.get_by_id(task_id)
+        """Update task (and the assignment's done counter when is_done changes)"""
+        # Row lock (re-read past the identity map) so concurrent toggles see each other's is_done
+        task = Task.query.filter(Task.id == task_id).with_for_update().populate_existing().first()
         if task:
+            was_done = bool(task.is_done)
             if 'title' in update_data:
                 task.title = update_data['title']
             if 'priority' in update_data:
@@ -47,15 +116,25 @@ class TaskRepository:
                 task.user_id = update_data['user_id']
             if 'is_done' in update_data:
                 task.is_done = update_data['is_done']
-            db.session.commit()
+            try:
+                self._adjust_progress(task.assignment_id, done_delta=int(bool(task.is_done)) - int(was_done))
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
             db.session.refresh(task)
         return task
     
     def delete(self, task_id: int) -> bool:
-        """Delete task"""
-        task = self.get_by_id(task_id)
+        """Delete task (and uncount it from its assignment)"""
+        task = Task.query.filter(Task.id == task_id).with_for_update().populate_existing().first()
         if task:
-            db.session.delete(task)
-            db.session.commit()
+            try:
+                self._adjust_progress(task.assignment_id, -1, -1 if task.is_done else 0)
+                db.session.delete(task)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
             return True
         return False
@@ -1,6 +1,10 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy import func
 from src.models.user import User
+from src.models.booking import Booking
+from src.models.department import Department
 from src.config.database import db
+from src.utils.pagination import keyset_page, DEFAULT_LIMIT
 
 class UserRepository:
     """Repository for User operations"""
@@ -9,10 +13,53 @@ class UserRepository:
         """Get all users from the database"""
         return User.query.all()
     
+    def get_page(self, cursor: str = None, limit: int = DEFAULT_LIMIT) -> Tuple[List[User], Optional[str]]:
+        """Get one page of users ordered by id, returns (users, next_cursor)"""
+        return keyset_page(User.query, User.id, User.id, cursor=cursor, limit=limit, descending=False)
+    
+    def _with_booking_counts(self):
+        """Query of (User, total_bookings, department_name) rows"""
+        booking_counts = db.session.query(
+            Booking.user_id.label('user_id'),
+            func.count(Booking.id).label('total_bookings')
+        ).group_by(Booking.user_id).subquery()
+        
+        return db.session.query(
+            User,
+            func.coalesce(booking_counts.c.total_bookings, 0).label('total_bookings'),
+            Department.name.label('department_name')
+        ).outerjoin(
+            booking_counts, booking_counts.c.user_id == User.id
+        ).outerjoin(
+            Department, Department.id == User.department_id
+        )
+    
+    def get_page_with_booking_counts(self, cursor: str = None, limit: int = DEFAULT_LIMIT) -> Tuple[List[Tuple[User, int, Optional[str]]], Optional[str]]:
+        """
+        Get one page of users ordered by id with booking count and department name
+        
+        One query: bookings are counted in a grouped subquery that is LEFT JOINed
+        to users, and departments are LEFT JOINed for the name.
+        Returns ([(user, total_bookings, department_name), ...], next_cursor).
+        """
+        return keyset_page(
+            self._with_booking_counts(), User.id, User.id, cursor=cursor, limit=limit, descending=False
+        )
+    
+    def get_by_department_with_booking_counts(self, department_id: int) -> List[Tuple[User, int, Optional[str]]]:
+        """Get all users of a department with booking count (one query), ordered by username"""
+        return self._with_booking_counts().filter(
+            User.department_id == department_id
+        ).order_by(User.username).all()
+    
     def get_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID"""
         return User.query.get(user_id)
     
+    def get_by_ids(self, user_ids: List[int]) -> List[User]:
+        """Get users by a list of IDs (one IN query)"""
+        return User.query.filter(User.id.in_(user_ids)).all()
+    
     def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
         return User.query.filter_by(email=email).first()
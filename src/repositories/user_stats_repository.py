@@ -0,0 +1,228 @@
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import select, delete, union_all, case, literal_column, true, func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from src.models.booking import Booking
+from src.models.booking_archive import BookingArchive
+from src.models.space import Space
+from src.models.user import User
+from src.models.user_stats import UserSpaceStats, UserDayStats, UserWeekStats
+from src.config.database import db
+
+# Bookings still holding their slot (counted in today's bookings)
+OPEN_STATUSES = ('active', 'checkin')
+
+def iso_week_key(value):
+    """ISO year and week of a datetime as YYYYWW (same as MariaDB YEARWEEK(value, 3))"""
+    year, week, _ = value.isocalendar()
+    return year * 100 + week
+
+class UserStatsRepository:
+    """Repository for the per-user dashboard summary tables"""
+    
+    @staticmethod
+    def _add(model, counter_columns, rows):
+        """Upsert rows adding their counter values to existing ones (INSERT ... ON DUPLICATE KEY UPDATE)"""
+        if not rows:
+            return
+        
+        statement = mysql_insert(model).values(rows)
+        statement = statement.on_duplicate_key_update({
+            name: getattr(model, name) + statement.inserted[name] for name in counter_columns
+        })
+        db.session.execute(statement)
+    
+    @staticmethod
+    def _collect(deltas, row, from_status, to_status):
+        """Add the stats change of one booking going from from_status (None = created) to to_status"""
+        if from_status is None:
+            deltas['spaces'][(row.user_id, row.space_id)] += 1
+        
+        open_delta = (to_status in OPEN_STATUSES) - (from_status in OPEN_STATUSES)
+        active_delta = (to_status == 'active') - (from_status == 'active')
+        if open_delta or active_delta:
+            day = deltas['days'].setdefault((row.user_id, row.start_at.date()), [0, 0])
+            day[0] += open_delta
+            day[1] += active_delta
+        
+        # Time between check-in and checkout; auto-finished bookings check out at end_at
+        if to_status == 'finished' and row.checkin_at:
+            checkout_at = row.checkout_at or row.end_at
+            seconds = int((checkout_at - row.checkin_at).total_seconds())
+            if seconds > 0:
+                deltas['weeks'][(row.user_id, iso_week_key(row.checkin_at))] += seconds
+    
+    @staticmethod
+    def _apply(deltas):
+        """Write collected deltas, one upsert per table, and commit"""
+        try:
+            UserStatsRepository._add(UserSpaceStats, ['booking_count'], [
+                {'user_id': user_id, 'space_id': space_id, 'booking_count': count}
+                for (user_id, space_id), count in deltas['spaces'].items()
+            ])
+            UserStatsRepository._add(UserDayStats, ['open_bookings', 'active_bookings'], [
+                {'user_id': user_id, 'day': day, 'open_bookings': open_count, 'active_bookings': active_count}
+                for (user_id, day), (open_count, active_count) in deltas['days'].items()
+            ])
+            UserStatsRepository._add(UserWeekStats, ['booked_seconds'], [
+                {'user_id': user_id, 'iso_week': iso_week, 'booked_seconds': seconds}
+                for (user_id, iso_week), seconds in deltas['weeks'].items()
+            ])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    
+    @staticmethod
+    def record_created(bookings):
+        """
+        Count newly created bookings (per space, and per day while active/checkin)
+        
+        Rows need user_id, space_id, start_at and status.
+        """
+        deltas = {'spaces': Counter(), 'days': {}, 'weeks': Counter()}
+        for booking in bookings:
+            UserStatsRepository._collect(deltas, booking, None, booking.status)
+        UserStatsRepository._apply(deltas)
+    
+    @staticmethod
+    def record_transition(bookings, from_status, to_status):
+        """
+        Apply the status change of bookings from from_status to to_status
+        
+        Rows need user_id, start_at, and checkin_at/checkout_at/end_at when
+        finishing (adds the checked-in time to the ISO week of checkin_at).
+        """
+        deltas = {'spaces': Counter(), 'days': {}, 'weeks': Counter()}
+        for booking in bookings:
+            UserStatsRepository._collect(deltas, booking, from_status, to_status)
+        UserStatsRepository._apply(deltas)
+    
+    @staticmethod
+    def get_summary(user_id, today, iso_week):
+        """
+        Read a user's dashboard numbers in one statement
+        
+        Returns a row with today_bookings, upcoming_bookings, booked_seconds and
+        the favorite space (space_id, booking_count, space_name, space_type;
+        None when the user has no bookings), or None if the user does not exist.
+        """
+        today_bookings = select(UserDayStats.open_bookings).where(
+            UserDayStats.user_id == user_id,
+            UserDayStats.day == today
+        ).scalar_subquery()
+        upcoming_bookings = select(func.sum(UserDayStats.active_bookings)).where(
+            UserDayStats.user_id == user_id,
+            UserDayStats.day > today
+        ).scalar_subquery()
+        booked_seconds = select(UserWeekStats.booked_seconds).where(
+            UserWeekStats.user_id == user_id,
+            UserWeekStats.iso_week == iso_week
+        ).scalar_subquery()
+        favorite = select(UserSpaceStats.space_id, UserSpaceStats.booking_count).where(
+            UserSpaceStats.user_id == user_id,
+            UserSpaceStats.booking_count > 0
+        ).order_by(UserSpaceStats.booking_count.desc(), UserSpaceStats.space_id).limit(1).subquery()
+        
+        return db.session.query(
+            today_bookings.label('today_bookings'),
+            upcoming_bookings.label('upcoming_bookings'),
+            booked_seconds.label('booked_seconds'),
+            favorite.c.space_id,
+            favorite.c.booking_count,
+            Space.name.label('space_name'),
+            Space.type.label('space_type')
+        ).select_from(User).outerjoin(
+            favorite, true()
+        ).outerjoin(
+            Space, Space.id == favorite.c.space_id
+        ).filter(User.id == user_id).first()
+    
+    @staticmethod
+    def _history(user_ids, *columns):
+        """UNION ALL of columns from bookings and bookings_archive for user_ids"""
+        return union_all(*[
+            select(*[getattr(model, name) for name in columns]).where(model.user_id.in_(user_ids))
+            for model in (Booking, BookingArchive)
+        ]).subquery()
+    
+    @staticmethod
+    def rebuild(user_ids):
+        """
+        Recompute the summary rows of user_ids from bookings (and the archive) in one transaction
+        
+        Space counts and weekly hours include archived bookings; day counts only
+        cover open bookings starting today or later.
+        """
+        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        
+        try:
+            for model in (UserSpaceStats, UserDayStats, UserWeekStats):
+                db.session.execute(delete(model).where(model.user_id.in_(user_ids)))
+            
+            history = UserStatsRepository._history(user_ids, 'user_id', 'space_id')
+            db.session.execute(
+                mysql_insert(UserSpaceStats).from_select(
+                    ['user_id', 'space_id', 'booking_count'],
+                    select(history.c.user_id, history.c.space_id, func.count())
+                    .group_by(history.c.user_id, history.c.space_id)
+                )
+            )
+            
+            day = func.date(Booking.start_at)
+            db.session.execute(
+                mysql_insert(UserDayStats).from_select(
+                    ['user_id', 'day', 'open_bookings', 'active_bookings'],
+                    select(
+                        Booking.user_id,
+                        day,
+                        func.count(),
+                        func.sum(case((Booking.status == 'active', 1), else_=0))
+                    ).where(
+                        Booking.user_id.in_(user_ids),
+                        Booking.status.in_(OPEN_STATUSES),
+                        Booking.start_at >= today_start
+                    ).group_by(Booking.user_id, day)
+                )
+            )
+            
+            history = UserStatsRepository._history(user_ids, 'user_id', 'checkin_at', 'checkout_at')
+            week = func.yearweek(history.c.checkin_at, 3)
+            db.session.execute(
+                mysql_insert(UserWeekStats).from_select(
+                    ['user_id', 'iso_week', 'booked_seconds'],
+                    select(
+                        history.c.user_id,
+                        week,
+                        func.sum(func.timestampdiff(
+                            literal_column('SECOND'), history.c.checkin_at, history.c.checkout_at
+                        ))
+                    ).where(
+                        history.c.checkin_at.isnot(None),
+                        history.c.checkout_at.isnot(None),
+                        # Late check-ins finished by the sweeper have checkout_at (= end_at)
+                        # before checkin_at; the incremental path skips them too
+                        history.c.checkout_at > history.c.checkin_at
+                    ).group_by(history.c.user_id, week)
+                )
+            )
+            
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    
+    @staticmethod
+    def get_user_id_chunks(chunk_size):
+        """Yield lists of up to chunk_size user ids, ascending (for rebuilding everyone)"""
+        last_id = 0
+        while True:
+            user_ids = [
+                row.id for row in db.session.query(User.id).filter(
+                    User.id > last_id
+                ).order_by(User.id).limit(chunk_size).all()
+            ]
+            if not user_ids:
+                return
+            yield user_ids
+            last_id = user_ids[-1]
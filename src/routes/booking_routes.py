@@ -24,6 +24,40 @@ def handle_bookings():
     else:  # POST
         return controller.create_booking()
 
+@booking_bp.route('/bulk', methods=['POST'])
+@token_required
+def create_bulk_bookings():
+    """
+    POST /api/bookings/bulk
+    Create recurring (rrule) or bulk (occurrences) bookings in one transaction
+    """
+    return controller.create_bulk_bookings()
+
+@booking_bp.route('/checkin', methods=['POST'])
+@token_required
+def checkin():
+    """
+    POST /api/bookings/checkin
+    Check in by code only (one conditional UPDATE)
+    """
+    return controller.checkin()
+
+@booking_bp.route('/department', methods=['GET'])
+@token_required
+@role_required(['manager', 'superadmin'])
+def get_department_bookings():
+    """
+    GET /api/bookings/department?from=&to=&status=&cursor=&limit=
+    Get bookings of the manager's department (superadmin: ?department_id=)
+    """
+    from flask import request
+    user = request.current_user
+    if user.get('role') == 'superadmin':
+        department_id = request.args.get('department_id', type=int)
+    else:
+        department_id = user.get('department_id')
+    return controller.get_department_bookings(department_id)
+
 @booking_bp.route('/user/<int:user_id>', methods=['GET'])
 @token_required
 def get_user_bookings(user_id):
@@ -56,7 +90,7 @@ def update_booking_status(booking_id):
 ###############################################################################
 
 
-# Management endpoints (superadmin only) - Read and Delete Only
+# Management endpoints (superadmin only)
 @booking_bp.route('/manage', methods=['GET'])
 @token_required
 @role_required(['superadmin'])
@@ -67,6 +101,16 @@ def get_bookings_for_management():
     """
     return controller.get_bookings_for_management()
 
+@booking_bp.route('/manage', methods=['POST'])
+@token_required
+@role_required(['superadmin'])
+def create_booking_management():
+    """
+    POST /api/bookings/manage
+    Create booking for any user (superadmin only)
+    """
+    return controller.create_booking_management()
+
 @booking_bp.route('/manage/<int:booking_id>', methods=['GET'])
 @token_required
 @role_required(['superadmin'])
@@ -77,6 +121,16 @@ def get_booking_for_management(booking_id):
     """
     return controller.get_booking_for_management(booking_id)
 
+@booking_bp.route('/manage/<int:booking_id>', methods=['PUT', 'PATCH'])
+@token_required
+@role_required(['superadmin'])
+def update_booking_management(booking_id):
+    """
+    PUT/PATCH /api/bookings/manage/:id
+    Update booking (superadmin only), 409 if it changed since 'version' was read
+    """
+    return controller.update_booking_management(booking_id)
+
 @booking_bp.route('/manage/<int:booking_id>', methods=['DELETE'])
 @token_required
 @role_required(['superadmin'])
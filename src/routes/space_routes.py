@@ -19,6 +19,21 @@ def get_all_spaces():
     
     return space_controller.get_all_spaces(date, start_time, end_time)
 
+@space_routes.route('/availability', methods=['GET'])
+@token_required
+def get_availability_range():
+    """Get free intervals per space per day (e.g. week view)"""
+    from_date = request.args.get('from')
+    to_date = request.args.get('to')
+    
+    return space_controller.get_availability_range(from_date, to_date)
+
+@space_routes.route('/search', methods=['GET'])
+@token_required
+def search_available_slots():
+    """Find the earliest free slots (duration, from, to, capacity, type, amenities, limit)"""
+    return space_controller.search_available_slots()
+
 @space_routes.route('/<int:space_id>', methods=['GET'])
 @token_required
 def get_space_by_id(space_id):
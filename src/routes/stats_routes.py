@@ -4,7 +4,7 @@ Mendefinisikan endpoint-endpoint statistics
 """
 from flask import Blueprint
 from src.controllers.stats_controller import StatsController
-from src.utils.jwt_helper import token_required
+from src.utils.jwt_helper import token_required, role_required
 
 # Create blueprint
 stats_bp = Blueprint('stats', __name__)
@@ -16,8 +16,28 @@ controller = StatsController()
 @token_required
 def get_user_stats():
     """
-    GET /api/stats_employee
+    GET /api/stats
     Get statistics for current user (all roles)
     Includes: announcements, weekly booking hours, favorite space, and todo list
     """
     return controller.get_user_stats()
+
+@stats_bp.route('/home', methods=['GET'])
+@token_required
+def get_home_screen():
+    """
+    GET /api/stats/home
+    Home screen of the current user: statistics plus upcoming bookings,
+    loaded concurrently (partial data with an errors map if a part fails)
+    """
+    return controller.get_home_screen()
+
+@stats_bp.route('/utilization', methods=['GET'])
+@token_required
+@role_required(['superadmin'])
+def get_utilization():
+    """
+    GET /api/stats/utilization?from=&to=&group_by=space|floor|type&include_archived=
+    Occupancy ratios (booked, checked in, no-show) by weekday x hour
+    """
+    return controller.get_utilization()
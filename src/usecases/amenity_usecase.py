@@ -1,7 +1,9 @@
-from typing import Dict
+from typing import Dict, Optional
 from src.repositories.amenity_repository import AmenityRepository
 from src.repositories.space_repository import SpaceRepository
 from src.config.database import db
+from src.utils.availability_cache import availability_cache
+from src.utils.pagination import normalize_limit
 
 class AmenityUseCase:
     """UseCase for business logic Amenity"""
@@ -10,26 +12,30 @@ class AmenityUseCase:
         self.amenity_repository = AmenityRepository()
         self.space_repository = SpaceRepository()
     
-    def get_all_amenities(self) -> Dict:
-        """Get all amenities with space name"""
+    def get_all_amenities(self, cursor: Optional[str] = None, limit=None) -> Dict:
+        """Get one page of amenities (by id) with space name"""
+        limit = normalize_limit(limit)
+        
         try:
-            amenities = self.amenity_repository.get_all()
+            amenities, next_cursor = self.amenity_repository.get_page(cursor=cursor, limit=limit)
             amenities_list = []
             
             for amenity in amenities:
                 amenity_data = amenity.to_dict()
                 
-                # Get space name
-                space = self.space_repository.get_space_by_id(amenity.space_id)
-                amenity_data['space_name'] = space.name if space else None
+                # Space is loaded by the page query
+                amenity_data['space_name'] = amenity.space.name if amenity.space else None
                 
                 amenities_list.append(amenity_data)
             
             return {
                 'success': True,
                 'data': amenities_list,
-                'count': len(amenities_list)
+                'count': len(amenities_list),
+                'next_cursor': next_cursor
             }
+        except ValueError:
+            raise
         except Exception as e:
             return {
                 'success': False,
@@ -85,6 +91,7 @@ class AmenityUseCase:
                 name=name,
                 icon=icon
             )
+            availability_cache.invalidate()
             amenity_data = new_amenity.to_dict()
             amenity_data['space_name'] = space.name
             
@@ -119,6 +126,7 @@ class AmenityUseCase:
             )
             
             if amenity:
+                availability_cache.invalidate()
                 amenity_data = amenity.to_dict()
                 
                 # Get space name
@@ -145,6 +153,7 @@ class AmenityUseCase:
         try:
             success = self.amenity_repository.delete(amenity_id)
             if success:
+                availability_cache.invalidate()
                 return {
                     'success': True,
                     'message': 'Amenity deleted successfully'
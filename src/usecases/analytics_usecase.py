@@ -0,0 +1,166 @@
+from typing import Dict, Optional
+from datetime import datetime, date, timedelta
+from src.repositories.analytics_repository import AnalyticsRepository
+from src.utils.opening_hours import opening_hours_cache
+
+class AnalyticsUseCase:
+    """UseCase for utilization analytics (superadmin)"""
+    
+    # Heatmaps can be rolled up per space, floor or space type
+    GROUP_BY_FIELDS = ['space', 'floor', 'type']
+    
+    METRICS = ['booked', 'checked_in', 'no_show']
+    
+    # Longest range of one request, and the default when none is given
+    MAX_RANGE_DAYS = 366
+    DEFAULT_RANGE_DAYS = 28
+    
+    WEEKDAY_NAMES = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+    
+    def __init__(self):
+        self.analytics_repository = AnalyticsRepository()
+    
+    def get_utilization(self, date_from: Optional[str] = None, date_to: Optional[str] = None, group_by: str = 'space', include_archived: bool = False) -> Dict:
+        """
+        Occupancy ratios by weekday x hour per space, floor or space type
+        
+        Each cell is used seconds / open seconds, where open seconds come from
+        the spaces' opening hours times the number of such weekdays in the
+        range. Used seconds are summed per hour in SQL (see AnalyticsRepository).
+        Raises ValueError for invalid parameters.
+        """
+        try:
+            range_end = datetime.strptime(date_to, '%Y-%m-%d').date() if date_to else date.today()
+            range_start = (
+                datetime.strptime(date_from, '%Y-%m-%d').date() if date_from
+                else range_end - timedelta(days=self.DEFAULT_RANGE_DAYS - 1)
+            )
+        except ValueError:
+            raise ValueError("Invalid date format. Use YYYY-MM-DD")
+        
+        if range_start > range_end:
+            raise ValueError("'from' must not be after 'to'")
+        
+        days = (range_end - range_start).days + 1
+        if days > self.MAX_RANGE_DAYS:
+            raise ValueError(f"Date range is too long, maximum is {self.MAX_RANGE_DAYS} days")
+        
+        if group_by not in self.GROUP_BY_FIELDS:
+            raise ValueError(f"Invalid group_by. Must be one of: {', '.join(self.GROUP_BY_FIELDS)}")
+        
+        try:
+            weekday_counts = self._weekday_counts(range_start, days)
+            groups = {}
+            group_of_space = {}
+            
+            for space, floor_name in self.analytics_repository.get_spaces_with_floors():
+                key, label = self._group_key(space, floor_name, group_by)
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = {
+                        'label': label,
+                        'spaces': 0,
+                        'open': self._empty_grid(),
+                        **{metric: self._empty_grid() for metric in self.METRICS}
+                    }
+                group['spaces'] += 1
+                group_of_space[space.id] = group
+                self._add_open_seconds(group['open'], opening_hours_cache.get(space), weekday_counts)
+            
+            usage = self.analytics_repository.get_hourly_usage(
+                datetime.combine(range_start, datetime.min.time()),
+                datetime.combine(range_end + timedelta(days=1), datetime.min.time()),
+                datetime.now(),
+                include_archived=include_archived
+            )
+            for metric, space_id, weekday, hour, seconds in usage:
+                group = group_of_space.get(space_id)
+                if group is not None:
+                    group[metric][weekday][hour] += int(seconds or 0)
+            
+            return {
+                'success': True,
+                'data': {
+                    'from': range_start.isoformat(),
+                    'to': range_end.isoformat(),
+                    'group_by': group_by,
+                    'weekdays': self.WEEKDAY_NAMES,
+                    'hours': list(range(24)),
+                    'groups': [self._group_to_dict(group) for group in groups.values()]
+                }
+            }
+        except ValueError:
+            raise
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    @staticmethod
+    def _weekday_counts(range_start, days):
+        """Number of Mondays, Tuesdays, ... in days consecutive days from range_start"""
+        counts = [days // 7] * 7
+        for offset in range(days % 7):
+            counts[(range_start.weekday() + offset) % 7] += 1
+        return counts
+    
+    @staticmethod
+    def _group_key(space, floor_name, group_by):
+        """(key, label) of the group a space belongs to"""
+        if group_by == 'floor':
+            return space.location, {'floor_id': space.location, 'floor_name': floor_name}
+        if group_by == 'type':
+            return space.type, {'space_type': space.type}
+        return space.id, {
+            'space_id': space.id,
+            'space_name': space.name,
+            'space_type': space.type,
+            'floor_id': space.location,
+            'floor_name': floor_name
+        }
+    
+    @staticmethod
+    def _empty_grid():
+        """7 x 24 seconds grid (weekday x hour)"""
+        return [[0] * 24 for _ in range(7)]
+    
+    @staticmethod
+    def _add_open_seconds(grid, schedule, weekday_counts):
+        """Add a space's open seconds per weekday and hour over the range to grid"""
+        for weekday, hours in enumerate(schedule.days):
+            if hours is None or not weekday_counts[weekday]:
+                continue
+            open_minute, close_minute = hours
+            for hour in range(open_minute // 60, (close_minute + 59) // 60):
+                minutes = min(close_minute, (hour + 1) * 60) - max(open_minute, hour * 60)
+                if minutes > 0:
+                    grid[weekday][hour] += minutes * 60 * weekday_counts[weekday]
+    
+    def _group_to_dict(self, group):
+        """Ratios per cell, per weekday and overall for one group"""
+        open_grid = group['open']
+        total_open = sum(map(sum, open_grid))
+        
+        result = dict(group['label'])
+        result['spaces'] = group['spaces']
+        result['open_hours'] = round(total_open / 3600, 2)
+        
+        for metric in self.METRICS:
+            grid = group[metric]
+            result[metric] = {
+                'hours': round(sum(map(sum, grid)) / 3600, 2),
+                'ratio': self._ratio(sum(map(sum, grid)), total_open),
+                'by_weekday': [self._ratio(sum(grid[day]), sum(open_grid[day])) for day in range(7)],
+                'heatmap': [
+                    [self._ratio(grid[day][hour], open_grid[day][hour]) for hour in range(24)]
+                    for day in range(7)
+                ]
+            }
+        
+        return result
+    
+    @staticmethod
+    def _ratio(used, available):
+        """used / available rounded, None when the space is closed then"""
+        return round(used / available, 4) if available else None
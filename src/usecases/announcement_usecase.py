@@ -1,7 +1,8 @@
-from typing import Dict
+from typing import Dict, Optional
 from src.repositories.announcement_repository import AnnouncementRepository
 from src.repositories.user_repository import UserRepository
 from src.repositories.department_repository import DepartmentRepository
+from src.utils.pagination import normalize_limit
 
 class AnnouncementUseCase:
     """UseCase for Announcement business logic"""
@@ -29,8 +30,10 @@ class AnnouncementUseCase:
         except Exception:
             return None
     
-    def get_announcements_for_manager(self, manager_department_id: int) -> Dict:
-        """Get announcements for manager (company-wide + department-specific)"""
+    def get_announcements_for_manager(self, manager_department_id: int, cursor: Optional[str] = None, limit=None) -> Dict:
+        """Get one page of announcements for manager (company-wide + department-specific), newest first"""
+        limit = normalize_limit(limit)
+        
         try:
             if not manager_department_id:
                 return {
@@ -38,30 +41,17 @@ class AnnouncementUseCase:
                     'error': 'Manager tidak memiliki department'
                 }
             
-            # Get company-wide announcements (department_id is NULL)
-            company_wide = self.announcement_repository.get_company_wide()
-            
-            # Get department-specific announcements
-            department_specific = self.announcement_repository.get_by_department(manager_department_id)
-            
-            # Combine both lists
-            all_announcements = company_wide + department_specific
-            
-            # Sort by created_at descending (newest first)
-            all_announcements.sort(key=lambda x: x.created_at, reverse=True)
+            # Company-wide (department_id is NULL) + department-specific in one query,
+            # with creator and department loaded by the same query
+            announcements, next_cursor = self.announcement_repository.get_for_department_page(
+                manager_department_id, cursor=cursor, limit=limit
+            )
             
             # Build response with creator and department info
             announcements_list = []
-            for announcement in all_announcements:
-                # Get creator info
-                creator = self.user_repository.get_by_id(announcement.created_by)
-                creator_name = creator.username if creator else "Unknown"
-                
-                # Get department info
-                department_name = None
-                if announcement.department_id:
-                    department = self.department_repository.get_by_id(announcement.department_id)
-                    department_name = department.name if department else None
+            for announcement in announcements:
+                creator_name = announcement.creator.username if announcement.creator else "Unknown"
+                department_name = announcement.department.name if announcement.department else None
                 
                 announcement_data = {
                     'id': announcement.id,
@@ -78,8 +68,11 @@ class AnnouncementUseCase:
             
             return {
                 'success': True,
-                'data': announcements_list
+                'data': announcements_list,
+                'next_cursor': next_cursor
             }
+        except ValueError:
+            raise
         except Exception as e:
             return {
                 'success': False,
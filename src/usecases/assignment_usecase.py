@@ -1,8 +1,9 @@
-from typing import Dict
+from typing import Dict, Optional
 from datetime import datetime
 from src.repositories.assignment_repository import AssignmentRepository
 from src.repositories.user_repository import UserRepository
 from src.repositories.department_repository import DepartmentRepository
+from src.utils.pagination import normalize_limit
 
 class AssignmentUseCase:
     """UseCase for Assignment business logic"""
@@ -12,8 +13,10 @@ class AssignmentUseCase:
         self.user_repository = UserRepository()
         self.department_repository = DepartmentRepository()
     
-    def get_assignments_for_department(self, department_id: int) -> Dict:
-        """Get all assignments for specific department"""
+    def get_assignments_for_department(self, department_id: int, cursor: Optional[str] = None, limit=None) -> Dict:
+        """Get one page of assignments for specific department, earliest due date first"""
+        limit = normalize_limit(limit)
+        
         try:
             if not department_id:
                 return {
@@ -21,26 +24,20 @@ class AssignmentUseCase:
                     'error': 'Manager does not have a department'
                 }
             
-            # Get all assignments for the department
-            assignments = self.assignment_repository.get_by_department(department_id)
-            
-            # Sort by due_date ascending (earliest first)
-            assignments.sort(key=lambda x: x.due_date if x.due_date else datetime.max)
+            # Ordered by due_date in SQL; task counts come from a grouped subquery in the same query
+            rows, next_cursor = self.assignment_repository.get_by_department_page_with_progress(
+                department_id, cursor=cursor, limit=limit
+            )
             
             # Build response with creator and department info
             assignments_list = []
-            for assignment in assignments:
-                # Get creator info
-                creator = self.user_repository.get_by_id(assignment.created_by)
-                creator_name = creator.username if creator else "Unknown"
-                
-                # Get department info
-                department = self.department_repository.get_by_id(assignment.department_id)
-                department_name = department.name if department else "Unknown"
+            for assignment, total_tasks, done_tasks in rows:
+                creator_name = assignment.creator.username if assignment.creator else "Unknown"
+                department_name = assignment.department.name if assignment.department else "Unknown"
                 
                 # Get task count
-                task_count = len(assignment.tasks) if assignment.tasks else 0
-                task_done = len([task for task in assignment.tasks if task.is_done]) if assignment.tasks else 0
+                task_count = int(total_tasks or 0)
+                task_done = int(done_tasks or 0)
                 
                 assignment_data = {
                     'id': assignment.id,
@@ -60,8 +57,11 @@ class AssignmentUseCase:
             
             return {
                 'success': True,
-                'data': assignments_list
+                'data': assignments_list,
+                'next_cursor': next_cursor
             }
+        except ValueError:
+            raise
         except Exception as e:
             return {
                 'success': False,
@@ -179,8 +179,9 @@ class AssignmentUseCase:
             department = self.department_repository.get_by_id(updated_assignment.department_id)
             department_name = department.name if department else 'Unknown'
             
-            task_count = len(updated_assignment.tasks) if updated_assignment.tasks else 0
-            task_done = len([task for task in updated_assignment.tasks if task.is_done]) if updated_assignment.tasks else 0
+            # Cached counters, kept in sync by task create/update/delete
+            task_count = updated_assignment.total_tasks
+            task_done = updated_assignment.done_tasks
             
             return {
                 'success': True,
@@ -216,14 +217,12 @@ class AssignmentUseCase:
                 return {'success': False, 'error': 'You can only delete assignments from your department'}
             
             # Check if all tasks are completed
-            if assignment.tasks:
-                incomplete_tasks = [task for task in assignment.tasks if not task.is_done]
-                if incomplete_tasks:
-                    incomplete_count = len(incomplete_tasks)
-                    return {
-                        'success': False, 
-                        'error': f'Cannot delete assignment with {incomplete_count} incomplete task(s). All tasks must be completed first.'
-                    }
+            incomplete_count = assignment.total_tasks - assignment.done_tasks
+            if incomplete_count > 0:
+                return {
+                    'success': False, 
+                    'error': f'Cannot delete assignment with {incomplete_count} incomplete task(s). All tasks must be completed first.'
+                }
             
             # Delete assignment (tasks will be cascade deleted)
             deleted = self.assignment_repository.delete(assignment_id)
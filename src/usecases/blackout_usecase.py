@@ -1,8 +1,11 @@
-from typing import Dict
+from typing import Dict, Optional
 from datetime import datetime
 from src.repositories.blackout_repository import BlackoutRepository
 from src.repositories.user_repository import UserRepository
 from src.config.database import db
+from src.utils.blackout_calendar import blackout_calendar
+from src.utils.availability_cache import availability_cache
+from src.utils.pagination import normalize_limit
 
 class BlackoutUseCase:
     """UseCase for business logic Blackout"""
@@ -11,17 +14,19 @@ class BlackoutUseCase:
         self.blackout_repository = BlackoutRepository()
         self.user_repository = UserRepository()
     
-    def get_all_blackouts(self) -> Dict:
-        """Get all blackouts with creator info"""
+    def get_all_blackouts(self, cursor: Optional[str] = None, limit=None) -> Dict:
+        """Get one page of blackouts (latest start first) with creator info"""
+        limit = normalize_limit(limit)
+        
         try:
-            blackouts = self.blackout_repository.get_all()
+            blackouts, next_cursor = self.blackout_repository.get_page(cursor=cursor, limit=limit)
             blackouts_list = []
             
             for blackout in blackouts:
                 blackout_data = blackout.to_dict()
                 
-                # Get creator info
-                creator = self.user_repository.get_by_id(blackout.created_by)
+                # Creator is loaded by the page query
+                creator = blackout.creator
                 if creator:
                     blackout_data['created_by_name'] = creator.username
                     blackout_data['created_by_email'] = creator.email
@@ -34,8 +39,11 @@ class BlackoutUseCase:
             return {
                 'success': True,
                 'data': blackouts_list,
-                'count': len(blackouts_list)
+                'count': len(blackouts_list),
+                'next_cursor': next_cursor
             }
+        except ValueError:
+            raise
         except Exception as e:
             return {
                 'success': False,
@@ -115,6 +123,8 @@ class BlackoutUseCase:
                 end_at=end_datetime,
                 created_by=created_by
             )
+            blackout_calendar.invalidate()
+            availability_cache.invalidate_range(start_datetime.date(), end_datetime.date())
             blackout_data = new_blackout.to_dict()
             blackout_data['created_by_name'] = creator.username
             blackout_data['created_by_email'] = creator.email
@@ -162,6 +172,10 @@ class BlackoutUseCase:
                     'error': 'End time must be after start time'
                 }
             
+            # Remember the old range, dates it no longer covers must be invalidated too
+            previous = self.blackout_repository.get_by_id(blackout_id)
+            previous_range = (previous.start_at.date(), previous.end_at.date()) if previous else None
+            
             blackout = self.blackout_repository.update(
                 blackout_id,
                 title=title,
@@ -171,6 +185,10 @@ class BlackoutUseCase:
             )
             
             if blackout:
+                blackout_calendar.invalidate()
+                availability_cache.invalidate_range(blackout.start_at.date(), blackout.end_at.date())
+                if previous_range:
+                    availability_cache.invalidate_range(*previous_range)
                 blackout_data = blackout.to_dict()
                 
                 # Get creator info
@@ -200,8 +218,15 @@ class BlackoutUseCase:
     def delete_blackout(self, blackout_id: int) -> Dict:
         """Delete blackout"""
         try:
+            # Capture the range before the row is deleted
+            blackout = self.blackout_repository.get_by_id(blackout_id)
+            blackout_range = (blackout.start_at.date(), blackout.end_at.date()) if blackout else None
+            
             success = self.blackout_repository.delete(blackout_id)
             if success:
+                blackout_calendar.invalidate()
+                if blackout_range:
+                    availability_cache.invalidate_range(*blackout_range)
                 return {
                     'success': True,
                     'message': 'Blackout deleted successfully'
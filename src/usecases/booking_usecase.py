@@ -1,17 +1,92 @@
 from datetime import datetime, timedelta
+import logging
 import secrets
 import string
 from src.repositories.booking_repository import BookingRepository
 from src.repositories.space_repository import SpaceRepository
 from src.repositories.user_repository import UserRepository
+from src.repositories.user_stats_repository import UserStatsRepository
+from src.utils.occupancy_index import occupancy_index
+from src.utils.availability_cache import availability_cache
+from src.utils.blackout_calendar import blackout_calendar
+from src.utils.opening_hours import opening_hours_cache, format_minute
+from src.utils.recurrence import expand_rrule
+from src.utils.pagination import normalize_limit
+
+logger = logging.getLogger(__name__)
 
 class BookingUseCase:
     """UseCase for business logic Booking"""
     
+    # Maximum number of occurrences for one bulk/recurring request
+    MAX_BULK_OCCURRENCES = 100
+    
+    # Sortable columns for the management listing
+    MANAGEMENT_SORT_FIELDS = ['start_at', 'created_at']
+    
+    # Expiry sweeper rules: (from status, deadline column, to status, columns copied on update)
+    # Active bookings nobody checked in to become no_show once the code expires;
+    # checked-in bookings nobody checked out of finish at their end time
+    EXPIRY_RULES = [
+        ('active', 'code_valid_to', 'no_show', None),
+        ('checkin', 'end_at', 'finished', {'checkout_at': 'end_at'})
+    ]
+    
+    # Terminal statuses moved to bookings_archive once they are older than the horizon
+    ARCHIVE_STATUSES = ['finished', 'cancelled', 'no_show']
+    
+    # Status transitions of update_booking_status: allowed from-states, target
+    # state, timestamp column to set, and the error for each disallowed state
+    STATUS_TRANSITIONS = {
+        'checkin': {
+            'from': ['active'],
+            'to': 'checkin',
+            'timestamp': 'checkin_at',
+            'errors': {
+                'cancelled': "Booking has been cancelled, cannot check in",
+                'checkin': "Already checked in",
+                'finished': "Booking has finished, cannot check in"
+            }
+        },
+        'checkout': {
+            'from': ['checkin'],
+            'to': 'finished',
+            'timestamp': 'checkout_at',
+            'errors': {
+                'cancelled': "Booking has been cancelled, cannot checkout",
+                'finished': "Booking has finished, cannot checkout",
+                'active': "Must check in before checking out"
+            }
+        },
+        'cancel': {
+            'from': ['active'],
+            'to': 'cancelled',
+            'timestamp': None,
+            'errors': {
+                'cancelled': "Booking has been cancelled, cannot cancel again",
+                'checkin': "Cannot cancel a booking that has already checked in",
+                'finished': "Cannot cancel a booking that has finished"
+            }
+        }
+    }
+    
     def __init__(self):
         self.repository = BookingRepository()
         self.space_repository = SpaceRepository()
         self.user_repository = UserRepository()
+        self.user_stats_repository = UserStatsRepository()
+    
+    def _record_stats(self, record, *args):
+        """
+        Update the dashboard summary after a booking change has been committed
+        
+        A failure is only logged: the booking change stands and the summary can
+        be repaired with `python rebuild_stats.py`.
+        """
+        try:
+            record(*args)
+        except Exception as e:
+            logger.error(f"User stats update failed: {str(e)}")
     
     def create_booking(self, user_id, space_id, start_at_str, end_at_str):
         """Create new booking with complete validation"""
@@ -26,9 +101,6 @@ class BookingUseCase:
         if start_at >= end_at:
             raise ValueError("Start time must be earlier than end time")
         
-        if start_at < datetime.now():
-            raise ValueError("Cannot book for a time that has already passed")
-
         # Get space
         space = self.repository.get_space_by_id(space_id)
         if not space:
@@ -38,46 +110,11 @@ class BookingUseCase:
         if space.status != 'available':
             raise ValueError(f"Space is currently {space.status}, cannot be booked")
 
-        # Check blackout date
-        target_date = start_at.date()
-        blackout = self.repository.check_blackout_date(target_date)
-        if blackout:
-            raise ValueError(f"Date {target_date} is a holiday: {blackout.title}")
-
-        # Check opening hours
-        day_name = start_at.strftime('%a').lower()  # mon, tue, wed, ...
-        opening_hours = space.opening_hours
-        
-        if not opening_hours or day_name not in opening_hours:
-            raise ValueError(f"Space does not have operating hours for today")
-        
-        day_hours = opening_hours[day_name]
-        if day_hours is None:
-            raise ValueError(f"Space is closed today")
-
-        # Parse opening hours
-        open_time = datetime.strptime(day_hours['start'], '%H:%M').time()
-        close_time = datetime.strptime(day_hours['end'], '%H:%M').time()
-
-        # Validate booking time within operating hours
-        if start_at.time() < open_time or end_at.time() > close_time:
-            raise ValueError(f"Booking must be within operating hours {day_hours['start']} - {day_hours['end']}")
-        
-        # Check maximum duration
-        duration_minutes = (end_at - start_at).total_seconds() / 60
-        if space.max_duration and duration_minutes > space.max_duration:
-            raise ValueError(f"Booking duration ({duration_minutes} minutes) exceeds maximum ({space.max_duration} minutes)")
+        self._validate_slot(space, start_at, end_at)
         
-        # Check availability (conflict with other bookings)
-        existing_bookings = self.repository.get_bookings_by_space_and_date(space_id, target_date)
-        
-        for booking in existing_bookings:
-            # Cek overlap
-            if self._is_overlapping(start_at, end_at, booking.start_at, booking.end_at):
-                raise ValueError(
-                    f"Booking time conflicts with another booking. "
-                    f"Space is already booked from {booking.start_at.strftime('%H:%M')} - {booking.end_at.strftime('%H:%M')}"
-                )
+        # No pre-check against the occupancy index: it is per process and may
+        # lag behind other workers, so it could reject a slot freed elsewhere.
+        # The locked insert below is the only conflict check.
         
         # Generate checkin code
         checkin_code = self._generate_checkin_code()
@@ -99,8 +136,17 @@ class BookingUseCase:
             'code_valid_to': code_valid_to
         }
         
-        # Create booking
-        booking = self.repository.create_booking(booking_data)
+        # Create booking (space row locked, overlap re-checked in SQL)
+        booking, conflict = self.repository.create_booking_if_free(booking_data)
+        if conflict:
+            # The slot is taken; our index may not know yet (e.g. booked on another worker)
+            occupancy_index.invalidate(start_at.date())
+            availability_cache.invalidate_date(start_at.date())
+            raise ValueError(self._conflict_message(conflict))
+        
+        occupancy_index.add_booking(booking, username=booking.user.username if booking.user else None)
+        availability_cache.invalidate_date(booking.start_at.date())
+        self._record_stats(self.user_stats_repository.record_created, [booking])
         
         # Return dengan space info
         result = booking.to_dict()
@@ -109,6 +155,127 @@ class BookingUseCase:
         
         return result
     
+    def create_bulk_bookings(self, user_id, space_id, occurrences=None, rrule=None, start_date=None, start_time=None, end_time=None, all_or_nothing=False):
+        """
+        Create many bookings of one space in one transaction
+        
+        Occurrences come either from an explicit list of {start_at, end_at} or
+        from an RRULE expanded from start_date with start_time/end_time.
+        Every occurrence is validated like a single booking; existing bookings
+        are checked with one range query and free ones inserted in one batch.
+        """
+        # Expand occurrences
+        if rrule:
+            slots = expand_rrule(rrule, start_date, start_time, end_time, self.MAX_BULK_OCCURRENCES)
+        elif occurrences:
+            if len(occurrences) > self.MAX_BULK_OCCURRENCES:
+                raise ValueError(f"Maximum {self.MAX_BULK_OCCURRENCES} occurrences per request")
+            try:
+                slots = [
+                    (self._parse_datetime(item['start_at']), self._parse_datetime(item['end_at']))
+                    for item in occurrences
+                ]
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Every occurrence needs start_at and end_at in a valid datetime format: {str(e)}")
+        else:
+            raise ValueError("Either 'rrule' (with start_date, start_time, end_time) or 'occurrences' is required")
+        
+        if not slots:
+            raise ValueError("Recurrence does not produce any occurrence")
+        
+        # Validate user and space once
+        user = self.user_repository.get_by_id(user_id)
+        if not user:
+            raise ValueError(f"User with ID {user_id} not found")
+        
+        space = self.repository.get_space_by_id(space_id)
+        if not space:
+            raise ValueError(f"Space with ID {space_id} not found")
+        
+        if space.status != 'available':
+            raise ValueError(f"Space is currently {space.status}, cannot be booked")
+        
+        # Validate every occurrence in memory (blackouts and opening hours are cached)
+        results = []
+        candidates = []  # (result, booking_data)
+        accepted = []  # (start_at, end_at) of valid occurrences, to catch overlaps within the request
+        for index, (start_at, end_at) in enumerate(slots):
+            result = {
+                'index': index,
+                'date': start_at.strftime('%Y-%m-%d'),
+                'start_time': start_at.strftime('%H:%M'),
+                'end_time': end_at.strftime('%H:%M'),
+                'status': 'created',
+                'error': None,
+                'booking': None
+            }
+            results.append(result)
+            
+            try:
+                if start_at >= end_at or start_at.date() != end_at.date():
+                    raise ValueError("Start time must be earlier than end time on the same day")
+                self._validate_slot(space, start_at, end_at)
+            except ValueError as e:
+                result['status'] = 'invalid'
+                result['error'] = str(e)
+                continue
+            
+            if any(start_at < other_end and end_at > other_start for other_start, other_end in accepted):
+                result['status'] = 'conflict'
+                result['error'] = "Overlaps another occurrence in this request"
+                continue
+            
+            accepted.append((start_at, end_at))
+            candidates.append((result, {
+                'user_id': user_id,
+                'space_id': space_id,
+                'status': 'active',
+                'start_at': start_at,
+                'end_at': end_at,
+                'max_duration_snapshot': space.max_duration,
+                'checkin_code': self._generate_checkin_code(),
+                'code_valid_from': start_at.replace(hour=0, minute=0, second=0, microsecond=0),
+                'code_valid_to': end_at.replace(hour=23, minute=59, second=59, microsecond=0)
+            }))
+        
+        if all_or_nothing and len(candidates) < len(results):
+            for result, _ in candidates:
+                result['status'] = 'skipped'
+            candidates = []
+        
+        # Lock the space, check existing bookings with one range query, insert in one batch
+        created, conflicts = self.repository.create_bookings_if_free(
+            space_id, [data for _, data in candidates], all_or_nothing=all_or_nothing
+        )
+        
+        for index, conflict in conflicts.items():
+            result = candidates[index][0]
+            result['status'] = 'conflict'
+            result['error'] = self._conflict_message(conflict)
+        
+        created_by_code = {booking.checkin_code: booking for booking in created}
+        for result, data in candidates:
+            booking = created_by_code.get(data['checkin_code'])
+            if booking:
+                result['booking'] = booking.to_dict()
+                occupancy_index.add_booking(booking, username=user.username)
+            elif result['status'] == 'created':
+                result['status'] = 'skipped'  # Batch aborted by all_or_nothing
+        
+        for target_date in {booking.start_at.date() for booking in created}:
+            availability_cache.invalidate_date(target_date)
+        if created:
+            self._record_stats(self.user_stats_repository.record_created, created)
+        
+        return {
+            'space_id': space.id,
+            'space_name': space.name,
+            'requested': len(results),
+            'created': len(created),
+            'failed': len(results) - len(created),
+            'occurrences': results
+        }
+    
     def _parse_datetime(self, dt_str):
         """
         Parse datetime string with various formats
@@ -128,11 +295,44 @@ class BookingUseCase:
         
         raise ValueError(f"Format not recognized: {dt_str}")
     
-    def _is_overlapping(self, start1, end1, start2, end2):
-        """
-        Check if two time intervals overlap
-        """
-        return start1 < end2 and end1 > start2
+    def _validate_slot(self, space, start_at, end_at):
+        """Validate a time slot against blackouts, opening hours and max duration (raises ValueError)"""
+        if start_at < datetime.now():
+            raise ValueError("Cannot book for a time that has already passed")
+
+        # Check blackout date
+        target_date = start_at.date()
+        blackout = blackout_calendar.first_active_at(datetime.combine(target_date, datetime.min.time()))
+        if blackout:
+            raise ValueError(f"Date {target_date} is a holiday: {blackout.title}")
+
+        # Check opening hours (compiled per space)
+        schedule = opening_hours_cache.get(space)
+        if not schedule.has_hours:
+            raise ValueError(f"Space does not have operating hours for today")
+        
+        day_hours = schedule.for_date(target_date)
+        if day_hours is None:
+            raise ValueError(f"Space is closed today")
+
+        # Validate booking time within operating hours
+        if not schedule.contains(start_at, end_at):
+            raise ValueError(
+                f"Booking must be within operating hours "
+                f"{format_minute(day_hours[0])} - {format_minute(day_hours[1])}"
+            )
+        
+        # Check maximum duration
+        duration_minutes = (end_at - start_at).total_seconds() / 60
+        if space.max_duration and duration_minutes > space.max_duration:
+            raise ValueError(f"Booking duration ({duration_minutes} minutes) exceeds maximum ({space.max_duration} minutes)")
+    
+    def _conflict_message(self, conflict):
+        """Build the error message for a conflicting booking"""
+        return (
+            f"Booking time conflicts with another booking. "
+            f"Space is already booked from {conflict.start_at.strftime('%H:%M')} - {conflict.end_at.strftime('%H:%M')}"
+        )
     
     def _generate_checkin_code(self):
         """
@@ -160,144 +360,317 @@ class BookingUseCase:
         bookings = self.repository.get_all_bookings()
         return [booking.to_dict() for booking in bookings]
     
-    def get_user_bookings(self, user_id):
+    def get_user_bookings(self, user_id, cursor=None, limit=None, include_archived=False):
         """
-        Get all bookings by user
+        Get bookings by user, latest start first (paged)
+        
+        include_archived also pages through bookings_archive.
+        Returns {'bookings': [...], 'next_cursor': ...}.
         """
-        bookings = self.repository.get_bookings_by_user(user_id)
-        return [booking.to_dict() for booking in bookings]
+        bookings, next_cursor = self.repository.get_bookings_by_user_page(
+            user_id,
+            cursor=cursor,
+            limit=normalize_limit(limit),
+            include_archived=include_archived
+        )
+        return {
+            'bookings': [booking.to_dict() for booking in bookings],
+            'next_cursor': next_cursor
+        }
     
-    def get_department_bookings(self, department_id):
+    def get_department_bookings(self, department_id, date_from=None, date_to=None, status=None, cursor=None, limit=None, include_archived=False):
         """
-        Get all bookings for users in a specific department
+        Get bookings for users in a specific department, newest first (paged)
+        
+        date_from/date_to are YYYY-MM-DD on start_at (inclusive), status is a
+        list or comma-separated string, include_archived also pages through
+        bookings_archive. Returns {'bookings': [...], 'next_cursor': ...}.
         """
-        # Get all users in the department
-        users = self.user_repository.get_users_by_department(department_id)
-        user_ids = [user.id for user in users]
+        try:
+            range_start = datetime.strptime(date_from, '%Y-%m-%d') if date_from else None
+            range_end = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1) if date_to else None
+        except ValueError:
+            raise ValueError("Invalid date format. Use YYYY-MM-DD")
+        
+        statuses = status.split(',') if isinstance(status, str) else status
         
-        # Get all bookings for these users
-        all_bookings = []
-        for user_id in user_ids:
-            bookings = self.repository.get_bookings_by_user(user_id)
-            all_bookings.extend(bookings)
+        bookings, next_cursor = self.repository.get_department_bookings_page(
+            department_id,
+            range_start=range_start,
+            range_end=range_end,
+            statuses=[value.strip() for value in statuses if value.strip()] if statuses else None,
+            cursor=cursor,
+            limit=normalize_limit(limit),
+            include_archived=include_archived
+        )
         
-        # Sort by created_at descending (newest first)
-        all_bookings.sort(key=lambda x: x.created_at, reverse=True)
+        bookings_data = []
+        for booking in bookings:
+            booking_dict = booking.to_dict()
+            booking_dict['username'] = booking.user.username if booking.user else None
+            bookings_data.append(booking_dict)
         
-        return [booking.to_dict() for booking in all_bookings]
+        return {
+            'bookings': bookings_data,
+            'next_cursor': next_cursor
+        }
     
-    def update_booking_status(self, booking_id, action, checkin_code=None):
-        """Update booking status (checkin, checkout, cancel)"""
-        # Get booking
-        booking = self.repository.find_by_id(booking_id)
-        if not booking:
-            raise ValueError(f"Booking with ID {booking_id} not found")
+    def checkin_by_code(self, checkin_code, booking_id=None):
+        """
+        Check in with a single conditional UPDATE (fast path for check-in bursts)
         
+        The UPDATE only matches an active booking with this code inside its
+        validity window. A narrow read afterwards builds the response or, when no
+        row matched, the exact reason. booking_id additionally pins the booking
+        (PATCH /api/bookings/:id).
+        """
+        if not checkin_code:
+            raise ValueError("Checkin code is required for checkin")
+        
+        transition = self.STATUS_TRANSITIONS['checkin']
         now = datetime.now()
-        update_data = {'updated_at': now}
-
-        # Handle based on action
-        if action == 'checkin':
-            # Validate status
-            if booking.status == 'cancelled':
-                raise ValueError("Booking has been cancelled, cannot check in")
-
-            if booking.status == 'checkin':
-                raise ValueError("Already checked in")
-
-            if booking.status == 'finished':
-                raise ValueError("Booking has finished, cannot check in")
-
-            # Validate checkin code required
-            if not checkin_code:
-                raise ValueError("Checkin code is required for checkin")
-
-            # Validate checkin code
-            if booking.checkin_code != checkin_code:
-                raise ValueError("Checkin code is invalid")
-
-            # Validate checkin time
-            if now < booking.code_valid_from:
-                raise ValueError(
-                    f"Checkin cannot be performed yet. "
-                    f"Checkin opens at {booking.code_valid_from.strftime('%Y-%m-%d %H:%M:%S')}"
-                )
+        updated = self.repository.checkin_by_code(
+            checkin_code, now, booking_id=booking_id, from_statuses=transition['from']
+        )
+        summary = self.repository.get_booking_summary(checkin_code=checkin_code, booking_id=booking_id)
+        
+        if updated and summary:
+            self._record_stats(self.user_stats_repository.record_transition, [summary], 'active', 'checkin')
+            return self._summary_to_dict(summary)
+        
+        # Nothing matched, work out why
+        if not summary:
+            if booking_id is not None:
+                raise ValueError(f"Booking with ID {booking_id} not found")
+            raise ValueError("Checkin code is invalid")
+        
+        if summary.status not in transition['from']:
+            raise ValueError(self._transition_error('checkin', summary.status))
+        
+        if summary.checkin_code != checkin_code:
+            raise ValueError("Checkin code is invalid")
+        
+        if now < summary.code_valid_from:
+            raise ValueError(
+                f"Checkin cannot be performed yet. "
+                f"Checkin opens at {summary.code_valid_from.strftime('%Y-%m-%d %H:%M:%S')}"
+            )
+        
+        if now > summary.code_valid_to:
+            raise ValueError(
+                f"Checkin time has expired. "
+                f"Checkin is valid until {summary.code_valid_to.strftime('%Y-%m-%d %H:%M:%S')}"
+            )
+        
+        # Matched nothing but looks valid now: the row changed between UPDATE and read
+        raise ValueError("Checkin failed, please try again")
+    
+    def _transition_error(self, action, status):
+        """Error message for an action attempted from a status it is not allowed from"""
+        return self.STATUS_TRANSITIONS[action]['errors'].get(
+            status, f"Cannot {action} a booking that is {status}"
+        )
+    
+    @staticmethod
+    def _summary_to_dict(summary):
+        """Same shape as Booking.to_dict() built from a get_booking_summary row"""
+        return {
+            'id': summary.id,
+            'user_id': summary.user_id,
+            'space_id': summary.space_id,
+            'space_name': summary.space_name or 'Unknown',
+            'space_type': summary.space_type or 'Unknown',
+            'date': summary.start_at.strftime('%Y-%m-%d'),
+            'start_time': summary.start_at.strftime('%H:%M'),
+            'end_time': summary.end_at.strftime('%H:%M'),
+            'status': summary.status,
+            'checkin_code': summary.checkin_code,
+            'code_valid_from': summary.code_valid_from.isoformat() if summary.code_valid_from else None,
+            'code_valid_to': summary.code_valid_to.isoformat() if summary.code_valid_to else None,
+            'checkin_at': summary.checkin_at.isoformat() if summary.checkin_at else None,
+            'checkout_at': summary.checkout_at.isoformat() if summary.checkout_at else None,
+            'created_at': summary.created_at.isoformat() if summary.created_at else None,
+            'updated_at': summary.updated_at.isoformat() if summary.updated_at else None,
+            'version': summary.version
+        }
+    
+    def sweep_expired_bookings(self, now=None, batch_size=500, max_batches=20):
+        """
+        Expire bookings that can no longer change by themselves
+        
+        Applies EXPIRY_RULES in batches: each batch locks up to batch_size rows
+        and moves them with one UPDATE. Occupancy and availability caches are
+        invalidated per affected date. Returns counts per target status and the
+        affected space-days as {(space_id, date): (first_start, last_end)} for
+        coalesced broadcasts.
+        """
+        now = now or datetime.now()
+        result = {'batches': 0, 'space_days': {}}
+        
+        for from_status, deadline_column, to_status, copy_columns in self.EXPIRY_RULES:
+            result[to_status] = 0
             
-            if now > booking.code_valid_to:
-                raise ValueError(
-                    f"Checkin time has expired. "
-                    f"Checkin is valid until {booking.code_valid_to.strftime('%Y-%m-%d %H:%M:%S')}"
+            for _ in range(max_batches):
+                rows = self.repository.lock_expired_batch(from_status, deadline_column, now, batch_size)
+                if not rows:
+                    break
+                
+                result[to_status] += self.repository.set_status_batch(
+                    [row.id for row in rows], from_status, to_status, now, copy_columns=copy_columns
                 )
-            
-            # Update for checkin
-            update_data['status'] = 'checkin'
-            update_data['checkin_at'] = now
-            
-        elif action == 'checkout':
-            # Validate status
-            if booking.status == 'cancelled':
-                raise ValueError("Booking has been cancelled, cannot checkout")
-
-            if booking.status == 'finished':
-                raise ValueError("Booking has finished, cannot checkout")
-
-            if booking.status != 'checkin':
-                raise ValueError("Must check in before checking out")
-
-            # Update for checkout
-            update_data['status'] = 'finished'
-            update_data['checkout_at'] = now
-            
-        elif action == 'cancel':
-            # Validate status
-            if booking.status == 'cancelled':
-                raise ValueError("Booking has been cancelled, cannot cancel again")
-
-            if booking.status == 'checkin':
-                raise ValueError("Cannot cancel a booking that has already checked in")
-
-            if booking.status == 'finished':
-                raise ValueError("Cannot cancel a booking that has finished")
-
-            # Update for cancel
-            update_data['status'] = 'cancelled'
-            
-        else:
+                result['batches'] += 1
+                self._record_stats(self.user_stats_repository.record_transition, rows, from_status, to_status)
+                
+                for row in rows:
+                    key = (row.space_id, row.start_at.date())
+                    first_start, last_end = result['space_days'].get(key, (row.start_at, row.end_at))
+                    result['space_days'][key] = (min(first_start, row.start_at), max(last_end, row.end_at))
+                
+                if len(rows) < batch_size:
+                    break
+        
+        for target_date in {target_date for _, target_date in result['space_days']}:
+            occupancy_index.invalidate(target_date)
+            availability_cache.invalidate_date(target_date)
+        
+        return result
+    
+    def archive_old_bookings(self, after_days, batch_size=1000, max_batches=None, now=None, on_batch=None):
+        """
+        Move finished/cancelled/no_show bookings that ended more than after_days ago to the archive
+        
+        Works in batches of batch_size rows, each its own short transaction, until
+        nothing is left (or max_batches ran). on_batch(moved) is called after every
+        batch (for progress output). Returns {'cutoff', 'batches', 'archived'}.
+        """
+        if after_days < 1:
+            raise ValueError("Archive horizon must be at least 1 day")
+        
+        now = now or datetime.now()
+        cutoff = now - timedelta(days=after_days)
+        result = {'cutoff': cutoff, 'batches': 0, 'archived': 0}
+        
+        while max_batches is None or result['batches'] < max_batches:
+            moved = self.repository.archive_batch(self.ARCHIVE_STATUSES, cutoff, now, batch_size)
+            if not moved:
+                break
+            
+            result['batches'] += 1
+            result['archived'] += moved
+            if on_batch:
+                on_batch(moved)
+            
+            if moved < batch_size:
+                break
+        
+        return result
+    
+    def count_archivable_bookings(self, after_days, now=None):
+        """Count bookings archive_old_bookings would move"""
+        cutoff = (now or datetime.now()) - timedelta(days=after_days)
+        return self.repository.count_archivable(self.ARCHIVE_STATUSES, cutoff)
+    
+    def update_booking_status(self, booking_id, action, checkin_code=None):
+        """
+        Update booking status (checkin, checkout, cancel)
+        
+        Each action is one conditional UPDATE ... WHERE id = ? AND status IN
+        (allowed from-states), so concurrent requests cannot both win. The row is
+        read afterwards only to build the response or the error message.
+        """
+        # Check-in also checks the code and its time window in the UPDATE
+        if action == 'checkin':
+            return self.checkin_by_code(checkin_code, booking_id=booking_id)
+        
+        transition = self.STATUS_TRANSITIONS.get(action)
+        if not transition:
             raise ValueError(f"Action is not valid: {action}. Use: checkin, checkout, or cancel")
-
-        # Update booking
-        updated_booking = self.repository.update_booking(booking, update_data)
         
-        return updated_booking.to_dict()
+        updated = self.repository.transition_status(
+            booking_id,
+            transition['from'],
+            transition['to'],
+            datetime.now(),
+            timestamp_field=transition['timestamp']
+        )
+        summary = self.repository.get_booking_summary(booking_id=booking_id)
+        
+        if not summary:
+            raise ValueError(f"Booking with ID {booking_id} not found")
+        
+        if not updated:
+            raise ValueError(self._transition_error(action, summary.status))
+        
+        # Every transition has a single from-state
+        self._record_stats(
+            self.user_stats_repository.record_transition, [summary], transition['from'][0], transition['to']
+        )
+        
+        # Cancelled/finished bookings no longer occupy the space
+        if transition['to'] in ['cancelled', 'finished']:
+            occupancy_index.remove_booking(summary)
+            availability_cache.invalidate_date(summary.start_at.date())
+        
+        return self._summary_to_dict(summary)
     
     # Management methods (superadmin only)
-    def get_all_bookings_for_management(self):
-        """Get all bookings for management with additional info"""
+    def get_all_bookings_for_management(self, date_from=None, date_to=None, space_id=None, user_id=None, status=None, sort='start_at', order='desc', cursor=None, limit=None, include_archived=False):
+        """
+        Get a page of bookings for management with user, space and floor info
+        
+        One joined query per page (keyset pagination) plus one COUNT for the total,
+        each also run on bookings_archive when include_archived is set.
+        Raises ValueError for invalid filters, sort or cursor.
+        """
+        # Validate filters before touching the database
         try:
-            bookings = self.repository.get_all_bookings()
-            bookings_data = []
+            range_start = datetime.strptime(date_from, '%Y-%m-%d') if date_from else None
+            range_end = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1) if date_to else None
+        except ValueError:
+            raise ValueError("Invalid date format. Use YYYY-MM-DD")
+        
+        if sort not in self.MANAGEMENT_SORT_FIELDS:
+            raise ValueError(f"Invalid sort. Must be one of: {', '.join(self.MANAGEMENT_SORT_FIELDS)}")
+        
+        if order not in ['asc', 'desc']:
+            raise ValueError("Invalid order. Must be one of: asc, desc")
+        
+        statuses = [value.strip() for value in status.split(',') if value.strip()] if status else None
+        
+        try:
+            bookings, next_cursor, total = self.repository.get_management_page(
+                range_start=range_start,
+                range_end=range_end,
+                space_id=space_id,
+                user_id=user_id,
+                statuses=statuses,
+                sort=sort,
+                descending=(order == 'desc'),
+                cursor=cursor,
+                limit=normalize_limit(limit),
+                include_archived=include_archived
+            )
             
+            bookings_data = []
             for booking in bookings:
                 booking_dict = booking.to_dict()
                 
-                # Get user info
-                user = self.user_repository.get_by_id(booking.user_id)
-                booking_dict['username'] = user.username if user else None
-                booking_dict['user_email'] = user.email if user else None
-                
-                # Get space info (already in to_dict but add floor)
-                space = self.space_repository.get_by_id(booking.space_id)
-                if space:
-                    floor = self.space_repository.get_floor_by_id(space.location)
-                    booking_dict['floor_name'] = floor.name if floor else None
+                # User, space and floor come from the same joined query
+                booking_dict['username'] = booking.user.username if booking.user else None
+                booking_dict['user_email'] = booking.user.email if booking.user else None
+                if booking.space:
+                    booking_dict['floor_name'] = booking.space.floor.name if booking.space.floor else None
                 
                 bookings_data.append(booking_dict)
             
             return {
                 'success': True,
                 'data': bookings_data,
-                'total': len(bookings_data)
+                'total': total,
+                'next_cursor': next_cursor
             }
+        except ValueError:
+            raise
         except Exception as e:
             return {
                 'success': False,
@@ -414,6 +787,9 @@ class BookingUseCase:
             }
             
             new_booking = self.repository.create_booking(booking_data)
+            occupancy_index.invalidate(new_booking.start_at.date())
+            availability_cache.invalidate_date(new_booking.start_at.date())
+            self._record_stats(self.user_stats_repository.record_created, [new_booking])
             
             booking_dict = new_booking.to_dict()
             booking_dict['username'] = user.username
@@ -434,8 +810,15 @@ class BookingUseCase:
                 'error': str(e)
             }
     
-    def update_booking_management(self, booking_id, user_id=None, space_id=None, start_at=None, end_at=None, status=None):
-        """Update booking (superadmin)"""
+    def update_booking_management(self, booking_id, user_id=None, space_id=None, start_at=None, end_at=None, status=None, version=None):
+        """
+        Update booking (superadmin)
+        
+        version is the booking version the client last read; the update only
+        applies if nobody changed the booking since (optimistic locking). Without
+        it, the version read at the start of this request is used. A lost race
+        returns {'success': False, 'conflict': True, 'current_version': ...}.
+        """
         from src.config.database import db
         
         try:
@@ -447,6 +830,17 @@ class BookingUseCase:
                     'error': f'Booking with ID {booking_id} not found'
                 }
             
+            if version is not None:
+                try:
+                    expected_version = int(version)
+                except (TypeError, ValueError):
+                    return {
+                        'success': False,
+                        'error': 'Field version must be a number'
+                    }
+            else:
+                expected_version = booking.version
+            
             # Validate user if provided
             if user_id is not None:
                 user = self.user_repository.get_by_id(user_id)
@@ -517,8 +911,11 @@ class BookingUseCase:
                 code_valid_to = actual_end.replace(hour=23, minute=59, second=59, microsecond=0)
             
             # Update booking
+            previous_date = booking.start_at.date()
+            previous_user_id = booking.user_id
             updated_booking = self.repository.update_booking_management(
                 booking_id=booking_id,
+                expected_version=expected_version,
                 user_id=user_id,
                 space_id=space_id,
                 start_at=start_dt,
@@ -529,6 +926,17 @@ class BookingUseCase:
             )
             
             if updated_booking:
+                # Space, time or status may have changed, rebuild both old and new dates
+                occupancy_index.invalidate(previous_date)
+                occupancy_index.invalidate(updated_booking.start_at.date())
+                availability_cache.invalidate_date(previous_date)
+                availability_cache.invalidate_date(updated_booking.start_at.date())
+                
+                # Any field may have changed, recompute the summary of both users
+                self._record_stats(
+                    self.user_stats_repository.rebuild, list({previous_user_id, updated_booking.user_id})
+                )
+                
                 booking_dict = updated_booking.to_dict()
                 
                 # Get user info
@@ -546,9 +954,18 @@ class BookingUseCase:
                     'data': booking_dict
                 }
             
+            # The conditional UPDATE matched nothing: changed (or deleted) since it was read
+            current = self.repository.get_booking_summary(booking_id=booking_id)
+            if not current:
+                return {
+                    'success': False,
+                    'error': f'Booking with ID {booking_id} not found'
+                }
             return {
                 'success': False,
-                'error': 'Failed to update booking'
+                'conflict': True,
+                'current_version': current.version,
+                'error': f'Booking was modified by someone else (now at version {current.version}), reload it and try again'
             }
         except Exception as e:
             db.session.rollback()
@@ -570,7 +987,12 @@ class BookingUseCase:
                     'error': f'Booking with ID {booking_id} not found'
                 }
             
+            booking_date = booking.start_at.date()
+            booking_user_id = booking.user_id
             self.repository.delete_booking(booking_id)
+            occupancy_index.invalidate(booking_date)
+            availability_cache.invalidate_date(booking_date)
+            self._record_stats(self.user_stats_repository.rebuild, [booking_user_id])
             
             return {
                 'success': True,
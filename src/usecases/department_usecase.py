@@ -13,29 +13,15 @@ class DepartmentUseCase:
     def get_all_departments(self) -> Dict:
         """Get all departments with total users count"""
         try:
-            departments = self.department_repository.get_all()
+            # User counts and manager come from the same query
+            rows = self.department_repository.get_all_with_stats()
             departments_list = []
             
-            for department in departments:
+            for department, total_users, manager_name, manager_email in rows:
                 department_data = department.to_dict()
-                
-                # Count total users in this department
-                total_users = self.user_repository.count_by_department_id(department.id)
                 department_data['total_users'] = total_users
-                
-                # Get manager info
-                if department.manager_id:
-                    manager = self.user_repository.get_by_id(department.manager_id)
-                    if manager:
-                        department_data['manager_name'] = manager.username
-                        department_data['manager_email'] = manager.email
-                    else:
-                        department_data['manager_name'] = None
-                        department_data['manager_email'] = None
-                else:
-                    department_data['manager_name'] = None
-                    department_data['manager_email'] = None
-                
+                department_data['manager_name'] = manager_name
+                department_data['manager_email'] = manager_email
                 departments_list.append(department_data)
             
             return {
@@ -2,6 +2,7 @@ from typing import Dict
 from src.repositories.floor_repository import FloorRepository
 from src.repositories.space_repository import SpaceRepository
 from src.config.database import db
+from src.utils.availability_cache import availability_cache
 
 class FloorUseCase:
     """UseCase for business logic Floor"""
@@ -10,20 +11,23 @@ class FloorUseCase:
         self.floor_repository = FloorRepository()
         self.space_repository = SpaceRepository()
     
-    def get_all_floors(self) -> Dict:
-        """Get all floors with total spaces count"""
+    def get_all_floors(self, include_spaces: bool = False) -> Dict:
+        """Get all floors with total spaces count, optionally with their spaces"""
         try:
-            floors = self.floor_repository.get_all()
             floors_list = []
             
-            for floor in floors:
-                floor_data = floor.to_dict()
-                
-                # Count total spaces on this floor
-                total_spaces = self.space_repository.count_by_floor_id(floor.id)
-                floor_data['total_spaces'] = total_spaces
-                
-                floors_list.append(floor_data)
+            if include_spaces:
+                # floor -> spaces tree from one joined query
+                for floor in self.floor_repository.get_all_with_spaces():
+                    floor_data = floor.to_dict()
+                    floor_data['total_spaces'] = len(floor.spaces)
+                    floor_data['spaces'] = [space.to_dict() for space in floor.spaces]
+                    floors_list.append(floor_data)
+            else:
+                for floor, total_spaces in self.floor_repository.get_all_with_space_counts():
+                    floor_data = floor.to_dict()
+                    floor_data['total_spaces'] = total_spaces
+                    floors_list.append(floor_data)
             
             return {
                 'success': True,
@@ -109,6 +113,8 @@ class FloorUseCase:
             
             floor = self.floor_repository.update(floor_id, name=name)
             if floor:
+                # Floor name is part of the cached space listing
+                availability_cache.invalidate()
                 floor_data = floor.to_dict()
                 
                 # Count total spaces on this floor
@@ -6,10 +6,20 @@ from src.repositories.amenity_repository import AmenityRepository
 from src.repositories.booking_repository import BookingRepository
 from src.repositories.user_repository import UserRepository
 from src.repositories.blackout_repository import BlackoutRepository
+from src.utils.occupancy_index import occupancy_index, EMPTY_SPACE_DAY
+from src.utils.blackout_calendar import blackout_calendar
+from src.utils.opening_hours import opening_hours_cache, compile_opening_hours
+from src.utils.availability_cache import availability_cache
 
 class SpaceUseCase:
     """Use case for Space business logic"""
     
+    # Maximum number of days for the range availability endpoint
+    MAX_RANGE_DAYS = 31
+    
+    # Maximum number of suggestions returned by the room search
+    MAX_SEARCH_RESULTS = 50
+    
     def __init__(self):
         self.space_repository = SpaceRepository()
         self.floor_repository = FloorRepository()
@@ -20,9 +30,6 @@ class SpaceUseCase:
     
     def get_all_spaces(self, date=None, start_time=None, end_time=None):
         """Get all spaces with floor name dan amenities"""
-        spaces = self.space_repository.get_all_spaces()
-        result = []
-        
         # Parse datetime filters if provided
         requested_start = None
         requested_end = None
@@ -49,12 +56,36 @@ class SpaceUseCase:
                     raise ValueError("Invalid date/time format. Use YYYY-MM-DD for date and HH:MM for time")
                 raise
         
+        # Key on parsed values so '2025-1-5' and '2025-01-05' share an entry
+        cache_key = (
+            requested_start.date() if requested_start else None,
+            requested_start.time() if requested_start else None,
+            requested_end.time() if requested_end else None
+        )
+        cached = availability_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        generation = availability_cache.generation()
+        spaces = self.space_repository.get_all_spaces()
+        result = []
+        
+        # Load floors, amenities, blackouts and the day's occupancy once for the whole result set
+        floors_by_id = {floor.id: floor for floor in self.floor_repository.get_all()}
+        amenities_by_space = self._group_by_space(self.amenity_repository.get_all())
+        occupancy = {}
+        blackouts = []
+        
+        if requested_start and requested_end:
+            blackouts = blackout_calendar.active_at(check_date)
+            occupancy = occupancy_index.get_day(check_date.date())
+        
         for space in spaces:
             # Get floor information
-            floor = self.floor_repository.get_by_id(space.location)
+            floor = floors_by_id.get(space.location)
             
             # Get amenities for this space
-            amenities = self.amenity_repository.get_by_space_id(space.id)
+            amenities = amenities_by_space.get(space.id, [])
             amenities_list = [
                 {
                     'id': amenity.id,
@@ -71,7 +102,8 @@ class SpaceUseCase:
             
             if requested_start and requested_end:
                 availability_result = self._check_space_availability(
-                    space, requested_start, requested_end, check_date
+                    space, requested_start, requested_end, check_date,
+                    occupancy.get(space.id), blackouts
                 )
                 is_available = availability_result['is_available']
                 available_hours = availability_result['available_hours']
@@ -115,12 +147,256 @@ class SpaceUseCase:
             
             result.append(space_data)
         
+        availability_cache.set(cache_key, result, generation)
         return result
     
-    def _check_space_availability(self, space, requested_start, requested_end, check_date):
+    def get_availability_range(self, from_date, to_date):
+        """
+        Get free intervals per space per day for a date range (week view)
+        
+        Bookings and blackouts for the whole window are loaded once. Each
+        space-day is computed as opening-hours bitmap AND NOT occupancy
+        bitmap, so free intervals are reported at slot granularity.
+        """
+        try:
+            start_date = datetime.strptime(from_date, '%Y-%m-%d').date() if from_date else None
+            end_date = datetime.strptime(to_date, '%Y-%m-%d').date() if to_date else None
+        except ValueError:
+            raise ValueError("Invalid date format. Use YYYY-MM-DD for from and to")
+        
+        if not start_date or not end_date:
+            raise ValueError("Both from and to dates are required")
+        
+        if end_date < start_date:
+            raise ValueError("The to date must not be before the from date")
+        
+        total_days = (end_date - start_date).days + 1
+        if total_days > self.MAX_RANGE_DAYS:
+            raise ValueError(f"Date range cannot exceed {self.MAX_RANGE_DAYS} days")
+        
+        dates = [start_date + timedelta(days=offset) for offset in range(total_days)]
+        
+        # One query each for spaces, floors, bookings and blackouts of the whole window
+        spaces = self.space_repository.get_all_spaces()
+        floors_by_id = {floor.id: floor for floor in self.floor_repository.get_all()}
+        occupancy_by_date = occupancy_index.get_days(dates)
+        window_start = datetime.combine(start_date, datetime.min.time())
+        window_end = datetime.combine(end_date, datetime.min.time())
+        blackouts = blackout_calendar.overlapping(window_start, window_end)
+        
+        # Blackout per day (same rule as single-day check: blackout active at 00:00)
+        blackout_by_date = {}
+        for day in dates:
+            day_start = datetime.combine(day, datetime.min.time())
+            for blackout in blackouts:
+                if blackout.start_at <= day_start <= blackout.end_at:
+                    blackout_by_date[day] = blackout
+                    break
+        
+        result = []
+        for space in spaces:
+            floor = floors_by_id.get(space.location)
+            days = []
+            
+            for day in dates:
+                day_data = {
+                    'date': day.strftime('%Y-%m-%d'),
+                    'is_closed': False,
+                    'unavailable_reason': None,
+                    'free': []
+                }
+                
+                blackout = blackout_by_date.get(day)
+                open_minutes = opening_hours_cache.get(space).for_date(day)
+                
+                if blackout:
+                    day_data['is_closed'] = True
+                    day_data['unavailable_reason'] = f"Blackout: {blackout.title}"
+                elif open_minutes is None:
+                    day_data['is_closed'] = True
+                elif space.status != 'available':
+                    day_data['unavailable_reason'] = f"Space is currently {space.status}"
+                else:
+                    space_day = occupancy_by_date[day].get(space.id, EMPTY_SPACE_DAY)
+                    free_mask = occupancy_index.open_mask(*open_minutes) & ~space_day.bitmap
+                    day_data['free'] = occupancy_index.mask_to_intervals(free_mask)
+                
+                days.append(day_data)
+            
+            result.append({
+                'id': space.id,
+                'name': space.name,
+                'type': space.type,
+                'capacity': space.capacity,
+                'location': floor.name if floor else None,
+                'status': space.status,
+                'days': days
+            })
+        
+        return {
+            'from': start_date.strftime('%Y-%m-%d'),
+            'to': end_date.strftime('%Y-%m-%d'),
+            'slot_minutes': occupancy_index.slot_minutes,
+            'spaces': result
+        }
+    
+    def find_available_slots(self, duration, from_at, to_at, min_capacity=None, space_type=None, amenities=None, limit=10):
+        """
+        Find the earliest (space, start) pairs that can hold a booking of `duration` minutes
+        
+        Candidate spaces are filtered by capacity, type, required amenity names,
+        status and max_duration. For every space-day in the window the sorted
+        free intervals (opening hours minus occupied intervals) are scanned and
+        the earliest feasible start of each free interval becomes a candidate.
+        """
+        if not duration or duration <= 0:
+            raise ValueError("Duration must be a positive number of minutes")
+        
+        if limit <= 0 or limit > self.MAX_SEARCH_RESULTS:
+            raise ValueError(f"Limit must be between 1 and {self.MAX_SEARCH_RESULTS}")
+        
+        window_start = self._parse_search_datetime(from_at, 'from') if from_at else datetime.now()
+        window_end = self._parse_search_datetime(to_at, 'to', end_of_day=True) if to_at else window_start + timedelta(days=7)
+        
+        # Never suggest a start that has already passed
+        window_start = max(window_start, datetime.now().replace(second=0, microsecond=0))
+        
+        if window_end <= window_start:
+            raise ValueError("The to datetime must be after the from datetime")
+        
+        # A window ending at midnight does not touch that day
+        total_days = ((window_end - timedelta(minutes=1)).date() - window_start.date()).days + 1
+        if total_days > self.MAX_RANGE_DAYS:
+            raise ValueError(f"Search window cannot exceed {self.MAX_RANGE_DAYS} days")
+        
+        booking_length = timedelta(minutes=duration)
+        required_amenities = {name.strip().lower() for name in (amenities or []) if name.strip()}
+        
+        floors_by_id = {floor.id: floor for floor in self.floor_repository.get_all()}
+        amenities_by_space = self._group_by_space(self.amenity_repository.get_all())
+        
+        # Filter candidate spaces before touching bookings
+        candidates = []
+        for space in self.space_repository.get_all_spaces():
+            if space.status != 'available':
+                continue
+            if min_capacity and space.capacity < min_capacity:
+                continue
+            if space_type and space.type != space_type:
+                continue
+            if space.max_duration and duration > space.max_duration:
+                continue
+            
+            space_amenities = amenities_by_space.get(space.id, [])
+            if not required_amenities <= {amenity.name.lower() for amenity in space_amenities}:
+                continue
+            
+            candidates.append((space, space_amenities))
+        
+        if not candidates:
+            return []
+        
+        dates = [window_start.date() + timedelta(days=offset) for offset in range(total_days)]
+        occupancy_by_date = occupancy_index.get_days(dates)
+        blackouts = blackout_calendar.overlapping(
+            datetime.combine(dates[0], datetime.min.time()),
+            datetime.combine(dates[-1], datetime.min.time())
+        )
+        blacked_out_dates = {
+            day for day in dates
+            if any(b.start_at <= datetime.combine(day, datetime.min.time()) <= b.end_at for b in blackouts)
+        }
+        
+        slots = []
+        for space, space_amenities in candidates:
+            for day in dates:
+                if day in blacked_out_dates:
+                    continue
+                
+                open_minutes = opening_hours_cache.get(space).for_date(day)
+                if open_minutes is None:
+                    continue
+                
+                space_day = occupancy_by_date[day].get(space.id, EMPTY_SPACE_DAY)
+                
+                for free_start, free_end in self._free_intervals(day, open_minutes, space_day.intervals):
+                    start = max(free_start, window_start)
+                    if start + booking_length <= min(free_end, window_end):
+                        slots.append((start, space.id, space, space_amenities))
+        
+        slots.sort(key=lambda slot: (slot[0], slot[1]))
+        
+        results = []
+        for start, _, space, space_amenities in slots[:limit]:
+            floor = floors_by_id.get(space.location)
+            results.append({
+                'space_id': space.id,
+                'space_name': space.name,
+                'type': space.type,
+                'capacity': space.capacity,
+                'location': floor.name if floor else None,
+                'amenities': [amenity.name for amenity in space_amenities],
+                'date': start.strftime('%Y-%m-%d'),
+                'start_at': start.strftime('%Y-%m-%d %H:%M'),
+                'end_at': (start + booking_length).strftime('%Y-%m-%d %H:%M')
+            })
+        
+        return results
+    
+    @staticmethod
+    def _parse_search_datetime(value, field, end_of_day=False):
+        """
+        Parse a search window bound (YYYY-MM-DD HH:MM, YYYY-MM-DDTHH:MM or YYYY-MM-DD)
+        
+        A date without time is the start of that day, or its end (next
+        midnight) when end_of_day is set, so to=D includes all of day D.
+        """
+        for fmt in ('%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M'):
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+        
+        try:
+            day_start = datetime.strptime(value, '%Y-%m-%d')
+            return day_start + timedelta(days=1) if end_of_day else day_start
+        except ValueError:
+            pass
+        
+        raise ValueError(f"Invalid {field} format. Use YYYY-MM-DD HH:MM or YYYY-MM-DD")
+    
+    @staticmethod
+    def _free_intervals(day, open_minutes, intervals):
+        """Yield (start, end) datetimes of gaps between sorted occupied intervals within opening hours"""
+        day_start = datetime.combine(day, datetime.min.time())
+        current = day_start + timedelta(minutes=open_minutes[0])
+        closing = day_start + timedelta(minutes=open_minutes[1])
+        
+        for interval in intervals:
+            if interval.start_at >= closing:
+                break
+            if current < interval.start_at:
+                yield current, interval.start_at
+            current = max(current, interval.end_at)
+        
+        if current < closing:
+            yield current, closing
+    
+    @staticmethod
+    def _group_by_space(rows):
+        """Group rows that have a space_id column into a dict keyed by space_id"""
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(row.space_id, []).append(row)
+        return grouped
+    
+    def _check_space_availability(self, space, requested_start, requested_end, check_date, space_day, blackouts):
         """
         Check if space is available for the requested time
         Also returns available hours for the entire day
+        
+        space_day: SpaceDayOccupancy of this space on check_date (None if nothing booked)
+        blackouts: blackouts active on check_date
         """
         result = {
             'is_available': True,
@@ -131,7 +407,6 @@ class SpaceUseCase:
         }
         
         # Check blackout dates FIRST - office closed means no spaces available
-        blackouts = self.blackout_repository.get_active_blackouts(check_date)
         if blackouts:
             result['is_available'] = False
             result['is_closed'] = True
@@ -140,20 +415,10 @@ class SpaceUseCase:
         
         # Check opening hours for the requested time BEFORE status check
         # Office closed (weekend/holiday) takes priority over individual space status
-        day_of_week = requested_start.strftime('%a').lower()[:3]  # mon, tue, wed, etc
-        
-        open_time = None
-        close_time = None
+        schedule = opening_hours_cache.get(space)
+        open_minutes = schedule.for_date(requested_start.date())
         
-        if not space.opening_hours or not isinstance(space.opening_hours, dict):
-            # No opening hours defined, treat as closed
-            result['is_available'] = False
-            result['is_closed'] = True
-            return result
-        
-        day_hours = space.opening_hours.get(day_of_week)
-        
-        if not day_hours:  # Closed on this day (e.g., weekend)
+        if open_minutes is None:  # No/invalid opening hours or closed on this day (e.g., weekend)
             result['is_available'] = False
             result['is_closed'] = True  # Mark as closed
             return result
@@ -163,109 +428,51 @@ class SpaceUseCase:
             result['is_available'] = False
             return result
         
-        # Parse opening hours
-        try:
-            open_time = datetime.strptime(day_hours['start'], '%H:%M').time()
-            close_time = datetime.strptime(day_hours['end'], '%H:%M').time()
-            
-            requested_start_time = requested_start.time()
-            requested_end_time = requested_end.time()
-            
-            # Check if requested time is within opening hours
-            if requested_start_time < open_time or requested_end_time > close_time:
-                result['is_available'] = False
-                result['outside_hours'] = True  # Mark as outside operating hours
-                return result
-        except (KeyError, ValueError) as e:
-            # Invalid opening hours format, treat as closed
+        # Check if requested time is within opening hours
+        if not schedule.contains(requested_start, requested_end):
             result['is_available'] = False
-            result['is_closed'] = True
+            result['outside_hours'] = True  # Mark as outside operating hours
             return result
         
-        # Get all bookings for this space on the requested date
-        date_start = datetime.combine(check_date.date(), datetime.min.time())
-        date_end = datetime.combine(check_date.date(), datetime.max.time())
+        # Build available hours for the entire day
+        if space_day is None:
+            space_day = EMPTY_SPACE_DAY
         
-        # Get bookings through repository
-        all_bookings = self.booking_repository.get_by_space_id(space.id)
+        available_hours = self._calculate_available_hours(
+            check_date, open_minutes, space_day.intervals
+        )
+        result['available_hours'] = available_hours
         
-        # Filter bookings for the specific date and status
-        bookings = [
-            b for b in all_bookings
-            if b.status in ['active', 'checkin']
-            and b.start_at >= date_start
-            and b.start_at < date_end
-        ]
+        # Check if requested time slot is available (bitmap test, exact check only on overlap)
+        conflicting_booking = space_day.find_conflict(
+            requested_start, requested_end,
+            occupancy_index.slot_mask(check_date.date(), requested_start, requested_end)
+        )
         
-        # Build available hours for the entire day
-        if open_time and close_time:
-            available_hours = self._calculate_available_hours(
-                space, check_date, open_time, close_time, bookings
-            )
-            result['available_hours'] = available_hours
+        if conflicting_booking:
+            result['is_available'] = False
+            # Build unavailable reason with user info
+            username = conflicting_booking.username or "Unknown"
             
-            # Check if requested time slot is available
-            conflicting_booking = self._find_conflicting_booking(
-                requested_start, requested_end, bookings
-            )
+            start_time = conflicting_booking.start_at.strftime('%H:%M')
+            end_time = conflicting_booking.end_at.strftime('%H:%M')
             
-            if conflicting_booking:
-                result['is_available'] = False
-                # Build unavailable reason with user info
-                user = self.user_repository.get_by_id(conflicting_booking.user_id)
-                username = user.username if user else "Unknown"
-                
-                start_time = conflicting_booking.start_at.strftime('%H:%M')
-                end_time = conflicting_booking.end_at.strftime('%H:%M')
-                
-                result['unavailable_reason'] = (
-                    f"This space is already booked by {username} "
-                    f"from {start_time} to {end_time}"
-                )
+            result['unavailable_reason'] = (
+                f"This space is already booked by {username} "
+                f"from {start_time} to {end_time}"
+            )
         
         return result
     
-    def _calculate_available_hours(self, space, check_date, open_time, close_time, bookings):
+    def _calculate_available_hours(self, check_date, open_minutes, bookings):
         """Calculate available hours for the entire day"""
-        available_slots = []
-        
-        # Convert times to datetime for easier calculation
-        current_time = datetime.combine(check_date.date(), open_time)
-        end_time = datetime.combine(check_date.date(), close_time)
-        
-        # Sort bookings by start time
-        sorted_bookings = sorted(bookings, key=lambda b: b.start_at)
-        
-        for booking in sorted_bookings:
-            # If there's a gap before this booking, add it as available
-            if current_time < booking.start_at:
-                available_slots.append({
-                    'start': current_time.strftime('%H:%M'),
-                    'end': booking.start_at.strftime('%H:%M')
-                })
-            
-            # Move current time to after this booking
-            current_time = max(current_time, booking.end_at)
-        
-        # Add remaining time until closing if available
-        if current_time < end_time:
-            available_slots.append({
-                'start': current_time.strftime('%H:%M'),
-                'end': end_time.strftime('%H:%M')
-            })
-        
-        return available_slots
-    
-    def _find_conflicting_booking(self, requested_start, requested_end, bookings):
-        """Find the first booking that conflicts with requested time slot"""
-        
-        for booking in bookings:
-            # Check if there's any overlap
-            if (requested_start < booking.end_at and 
-                requested_end > booking.start_at):
-                return booking
-        
-        return None
+        return [
+            {
+                'start': free_start.strftime('%H:%M'),
+                'end': free_end.strftime('%H:%M')
+            }
+            for free_start, free_end in self._free_intervals(check_date.date(), open_minutes, bookings)
+        ]
     
     def get_space_by_id(self, space_id):
         """Get space by ID with floor name dan amenities"""
@@ -395,6 +602,15 @@ class SpaceUseCase:
                     'error': f'Invalid type. Must be one of: {", ".join(valid_types)}'
                 }
             
+            # Validate opening hours (same compiled representation used by availability and bookings)
+            try:
+                compile_opening_hours(opening_hours)
+            except ValueError as e:
+                return {
+                    'success': False,
+                    'error': str(e)
+                }
+            
             # Validate status
             valid_statuses = ['available', 'booked', 'in_maintenance']
             if status not in valid_statuses:
@@ -429,6 +645,7 @@ class SpaceUseCase:
                 max_duration=max_duration,
                 status=status
             )
+            availability_cache.invalidate()
             
             space_data = new_space.to_dict()
             space_data['floor_name'] = floor.name
@@ -473,6 +690,8 @@ class SpaceUseCase:
             )
             
             if updated_space:
+                # Status change affects every cached date
+                availability_cache.invalidate()
                 space_dict = updated_space.to_dict()
                 
                 # Get floor name
@@ -528,6 +747,7 @@ class SpaceUseCase:
             success = self.space_repository.delete(space_id)
             
             if success:
+                availability_cache.invalidate()
                 return {
                     'success': True,
                     'message': 'Space deleted successfully'
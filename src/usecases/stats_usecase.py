@@ -1,92 +1,158 @@
-from typing import Dict
-from src.repositories.stats_repository import StatsRepository
+from typing import Dict, List, Optional
+from datetime import date, datetime
+from src.repositories.booking_repository import BookingRepository
+from src.repositories.user_stats_repository import UserStatsRepository, iso_week_key
 from src.repositories.announcement_repository import AnnouncementRepository
 from src.repositories.task_repository import TaskRepository
-from src.repositories.user_repository import UserRepository
-from src.repositories.assignment_repository import AssignmentRepository
-from src.repositories.department_repository import DepartmentRepository
+from src.utils.batch_loader import get_batch_loader
+from src.utils.composite import composite_executor
 
 class StatsUseCase:
     """UseCase for business logic Statistics"""
     
+    # Next bookings shown on the home screen
+    HOME_UPCOMING_LIMIT = 5
+    
+    # Tasks shown in the dashboard todo list
+    TODO_LIMIT = 20
+    
     def __init__(self):
-        self.stats_repository = StatsRepository()
+        self.user_stats_repository = UserStatsRepository()
+        self.booking_repository = BookingRepository()
         self.announcement_repository = AnnouncementRepository()
         self.task_repository = TaskRepository()
-        self.user_repository = UserRepository()
-        self.assignment_repository = AssignmentRepository()
-        self.department_repository = DepartmentRepository()
     
     def get_user_stats(self, user_id: int, department_id: int, role: str = 'employee') -> Dict:
-        """Get statistics for current user (all roles)"""
-        try:
-            # 1. Get announcements (superadmin sees all, others see department-specific + global)
-            announcements_data = self._get_user_announcements(department_id, role)
-            
-            # 2. Get weekly booking hours
-            weekly_hours = self.stats_repository.get_weekly_booking_hours(user_id)
-            
-            # 3. Get favorite space
-            favorite_space = self.stats_repository.get_favorite_space(user_id)
-            
-            # 4. Get todo list from assignments and tasks
-            todo_list = self._get_user_todo_list(user_id)
-            
-            return {
-                'success': True,
-                'data': {
-                    'announcements': announcements_data,
-                    'weekly_booking_hours': weekly_hours,
-                    'favorite_space': favorite_space,
-                    'todo_list': todo_list
-                }
-            }
-        except Exception as e:
+        """
+        Get statistics for current user (all roles)
+        
+        Announcements, booking numbers and todo list are independent and run
+        concurrently (see composite_executor); a failed part is reported in
+        data['errors'] instead of failing the whole response.
+        """
+        return self._run_parts(self._stats_parts(user_id, department_id, role))
+    
+    def get_home_screen(self, user_id: int, department_id: int, role: str = 'employee') -> Dict:
+        """Statistics plus the user's next bookings for the home screen, all parts concurrently"""
+        parts = self._stats_parts(user_id, department_id, role)
+        # Not 'upcoming_bookings': that key already holds the upcoming count
+        parts['next_bookings'] = lambda: self._get_upcoming_bookings(user_id)
+        return self._run_parts(parts)
+    
+    def _stats_parts(self, user_id: int, department_id: int, role: str) -> Dict:
+        """Independent parts of the stats response as {name: callable}"""
+        return {
+            # Superadmin sees all announcements, others department-specific + global
+            'announcements': lambda: self._get_user_announcements(department_id, role),
+            # Booking numbers from the precomputed summary (one query)
+            'booking_stats': lambda: self._get_booking_stats(user_id),
+            # Todo list from assignments and tasks
+            'todo_list': lambda: self._get_user_todo_list(user_id)
+        }
+    
+    def _run_parts(self, parts: Dict) -> Dict:
+        """Run parts concurrently; fails only when every part failed"""
+        results, errors = composite_executor.run(parts)
+        if not results:
             return {
                 'success': False,
-                'error': str(e)
+                'error': '; '.join(f"{name}: {message}" for name, message in errors.items())
+            }
+        
+        data = {}
+        for name in parts:
+            if name not in results:
+                continue
+            # Booking numbers are top-level fields of the response
+            if name == 'booking_stats':
+                data.update(results[name])
+            else:
+                data[name] = results[name]
+        data['errors'] = errors
+        
+        return {
+            'success': True,
+            'data': data
+        }
+    
+    def _get_upcoming_bookings(self, user_id: int) -> List[Dict]:
+        """The user's next active/checked-in bookings that have not ended yet"""
+        bookings = self.booking_repository.get_upcoming_by_user(
+            user_id, datetime.now(), self.HOME_UPCOMING_LIMIT
+        )
+        return [booking.to_dict() for booking in bookings]
+    
+    def _get_booking_stats(self, user_id: int) -> Dict:
+        """Today/upcoming counts, this ISO week's hours and favorite space from the user_stats tables"""
+        today = date.today()
+        summary = self.user_stats_repository.get_summary(user_id, today, iso_week_key(today))
+        
+        favorite_space = None
+        if summary and summary.space_name is not None:
+            favorite_space = {
+                'space_id': summary.space_id,
+                'space_name': summary.space_name,
+                'space_type': summary.space_type,
+                'booking_count': summary.booking_count
             }
+        
+        return {
+            'today_bookings': int(summary.today_bookings or 0) if summary else 0,
+            'upcoming_bookings': int(summary.upcoming_bookings or 0) if summary else 0,
+            'weekly_booking_hours': round((summary.booked_seconds or 0) / 3600, 2) if summary else 0.0,
+            'favorite_space': favorite_space
+        }
+    
+    def rebuild_user_stats(self, user_ids: Optional[List[int]] = None, chunk_size: int = 500, on_chunk=None) -> int:
+        """
+        Recompute the user_stats summary tables from bookings (backfill / repair)
+        
+        Rebuilds user_ids, or every user in chunks of chunk_size users per
+        transaction. on_chunk(user_ids) is called after each chunk. Returns the
+        number of users rebuilt.
+        """
+        chunks = [user_ids] if user_ids else self.user_stats_repository.get_user_id_chunks(chunk_size)
+        
+        rebuilt = 0
+        for chunk in chunks:
+            self.user_stats_repository.rebuild(chunk)
+            rebuilt += len(chunk)
+            if on_chunk:
+                on_chunk(chunk)
+        
+        return rebuilt
     
     def _get_user_announcements(self, department_id: int, role: str = 'employee') -> list:
         """Get announcements for user (superadmin sees all, others see department-specific + global)"""
         announcements = []
         
-        # Superadmin can see ALL announcements
-        if role == 'superadmin':
-            all_announcements = self.announcement_repository.get_all()
-        else:
-            # Get global announcements (department_id is NULL)
-            global_announcements = self.announcement_repository.get_company_wide()
-            
-            # Get department-specific announcements if user has department
-            department_announcements = []
-            if department_id:
-                department_announcements = self.announcement_repository.get_by_department(department_id)
-            
-            # Combine announcements
-            all_announcements = global_announcements + department_announcements
-        
-        # Sort by created_at descending
-        all_announcements.sort(key=lambda x: x.created_at, reverse=True)
-        
         # Superadmin can see more announcements (10), others see 5
         limit = 10 if role == 'superadmin' else 5
         
-        # Limit to most recent announcements
-        for announcement in all_announcements[:limit]:
-            creator = self.user_repository.get_by_id(announcement.created_by)
+        # Newest first, department filter and limit in SQL (superadmin sees all departments)
+        recent = self.announcement_repository.get_recent(
+            limit, department_id=department_id, all_departments=role == 'superadmin'
+        )
+        
+        # Creators and departments of the whole list, one query each
+        loader = get_batch_loader()
+        creator_names = loader.usernames([announcement.created_by for announcement in recent])
+        if role == 'superadmin':
+            departments = loader.load_many('department', [announcement.department_id for announcement in recent])
+        
+        for announcement in recent:
             announcement_data = {
                 'id': announcement.id,
                 'title': announcement.title,
                 'description': announcement.description,
-                'creator_name': creator.username if creator else 'Unknown',
+                'creator_name': creator_names.get(announcement.created_by) or 'Unknown',
                 'created_at': announcement.created_at.isoformat() if announcement.created_at else None
             }
             
             # Include department info for superadmin
             if role == 'superadmin':
                 if announcement.department_id:
-                    department = self.department_repository.get_by_id(announcement.department_id)
+                    department = departments.get(announcement.department_id)
                     announcement_data['department_id'] = announcement.department_id
                     announcement_data['department_name'] = department.name if department else 'Unknown'
                 else:
@@ -98,41 +164,32 @@ class StatsUseCase:
         return announcements
     
     def _get_user_todo_list(self, user_id: int) -> Dict:
-        """Get todo list from user's assigned tasks (both complete and incomplete)"""
-        # Get all tasks assigned to this user
-        tasks = self.task_repository.get_by_user(user_id)
+        """
+        Get todo list from user's assigned tasks (both complete and incomplete)
+        
+        One joined query for the first TODO_LIMIT tasks (incomplete first, then
+        assignment due_date, then priority) and one aggregate for the counts,
+        however many tasks the user has.
+        """
+        rows = self.task_repository.get_todo_for_user(user_id, self.TODO_LIMIT)
+        total_count, completed_count = self.task_repository.count_todo_for_user(user_id)
         
-        # Enrich tasks with assignment details
         todo_items = []
-        for task in tasks:
-            assignment = self.assignment_repository.get_by_id(task.assignment_id)
-            if assignment:
-                todo_items.append({
-                    'task_id': task.id,
-                    'task_title': task.title,
-                    'task_priority': task.priority,
-                    'is_done': task.is_done,
-                    'assignment_id': assignment.id,
-                    'assignment_title': assignment.title,
-                    'assignment_due_date': assignment.due_date.isoformat() if assignment.due_date else None,
-                    'created_at': task.created_at.isoformat() if task.created_at else None
-                })
-        
-        # Sort by completion status (incomplete first), then by assignment due_date, then by priority
-        priority_order = {'high': 1, 'medium': 2, 'low': 3}
-        todo_items.sort(key=lambda x: (
-            x['is_done'],  # False (incomplete) comes before True (complete)
-            x['assignment_due_date'] if x['assignment_due_date'] else '9999-12-31',
-            priority_order.get(x['task_priority'], 4)
-        ))
-        
-        # Count completed and incomplete tasks
-        completed_count = len([task for task in todo_items if task['is_done']])
-        incomplete_count = len([task for task in todo_items if not task['is_done']])
+        for task, assignment_title, assignment_due_date in rows:
+            todo_items.append({
+                'task_id': task.id,
+                'task_title': task.title,
+                'task_priority': task.priority,
+                'is_done': task.is_done,
+                'assignment_id': task.assignment_id,
+                'assignment_title': assignment_title,
+                'assignment_due_date': assignment_due_date.isoformat() if assignment_due_date else None,
+                'created_at': task.created_at.isoformat() if task.created_at else None
+            })
         
         return {
-            'total_tasks': len(todo_items),
+            'total_tasks': total_count,
             'completed_tasks': completed_count,
-            'incomplete_tasks': incomplete_count,
-            'tasks': todo_items[:20]  # Limit to 20 most recent tasks
+            'incomplete_tasks': total_count - completed_count,
+            'tasks': todo_items
         }
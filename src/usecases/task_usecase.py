@@ -23,19 +23,14 @@ class TaskUseCase:
             if assignment.department_id != manager_department_id:
                 return {'success': False, 'error': 'You can only access assignments from your department'}
             
-            # Get all tasks for this assignment
-            tasks = self.task_repository.get_by_assignment(assignment_id)
-            
-            # Sort by priority (high -> medium -> low) then by created_at
-            priority_order = {'high': 1, 'medium': 2, 'low': 3}
-            tasks.sort(key=lambda x: (priority_order.get(x.priority, 4), x.created_at))
+            # Tasks with assigned usernames, sorted by priority (high -> medium -> low)
+            # then created_at, in one joined query
+            rows = self.task_repository.get_by_assignment_with_usernames(assignment_id)
             
             # Build response with assigned user info
             tasks_list = []
-            for task in tasks:
-                # Get assigned user info
-                assigned_user = self.user_repository.get_by_id(task.user_id)
-                assigned_user_name = assigned_user.username if assigned_user else "Unknown"
+            for task, username in rows:
+                assigned_user_name = username or "Unknown"
                 
                 task_data = {
                     'id': task.id,
@@ -58,7 +53,7 @@ class TaskUseCase:
                     'assignment_title': assignment.title,
                     'tasks': tasks_list,
                     'total_tasks': len(tasks_list),
-                    'completed_tasks': len([t for t in tasks if t.is_done])
+                    'completed_tasks': len([task for task in tasks_list if task['is_done']])
                 }
             }
         except Exception as e:
@@ -3,6 +3,8 @@ from src.repositories.user_repository import UserRepository
 from src.repositories.booking_repository import BookingRepository
 from src.repositories.department_repository import DepartmentRepository
 from src.config.database import db
+from src.utils.pagination import normalize_limit
+from src.utils.batch_loader import username_cache
 
 class UserUseCase:
     """UseCase for business logic User"""
@@ -12,33 +14,29 @@ class UserUseCase:
         self.booking_repository = BookingRepository()
         self.department_repository = DepartmentRepository()
     
-    def get_all_users(self) -> Dict:
-        """Get all users with total bookings"""
+    def get_all_users(self, cursor: Optional[str] = None, limit=None) -> Dict:
+        """Get one page of users (by id) with total bookings and department name"""
+        limit = normalize_limit(limit)
+        
         try:
-            users = self.user_repository.get_all()
+            # Booking counts and department names come from the same query
+            rows, next_cursor = self.user_repository.get_page_with_booking_counts(cursor=cursor, limit=limit)
             users_list = []
             
-            for user in users:
+            for user, total_bookings, department_name in rows:
                 user_data = user.to_dict()
-                
-                # Count total bookings for this user via repository
-                total_bookings = self.booking_repository.count_by_user_id(user.id)
                 user_data['total_bookings'] = total_bookings
-                
-                # Get department name
-                if user.department_id:
-                    department = self.department_repository.get_by_id(user.department_id)
-                    user_data['department_name'] = department.name if department else None
-                else:
-                    user_data['department_name'] = None
-                
+                user_data['department_name'] = department_name
                 users_list.append(user_data)
             
             return {
                 'success': True,
                 'data': users_list,
-                'count': len(users_list)
+                'count': len(users_list),
+                'next_cursor': next_cursor
             }
+        except ValueError:
+            raise
         except Exception as e:
             return {
                 'success': False,
@@ -81,17 +79,13 @@ class UserUseCase:
                     'error': 'Department not found'
                 }
             
-            # Get all users from this department
-            users = self.user_repository.get_by_department_id(department_id)
+            # Get all users from this department with their booking counts (one query)
+            rows = self.user_repository.get_by_department_with_booking_counts(department_id)
             users_list = []
             
-            for user in users:
+            for user, total_bookings, _ in rows:
                 user_data = user.to_dict()
-                
-                # Count total bookings for this user
-                total_bookings = self.booking_repository.count_by_user_id(user.id)
                 user_data['total_bookings'] = total_bookings
-                
                 users_list.append(user_data)
             
             return {
@@ -275,6 +269,7 @@ class UserUseCase:
                 department_id=department_id,
                 is_active=status
             )
+            username_cache.invalidate(user_id)
             
             if user:
                 # Handle manager_id updates in department table
@@ -333,6 +328,7 @@ class UserUseCase:
                 }
             
             success = self.user_repository.delete(user_id)
+            username_cache.invalidate(user_id)
             if success:
                 return {
                     'success': True,
@@ -475,6 +471,7 @@ class UserUseCase:
                 department_id=None,  # Don't change department
                 is_active=is_active
             )
+            username_cache.invalidate(user_id)
             
             if user:
                 user_data = user.to_dict()
@@ -544,6 +541,7 @@ class UserUseCase:
             
             # Delete user
             success = self.user_repository.delete(user_id)
+            username_cache.invalidate(user_id)
             
             if success:
                 return {
@@ -0,0 +1,108 @@
+"""
+Result cache untuk GET /api/spaces
+
+Halaman spaces memanggil kombinasi (date, start_time, end_time) yang sama
+berulang kali. Hasil SpaceUseCase.get_all_spaces disimpan di LRU kecil
+dengan TTL, dan di-invalidate per tanggal saat booking dibuat/dibatalkan/
+checkout atau blackout berubah. Perubahan space, floor dan amenity
+mempengaruhi semua tanggal sehingga mengosongkan seluruh cache.
+
+TTL menjaga supaya perubahan dari worker lain tetap terlihat dalam waktu singkat.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+
+class AvailabilityCache:
+    """Bounded LRU + TTL cache of space listings keyed by (date, start_time, end_time)"""
+
+    def __init__(self, max_entries=256, ttl_seconds=30):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (date, start, end) -> (stored_at, result)
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key):
+        """Get a cached result, or None on miss/expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and time.monotonic() - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return None
+
+    def generation(self):
+        """Current invalidation generation, taken before computing a result"""
+        with self._lock:
+            return self._generation
+
+    def set(self, key, result, generation):
+        """Store a result unless an invalidation happened while it was computed"""
+        with self._lock:
+            if generation != self._generation:
+                return
+
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate_date(self, target_date):
+        """Drop all cached windows of one date"""
+        self.invalidate_range(target_date, target_date)
+
+    def invalidate_range(self, first_date, last_date):
+        """Drop all cached windows between first_date and last_date (inclusive)"""
+        dates = set()
+        current = first_date
+        while current <= last_date:
+            dates.add(current)
+            current += timedelta(days=1)
+
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+            for key in [key for key in self._entries if key[0] in dates]:
+                del self._entries[key]
+
+    def invalidate(self):
+        """Drop everything (space, floor or amenity changed)"""
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else None,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations
+            }
+
+
+# Shared instance for the whole process
+availability_cache = AvailabilityCache()
@@ -0,0 +1,146 @@
+"""
+Request-scoped batch loader untuk lookup by ID
+
+Banyak usecase membangun response dengan get_by_id per baris (user,
+department). BatchLoader mengumpulkan ID yang dibutuhkan
+satu response, mengambilnya dengan satu query WHERE id IN (...) per jenis
+entity, lalu menyimpannya sampai request selesai. Instance-nya disimpan di
+flask.g sehingga otomatis hilang di akhir request / event websocket.
+
+Username juga disimpan di LRU kecil lintas request (dengan TTL karena
+username bisa diubah dari worker lain) dan di-invalidate saat user diubah.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from flask import g, has_app_context
+from src.repositories.user_repository import UserRepository
+from src.repositories.department_repository import DepartmentRepository
+
+# Entity type -> callable(ids) returning the rows with those ids
+FETCHERS = {
+    'user': lambda ids: UserRepository().get_by_ids(ids),
+    'department': DepartmentRepository.get_by_ids,
+}
+
+
+class UsernameCache:
+    """Bounded LRU + TTL of user_id -> username shared across requests"""
+
+    def __init__(self, max_entries=4096, ttl_seconds=300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # user_id -> (stored_at, username)
+        self._hits = 0
+        self._misses = 0
+
+    def get_many(self, user_ids):
+        """Get {user_id: username} of the cached ids, expired entries are dropped"""
+        found = {}
+        now = time.monotonic()
+
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._entries.get(user_id)
+                if entry is not None and now - entry[0] < self.ttl_seconds:
+                    self._entries.move_to_end(user_id)
+                    found[user_id] = entry[1]
+                    self._hits += 1
+                    continue
+
+                if entry is not None:
+                    del self._entries[user_id]
+                self._misses += 1
+
+        return found
+
+    def set_many(self, usernames):
+        """Store {user_id: username}"""
+        now = time.monotonic()
+
+        with self._lock:
+            for user_id, username in usernames.items():
+                self._entries[user_id] = (now, username)
+                self._entries.move_to_end(user_id)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        """Drop one user (username changed or user deleted)"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def stats(self):
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else None
+            }
+
+
+# Shared instance for the whole process
+username_cache = UsernameCache()
+
+
+class BatchLoader:
+    """Memoized by-ID loader, one IN query per entity type for all missing ids"""
+
+    def __init__(self):
+        self._loaded = {kind: {} for kind in FETCHERS}
+
+    def load_many(self, kind, ids):
+        """Get {id: row or None} for ids, fetching the ones not loaded yet in one query"""
+        memo = self._loaded[kind]
+        ids = {value for value in ids if value is not None}
+        missing = [value for value in ids if value not in memo]
+
+        if missing:
+            for row in FETCHERS[kind](missing):
+                memo[row.id] = row
+            for value in missing:
+                memo.setdefault(value, None)
+
+        return {value: memo[value] for value in ids}
+
+    def load(self, kind, id_):
+        """Get one row (or None), memoized for the rest of the request"""
+        if id_ is None:
+            return None
+        return self.load_many(kind, [id_])[id_]
+
+    def usernames(self, user_ids):
+        """Get {user_id: username or None}, from the shared username cache first"""
+        user_ids = {value for value in user_ids if value is not None}
+        found = username_cache.get_many(user_ids)
+
+        missing = user_ids - found.keys()
+        if missing:
+            loaded = {
+                user_id: user.username
+                for user_id, user in self.load_many('user', missing).items()
+                if user is not None
+            }
+            username_cache.set_many(loaded)
+            found.update(loaded)
+
+        return {user_id: found.get(user_id) for user_id in user_ids}
+
+
+def get_batch_loader():
+    """Batch loader of the current request (a fresh one outside an app context)"""
+    if not has_app_context():
+        return BatchLoader()
+
+    loader = g.get('batch_loader')
+    if loader is None:
+        loader = g.batch_loader = BatchLoader()
+    return loader
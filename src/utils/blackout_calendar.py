@@ -0,0 +1,101 @@
+"""
+In-memory blackout calendar
+
+Tabel blackouts hanya berubah beberapa kali setahun, jadi seluruh isinya
+di-cache sebagai list interval yang terurut berdasarkan start_at. Lookup
+"apakah waktu ini blackout" dan "blackout yang overlap dengan range ini"
+memakai bisect, tanpa query ke database.
+
+Cache di-invalidate oleh BlackoutUseCase (create/update/delete) dan
+juga kedaluwarsa setelah TTL supaya worker lain ikut ter-update.
+"""
+
+import threading
+import time
+from bisect import bisect_right
+from collections import namedtuple
+from src.repositories.blackout_repository import BlackoutRepository
+
+# Snapshot of a blackout row; has the same attributes used by callers of the model
+BlackoutPeriod = namedtuple('BlackoutPeriod', ['id', 'title', 'start_at', 'end_at'])
+
+
+class BlackoutCalendar:
+    """Sorted interval list of all blackouts with bisect lookups"""
+
+    def __init__(self, ttl_seconds=300):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._generation = 0
+        self._periods = []
+        self._starts = []
+        self._max_ends = []  # running max of end_at, lets the backwards scan stop early
+
+    def active_at(self, moment):
+        """Get blackouts covering a moment (start_at <= moment <= end_at)"""
+        return self.overlapping(moment, moment)
+
+    def first_active_at(self, moment):
+        """Get the first blackout covering a moment, or None"""
+        active = self.active_at(moment)
+        return active[0] if active else None
+
+    def overlapping(self, range_start, range_end):
+        """Get blackouts overlapping [range_start, range_end], ordered by start_at"""
+        periods, starts, max_ends = self._snapshot()
+
+        matches = []
+        index = bisect_right(starts, range_end) - 1
+        while index >= 0 and max_ends[index] >= range_start:
+            if periods[index].end_at >= range_start:
+                matches.append(periods[index])
+            index -= 1
+
+        matches.reverse()
+        return matches
+
+    def invalidate(self):
+        """Drop the cached calendar so it is reloaded on next lookup"""
+        with self._lock:
+            self._loaded_at = None
+            self._generation += 1
+
+    def _snapshot(self):
+        """Return the current (periods, starts, max_ends), reloading if stale"""
+        with self._lock:
+            fresh = (
+                self._loaded_at is not None
+                and time.monotonic() - self._loaded_at < self.ttl_seconds
+            )
+            if fresh:
+                return self._periods, self._starts, self._max_ends
+            generation = self._generation
+
+        periods = sorted(
+            (
+                BlackoutPeriod(blackout.id, blackout.title, blackout.start_at, blackout.end_at)
+                for blackout in BlackoutRepository.get_all()
+            ),
+            key=lambda period: period.start_at
+        )
+
+        max_ends = []
+        for period in periods:
+            max_ends.append(max(max_ends[-1], period.end_at) if max_ends else period.end_at)
+
+        starts = [period.start_at for period in periods]
+
+        with self._lock:
+            # Only publish if no invalidation happened while loading
+            if generation == self._generation:
+                self._periods = periods
+                self._starts = starts
+                self._max_ends = max_ends
+                self._loaded_at = time.monotonic()
+
+        return periods, starts, max_ends
+
+
+# Shared instance for the whole process
+blackout_calendar = BlackoutCalendar()
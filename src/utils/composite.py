@@ -0,0 +1,106 @@
+"""
+Composite request executor untuk endpoint dashboard
+
+Endpoint seperti /api/stats menggabungkan beberapa bagian yang saling
+independen (announcements, statistik booking, todo list, ...). Executor ini
+menjalankan bagian-bagian tersebut paralel di thread pool terbatas; setiap
+bagian berjalan di app context sendiri (jadi session database dan flask.g
+terpisah) dan punya timeout sendiri. Bagian yang gagal atau timeout tidak
+menggagalkan response: hasilnya dikembalikan sebagian plus map error.
+
+Bagian tidak punya request context, jadi semua yang dibutuhkan (user id,
+role, ...) harus diteruskan lewat closure.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TIMEOUT_SECONDS = 5.0
+
+
+class CompositeExecutor:
+    """Bounded thread pool running independent parts of one response"""
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._pool = None
+        self._runs = 0
+        self._failures = 0
+        self._timeouts = 0
+
+    def _get_pool(self, app):
+        """Create the pool on first use, sized by COMPOSITE_MAX_WORKERS"""
+        with self._lock:
+            if self._pool is None:
+                self.max_workers = app.config.get('COMPOSITE_MAX_WORKERS', self.max_workers)
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='composite'
+                )
+            return self._pool
+
+    @staticmethod
+    def _run_part(app, func):
+        with app.app_context():
+            return func()
+
+    def run(self, parts, timeout=None):
+        """
+        Run {name: callable} concurrently, returns (results, errors)
+
+        results maps the name of every part that finished to its return value;
+        errors maps the others to a message. timeout (seconds) applies to each
+        part, counted from submission; a part that times out keeps running in
+        the background but its result is dropped.
+        """
+        app = current_app._get_current_object()
+        if timeout is None:
+            timeout = app.config.get('COMPOSITE_PART_TIMEOUT_SECONDS', DEFAULT_TIMEOUT_SECONDS)
+
+        pool = self._get_pool(app)
+        started = time.monotonic()
+        futures = {name: pool.submit(self._run_part, app, func) for name, func in parts.items()}
+
+        results = {}
+        errors = {}
+        failures = 0
+        timeouts = 0
+        for name, future in futures.items():
+            try:
+                results[name] = future.result(timeout=max(0, timeout - (time.monotonic() - started)))
+            except FutureTimeoutError:
+                future.cancel()
+                errors[name] = f"Timed out after {timeout}s"
+                timeouts += 1
+            except Exception as e:
+                logger.error(f"Composite part '{name}' failed: {str(e)}")
+                errors[name] = str(e)
+                failures += 1
+
+        with self._lock:
+            self._runs += 1
+            self._failures += failures
+            self._timeouts += timeouts
+
+        return results, errors
+
+    def stats(self):
+        """Run counters for monitoring"""
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'runs': self._runs,
+                'part_failures': self._failures,
+                'part_timeouts': self._timeouts
+            }
+
+
+# Shared instance for the whole process
+composite_executor = CompositeExecutor()
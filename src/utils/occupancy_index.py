@@ -0,0 +1,249 @@
+"""
+In-process occupancy index untuk availability dan conflict check
+
+Setiap space-day disimpan sebagai bitmap (int) dari slot waktu tetap
+(default 5 menit, 288 slot per hari) ditambah daftar interval booking
+yang menempatinya. Bitmap dipakai sebagai filter cepat: kalau tidak ada
+bit yang beririsan, slot pasti kosong; kalau ada, interval asli dicek
+supaya hasilnya tetap presisi sampai menit.
+
+Index di-rebuild lazily per tanggal (satu query untuk semua space) saat
+cache miss, dan di-update incremental oleh BookingUseCase. Setiap tanggal
+juga kedaluwarsa setelah TTL supaya booking dari worker lain ikut terlihat.
+Index hanya untuk tampilan availability/search; conflict check saat membuat
+booking hanya dilakukan di database (locked insert), tidak pernah dari index.
+"""
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta
+from src.repositories.booking_repository import BookingRepository
+
+MINUTES_PER_DAY = 24 * 60
+
+# Interval booking yang menempati sebuah space-day.
+# Punya atribut start_at/end_at seperti model Booking sehingga bisa dipakai
+# langsung oleh perhitungan available hours.
+OccupiedInterval = namedtuple(
+    'OccupiedInterval',
+    ['booking_id', 'start_at', 'end_at', 'user_id', 'username']
+)
+
+
+class SpaceDayOccupancy:
+    """Immutable occupancy of one space on one day"""
+
+    __slots__ = ('bitmap', 'intervals')
+
+    def __init__(self, bitmap=0, intervals=()):
+        self.bitmap = bitmap
+        self.intervals = tuple(sorted(intervals, key=lambda i: i.start_at))
+
+    def find_conflict(self, start_at, end_at, mask):
+        """Return the first interval overlapping [start_at, end_at), or None"""
+        # Fast path: no shared slot means no overlap at all
+        if not self.bitmap & mask:
+            return None
+
+        for interval in self.intervals:
+            if start_at < interval.end_at and end_at > interval.start_at:
+                return interval
+
+        return None
+
+
+EMPTY_SPACE_DAY = SpaceDayOccupancy()
+
+
+class OccupancyIndex:
+    """Per-space, per-day bitmap index of active/checkin bookings"""
+
+    def __init__(self, slot_minutes=5, max_days=62, ttl_seconds=60):
+        self.slot_minutes = slot_minutes
+        self.max_days = max_days
+        self.ttl_seconds = ttl_seconds
+        self._days = OrderedDict()  # date -> {space_id: SpaceDayOccupancy}
+        self._loaded_at = {}  # date -> monotonic time of the last rebuild
+        self._generation = 0  # bumped by every write, so in-flight rebuilds can detect them
+        self._lock = threading.Lock()
+
+    def slot_mask(self, target_date, start_at, end_at):
+        """Build the slot bitmap covering [start_at, end_at) on target_date"""
+        day_start = datetime.combine(target_date, datetime.min.time())
+        start_min = max(0, int((start_at - day_start).total_seconds() // 60))
+        end_min = min(MINUTES_PER_DAY, int(-(-(end_at - day_start).total_seconds() // 60)))
+
+        if end_min <= start_min:
+            return 0
+
+        first_slot = start_min // self.slot_minutes
+        last_slot = -(-end_min // self.slot_minutes)  # ceil, partial slots count as busy
+        return ((1 << (last_slot - first_slot)) - 1) << first_slot
+
+    def open_mask(self, open_minute, close_minute):
+        """Build the slot bitmap of slots fully inside opening hours [open_minute, close_minute)"""
+        first_slot = -(-open_minute // self.slot_minutes)
+        last_slot = close_minute // self.slot_minutes
+
+        if last_slot <= first_slot:
+            return 0
+
+        return ((1 << (last_slot - first_slot)) - 1) << first_slot
+
+    def mask_to_intervals(self, bitmap):
+        """Convert runs of set bits into [{'start': 'HH:MM', 'end': 'HH:MM'}, ...]"""
+        intervals = []
+        offset = 0
+
+        while bitmap:
+            # Skip unset low bits, then measure the run of set bits
+            skip = (bitmap & -bitmap).bit_length() - 1
+            bitmap >>= skip
+            offset += skip
+            run = (bitmap ^ (bitmap + 1)).bit_length() - 1
+
+            intervals.append({
+                'start': self._format_minute(offset * self.slot_minutes),
+                'end': self._format_minute((offset + run) * self.slot_minutes)
+            })
+
+            bitmap >>= run
+            offset += run
+
+        return intervals
+
+    def get_day(self, target_date):
+        """Get occupancy of all spaces on target_date, rebuilding from bookings table on miss"""
+        return self.get_days([target_date])[target_date]
+
+    def get_days(self, dates):
+        """Get occupancy for several dates, rebuilding all missing dates with one query"""
+        result = {}
+        now = time.monotonic()
+
+        with self._lock:
+            for target_date in dates:
+                day = self._days.get(target_date)
+                if day is not None and now - self._loaded_at[target_date] < self.ttl_seconds:
+                    self._days.move_to_end(target_date)
+                    result[target_date] = day
+            generation = self._generation
+
+        missing = [target_date for target_date in dates if target_date not in result]
+        if not missing:
+            return result
+
+        built = self._build_days(min(missing), max(missing))
+
+        with self._lock:
+            if generation != self._generation:
+                # A booking changed while loading: the snapshot may miss it, so
+                # serve it to this caller only and let the next access rebuild
+                for target_date in missing:
+                    result[target_date] = built.get(target_date, {})
+                return result
+
+            for target_date in missing:
+                # Another thread may have rebuilt the same date meanwhile, keep the fresher one
+                day = self._days.get(target_date)
+                if day is None or self._loaded_at[target_date] < now:
+                    day = built.get(target_date, {})
+                    self._days[target_date] = day
+                    self._loaded_at[target_date] = now
+                self._days.move_to_end(target_date)
+                result[target_date] = day
+
+            while len(self._days) > self.max_days:
+                evicted_date, _ = self._days.popitem(last=False)
+                del self._loaded_at[evicted_date]
+
+        return result
+
+    def add_booking(self, booking, username=None):
+        """Mark a new active booking as occupied (no-op if its date is not loaded yet)"""
+        target_date = booking.start_at.date()
+        interval = OccupiedInterval(
+            booking.id, booking.start_at, booking.end_at, booking.user_id, username
+        )
+
+        with self._lock:
+            self._generation += 1
+            day = self._days.get(target_date)
+            if day is None:
+                return
+
+            current = day.get(booking.space_id, EMPTY_SPACE_DAY)
+            intervals = [i for i in current.intervals if i.booking_id != booking.id]
+            intervals.append(interval)
+            # Replace instead of mutate so concurrent readers keep a consistent snapshot
+            day[booking.space_id] = SpaceDayOccupancy(
+                current.bitmap | self.slot_mask(target_date, booking.start_at, booking.end_at),
+                intervals
+            )
+
+    def remove_booking(self, booking):
+        """Release the slots of a cancelled/finished booking (no-op if its date is not loaded)"""
+        target_date = booking.start_at.date()
+
+        with self._lock:
+            self._generation += 1
+            day = self._days.get(target_date)
+            if day is None:
+                return
+
+            current = day.get(booking.space_id)
+            if current is None:
+                return
+
+            intervals = [i for i in current.intervals if i.booking_id != booking.id]
+            day[booking.space_id] = self._build_space_day(target_date, intervals)
+
+    def invalidate(self, target_date=None):
+        """Drop a cached date (or everything) so it is rebuilt on next access"""
+        with self._lock:
+            self._generation += 1
+            if target_date is None:
+                self._days.clear()
+                self._loaded_at.clear()
+            else:
+                self._days.pop(target_date, None)
+                self._loaded_at.pop(target_date, None)
+
+    def _build_space_day(self, target_date, intervals):
+        """Build a SpaceDayOccupancy from a list of intervals"""
+        bitmap = 0
+        for interval in intervals:
+            bitmap |= self.slot_mask(target_date, interval.start_at, interval.end_at)
+        return SpaceDayOccupancy(bitmap, intervals)
+
+    def _build_days(self, first_date, last_date):
+        """Load all active/checkin bookings between first_date and last_date in one query"""
+        range_start = datetime.combine(first_date, datetime.min.time())
+        range_end = datetime.combine(last_date, datetime.min.time()) + timedelta(days=1)
+
+        grouped = {}
+        for booking in BookingRepository.get_active_bookings_between(range_start, range_end):
+            key = (booking.start_at.date(), booking.space_id)
+            grouped.setdefault(key, []).append(OccupiedInterval(
+                booking.id,
+                booking.start_at,
+                booking.end_at,
+                booking.user_id,
+                booking.user.username if booking.user else None
+            ))
+
+        days = {}
+        for (target_date, space_id), intervals in grouped.items():
+            days.setdefault(target_date, {})[space_id] = self._build_space_day(target_date, intervals)
+
+        return days
+
+    @staticmethod
+    def _format_minute(minute):
+        """Format minute-of-day as HH:MM"""
+        return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+# Shared instance for the whole process
+occupancy_index = OccupancyIndex()
@@ -0,0 +1,148 @@
+"""
+Compiled opening hours per space
+
+`space.opening_hours` disimpan sebagai JSON per hari, mis.
+{"mon": {"start": "08:00", "end": "18:00"}, "sat": null}. Modul ini
+meng-compile JSON tersebut sekali menjadi tabel per weekday berisi
+menit (open_minute, close_minute), lalu menyimpannya di cache per space.
+
+compile_opening_hours() sekaligus menjadi validasi tunggal untuk format
+opening hours: JSON yang tidak valid ditolak saat space dibuat, dan kalau
+data lama di database tidak valid, space dianggap tutup dengan warning di log.
+"""
+
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Index sesuai date.weekday(): Monday = 0
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+
+class OpeningHours:
+    """Weekday-indexed table of (open_minute, close_minute), None when closed"""
+
+    __slots__ = ('days',)
+
+    def __init__(self, days=(None,) * 7):
+        self.days = tuple(days)
+
+    @property
+    def has_hours(self):
+        """True if the space is open on at least one weekday"""
+        return any(day is not None for day in self.days)
+
+    def for_date(self, target_date):
+        """Get (open_minute, close_minute) for a date, or None if closed"""
+        return self.days[target_date.weekday()]
+
+    def contains(self, start_at, end_at):
+        """Check whether [start_at, end_at] on one day lies within opening hours"""
+        hours = self.for_date(start_at.date())
+        if hours is None:
+            return False
+
+        start_minute = start_at.hour * 60 + start_at.minute
+        end_minute = end_at.hour * 60 + end_at.minute
+        return hours[0] <= start_minute and end_minute <= hours[1]
+
+
+CLOSED = OpeningHours()
+
+
+def format_minute(minute):
+    """Format minute-of-day as HH:MM"""
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def _parse_minute(value, day, field):
+    """Parse HH:MM into minute-of-day"""
+    try:
+        parsed = datetime.strptime(value, '%H:%M')
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid opening_hours.{day}.{field}: use HH:MM format")
+    return parsed.hour * 60 + parsed.minute
+
+
+def compile_opening_hours(raw):
+    """
+    Compile opening_hours JSON into OpeningHours
+
+    None means no opening hours defined (closed every day).
+    Raises ValueError when the JSON is not valid.
+    """
+    if raw is None:
+        return CLOSED
+
+    if not isinstance(raw, dict):
+        raise ValueError("opening_hours must be an object keyed by day (mon, tue, ...)")
+
+    unknown_days = set(raw) - set(WEEKDAYS)
+    if unknown_days:
+        raise ValueError(
+            f"Invalid opening_hours day(s): {', '.join(sorted(unknown_days))}. "
+            f"Use: {', '.join(WEEKDAYS)}"
+        )
+
+    days = []
+    for day in WEEKDAYS:
+        day_hours = raw.get(day)
+
+        if not day_hours:  # Missing or null means closed on this day
+            days.append(None)
+            continue
+
+        if not isinstance(day_hours, dict):
+            raise ValueError(f"opening_hours.{day} must be an object with start and end, or null")
+
+        open_minute = _parse_minute(day_hours.get('start'), day, 'start')
+        close_minute = _parse_minute(day_hours.get('end'), day, 'end')
+
+        if close_minute <= open_minute:
+            raise ValueError(f"opening_hours.{day}: end must be after start")
+
+        days.append((open_minute, close_minute))
+
+    return OpeningHours(days)
+
+
+class OpeningHoursCache:
+    """Cache of compiled opening hours keyed by space id"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # space_id -> (updated_at, OpeningHours)
+
+    def get(self, space):
+        """Get compiled opening hours of a space, compiling on miss or when the space changed"""
+        with self._lock:
+            entry = self._entries.get(space.id)
+
+        # updated_at also catches changes made by other workers
+        if entry is not None and entry[0] == space.updated_at:
+            return entry[1]
+
+        try:
+            schedule = compile_opening_hours(space.opening_hours)
+        except ValueError as e:
+            logger.warning(f"Space {space.id} has invalid opening_hours, treated as closed: {str(e)}")
+            schedule = CLOSED
+
+        with self._lock:
+            self._entries[space.id] = (space.updated_at, schedule)
+
+        return schedule
+
+    def invalidate(self, space_id=None):
+        """Drop the compiled schedule of a space (or all spaces)"""
+        with self._lock:
+            if space_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(space_id, None)
+
+
+# Shared instance for the whole process
+opening_hours_cache = OpeningHoursCache()
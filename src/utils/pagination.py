@@ -0,0 +1,128 @@
+"""
+Keyset (cursor) pagination helpers
+
+Halaman berikutnya diambil dengan WHERE (sort_key, id) < (nilai terakhir)
+alih-alih OFFSET, jadi biayanya tetap walaupun halaman ke-1000. Cursor
+dikirim ke client sebagai string opaque (base64 dari JSON [sort_value, id]).
+Kolom sort harus NOT NULL supaya urutannya stabil.
+"""
+
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+from sqlalchemy.engine import Row
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def encode_cursor(sort_value, row_id):
+    """Encode (sort_value, id) of the last row into an opaque cursor"""
+    if isinstance(sort_value, datetime):
+        sort_value = {'dt': sort_value.isoformat()}
+    raw = json.dumps([sort_value, row_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor into (sort_value, id), raises ValueError if it is not valid"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        if isinstance(sort_value, dict):
+            sort_value = datetime.fromisoformat(sort_value['dt'])
+        if not isinstance(row_id, int):
+            raise ValueError
+    except (TypeError, ValueError, KeyError, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError("Invalid cursor")
+    return sort_value, row_id
+
+
+def normalize_limit(limit, default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    """Parse a page size, falling back to default and capping at maximum"""
+    if limit is None or limit == '':
+        return default
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("Query param 'limit' must be a number")
+    if limit < 1:
+        raise ValueError("Query param 'limit' must be at least 1")
+    return min(limit, maximum)
+
+
+def _keyset_query(query, sort_column, id_column, cursor, descending):
+    """Apply the cursor filter and (sort_column, id_column) ordering to a query"""
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        if sort_column is id_column:
+            query = query.filter(id_column < row_id if descending else id_column > row_id)
+        elif descending:
+            query = query.filter(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < row_id)
+            ))
+        else:
+            query = query.filter(or_(
+                sort_column > sort_value,
+                and_(sort_column == sort_value, id_column > row_id)
+            ))
+
+    order_columns = [id_column] if sort_column is id_column else [sort_column, id_column]
+    return query.order_by(*[
+        column.desc() if descending else column.asc() for column in order_columns
+    ])
+
+
+def _row_entity(row):
+    """Model instance of a row (the first entity for tuple rows)"""
+    return row[0] if isinstance(row, Row) else row
+
+
+def keyset_page(query, sort_column, id_column, cursor=None, limit=DEFAULT_LIMIT, descending=True):
+    """
+    Apply keyset pagination on (sort_column, id_column) to a query
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    Rows must expose the sort and id columns as attributes (model instances);
+    for queries returning tuples the model must be the first entity.
+    Pass the id column as sort_column to page by id only.
+    """
+    query = _keyset_query(query, sort_column, id_column, cursor, descending)
+
+    # Fetch one extra row to know whether there is a next page
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = _row_entity(rows[-1])
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+
+def keyset_page_union(sources, cursor=None, limit=DEFAULT_LIMIT, descending=True):
+    """
+    Keyset pagination over several queries as if they were one (e.g. hot + archive table)
+
+    sources is a list of (query, sort_column, id_column) sharing the same sort
+    key names; ids must be unique across sources. Each query fetches at most
+    limit + 1 rows past the cursor and the rows are merged in memory, so the
+    cost per page stays bounded. Returns (rows, next_cursor).
+    """
+    rows = []
+    for query, sort_column, id_column in sources:
+        query = _keyset_query(query, sort_column, id_column, cursor, descending)
+        rows.extend(query.limit(limit + 1).all())
+
+    sort_key, id_key = sources[0][1].key, sources[0][2].key
+    rows.sort(
+        key=lambda row: (getattr(_row_entity(row), sort_key), getattr(_row_entity(row), id_key)),
+        reverse=descending
+    )
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = _row_entity(rows[-1])
+    return rows, encode_cursor(getattr(last, sort_key), getattr(last, id_key))
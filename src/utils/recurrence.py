@@ -0,0 +1,46 @@
+"""
+Ekspansi pola booking berulang (RRULE)
+
+Pola ditulis dalam format RRULE iCalendar (RFC 5545), mis.
+"FREQ=WEEKLY;BYDAY=MO;COUNT=13" untuk setiap Senin selama satu kuartal.
+Parsing dilakukan oleh python-dateutil; modul ini hanya menambahkan jam
+booking ke setiap tanggal dan membatasi jumlah occurrence.
+"""
+
+from datetime import datetime
+from itertools import islice
+from dateutil.rrule import rrulestr
+
+
+def expand_rrule(rule, start_date, start_time, end_time, max_occurrences):
+    """
+    Expand an RRULE into [(start_at, end_at), ...] starting at start_date
+
+    start_date is YYYY-MM-DD, start_time/end_time are HH:MM applied to every
+    occurrence. Raises ValueError for invalid input or too many occurrences.
+    """
+    try:
+        first_day = datetime.strptime(start_date, '%Y-%m-%d')
+        start_clock = datetime.strptime(start_time, '%H:%M').time()
+        end_clock = datetime.strptime(end_time, '%H:%M').time()
+    except (TypeError, ValueError):
+        raise ValueError("Invalid start_date/start_time/end_time. Use YYYY-MM-DD and HH:MM")
+
+    if end_clock <= start_clock:
+        raise ValueError("end_time must be after start_time")
+
+    try:
+        dates = rrulestr(rule.removeprefix('RRULE:'), dtstart=first_day)
+    except (AttributeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid rrule: {str(e)}")
+
+    # Rules without COUNT/UNTIL are infinite, never take more than the limit + 1
+    occurrences = [
+        (datetime.combine(day.date(), start_clock), datetime.combine(day.date(), end_clock))
+        for day in islice(dates, max_occurrences + 1)
+    ]
+
+    if len(occurrences) > max_occurrences:
+        raise ValueError(f"Recurrence expands to more than {max_occurrences} occurrences, add COUNT or UNTIL")
+
+    return occurrences
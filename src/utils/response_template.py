@@ -27,6 +27,27 @@ class ResponseTemplate:
         """
         return ResponseTemplate.success(data=data, message=message, status_code=201)
     
+    @staticmethod
+    def paginated(data: list, next_cursor: Optional[str] = None, total: Optional[int] = None, message: str = "Success"):
+        """
+        Success response for one page of a list (200)
+        
+        next_cursor is null on the last page; pass it back as ?cursor= to get the next one.
+        """
+        response = {
+            'success': True,
+            'message': message,
+            'status_code': 200,
+            'data': data,
+            'count': len(data),
+            'next_cursor': next_cursor
+        }
+        
+        if total is not None:
+            response['total'] = total
+        
+        return jsonify(response), 200
+    
     @staticmethod
     def bad_request(message: str = "Bad request", details: Optional[Dict] = None):
         """
@@ -43,6 +64,22 @@ class ResponseTemplate:
         
         return jsonify(response), 400
     
+    @staticmethod
+    def conflict(message: str = "Conflict", details: Optional[Dict] = None):
+        """
+        Conflict response (409)
+        """
+        response = {
+            'success': False,
+            'message': message,
+            'status_code': 409
+        }
+        
+        if details:
+            response['details'] = details
+        
+        return jsonify(response), 409
+    
     @staticmethod
     def unauthorized(message: str = "Unauthorized access"):
         """
@@ -136,6 +173,8 @@ def error_response(status_code: int, message: str, **kwargs):
         return ResponseTemplate.forbidden(message)
     elif status_code == 404:
         return ResponseTemplate.not_found(message, kwargs.get('resource'))
+    elif status_code == 409:
+        return ResponseTemplate.conflict(message, kwargs.get('details'))
     elif status_code == 500:
         return ResponseTemplate.internal_error(message, kwargs.get('details'))
     else:
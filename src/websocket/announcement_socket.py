@@ -3,6 +3,7 @@ from flask_socketio import Namespace, emit, join_room, leave_room
 from src.utils.jwt_helper import decode_access_token
 from src.usecases.announcement_usecase import AnnouncementUseCase
 from src.repositories.department_repository import DepartmentRepository
+from src.utils.pagination import normalize_limit
 import logging
 
 logger = logging.getLogger(__name__)
@@ -70,20 +71,26 @@ class AnnouncementNamespace(Namespace):
                 'subscribed_to': subscriptions
             })
             
-            # Fetch and send initial announcements
+            # Fetch and send initial announcements (paged like the HTTP endpoint:
+            # pass next_cursor back as 'cursor' in authenticate for the next page)
             try:
+                next_cursor = None
                 if role == 'superadmin':
                     # Superadmin gets ALL announcements from all departments
                     from src.repositories.announcement_repository import AnnouncementRepository
-                    from src.repositories.user_repository import UserRepository
+                    from src.utils.batch_loader import get_batch_loader
                     announcement_repo = AnnouncementRepository()
-                    user_repo = UserRepository()
-                    all_announcements = announcement_repo.get_all()
+                    # Newest page only, like the other roles (limit in SQL)
+                    all_announcements = announcement_repo.get_recent(
+                        normalize_limit(data.get('limit')), all_departments=True
+                    )
+                    
+                    # Creator names of all announcements in one lookup
+                    creator_names = get_batch_loader().usernames([ann.created_by for ann in all_announcements])
+                    
                     announcements = []
                     for ann in all_announcements:
-                        # Get creator info
-                        creator = user_repo.get_by_id(ann.created_by)
-                        creator_name = creator.username if creator else "Unknown"
+                        creator_name = creator_names.get(ann.created_by) or "Unknown"
                         
                         ann_dict = {
                             'id': ann.id,
@@ -97,19 +104,22 @@ class AnnouncementNamespace(Namespace):
                             'updated_at': ann.updated_at.isoformat() if ann.updated_at else None
                         }
                         announcements.append(ann_dict)
-                elif role == 'manager' and department_id:
-                    result = self.announcement_usecase.get_announcements_for_manager(department_id)
-                    announcements = result.get('data', []) if result.get('success') else []
-                elif role == 'employee' and department_id:
-                    result = self.announcement_usecase.get_announcements_for_manager(department_id)
+                elif role in ('manager', 'employee') and department_id:
+                    result = self.announcement_usecase.get_announcements_for_manager(
+                        department_id,
+                        cursor=data.get('cursor'),
+                        limit=data.get('limit')
+                    )
                     announcements = result.get('data', []) if result.get('success') else []
+                    next_cursor = result.get('next_cursor') if result.get('success') else None
                 else:
                     company_wide = self.announcement_usecase.get_announcements_for_manager(0)
                     announcements = company_wide.get('data', []) if company_wide.get('success') else []
                 
                 emit('announcements_initial', {
                     'announcements': announcements,
-                    'count': len(announcements)
+                    'count': len(announcements),
+                    'next_cursor': next_cursor
                 })
                 
             except Exception as e:
@@ -80,18 +80,33 @@ class BookingNamespace(Namespace):
             role = payload.get('role')
             department_id = payload.get('department_id')
             
-            # Fetch bookings based on role
+            # Fetch bookings based on role (paged, both return bookings + next_cursor)
             if role == 'manager' and department_id:
-                # Managers can see all department bookings
-                bookings = self.booking_usecase.get_department_bookings(department_id)
+                # Managers can see all department bookings (paged, optional filters)
+                page = self.booking_usecase.get_department_bookings(
+                    department_id,
+                    date_from=data.get('from'),
+                    date_to=data.get('to'),
+                    status=data.get('status'),
+                    cursor=data.get('cursor'),
+                    limit=data.get('limit')
+                )
             else:
                 # Regular users see only their own bookings
-                bookings = self.booking_usecase.get_user_bookings(user_id)
+                page = self.booking_usecase.get_user_bookings(
+                    user_id,
+                    cursor=data.get('cursor'),
+                    limit=data.get('limit')
+                )
+            
+            bookings = page['bookings']
+            next_cursor = page['next_cursor']
             
             # Send bookings data
             emit('bookings_data', {
                 'bookings': bookings,
-                'count': len(bookings)
+                'count': len(bookings),
+                'next_cursor': next_cursor
             })
             
         except Exception as e:
@@ -143,3 +158,9 @@ def broadcast_booking_deleted(socketio, booking_id, user_id, department_id):
         socketio.emit('deleted', {'id': booking_id},
                      namespace='/bookings',
                      room=f'department_{department_id}_bookings')
+
+def broadcast_bookings_created_bulk(socketio, user_id, bookings_data):
+    """Broadcast many new bookings (bulk/recurring) as one event to the owner"""
+    socketio.emit('bulk_created', {'bookings': bookings_data, 'count': len(bookings_data)},
+                 namespace='/bookings',
+                 room=f'user_{user_id}_bookings')
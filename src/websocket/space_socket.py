@@ -120,3 +120,18 @@ def broadcast_space_availability_changed(socketio, space_id, date, affected_time
         'affected_time_range': affected_time_range,
         'message': 'Space availability has changed'
     }, namespace='/spaces', room='spaces_updates')
+
+def broadcast_space_availability_changed_bulk(socketio, space_id, changes):
+    """
+    Broadcast one coalesced availability change for many bookings (bulk/recurring)
+    
+    Args:
+        space_id: ID of the space
+        changes: list of dicts with 'date' (YYYY-MM-DD) and 'start'/'end' times (HH:MM)
+    """
+    socketio.emit('availability_changed_bulk', {
+        'space_id': space_id,
+        'dates': sorted({change['date'] for change in changes}),
+        'changes': changes,
+        'message': 'Space availability has changed'
+    }, namespace='/spaces', room='spaces_updates')